@@ -0,0 +1,213 @@
+"""
+Benchmarks for parsing and normalizing LuQY Pro exports.
+
+Generates synthetic exports (see `synthetic.py`) and measures the wall time
+and the peak Python heap allocation (tracemalloc) of each parsing stage:
+`parse_header`, `parse_numeric_data`, `parse_abspl_data` and the full
+`AbsPLMeasurementELN.normalize` including the figure. The raw files are
+served by a local `ClientContext`, no NOMAD installation is needed beyond the
+Python package. Results are written as JSON so that runs can be compared::
+
+    python benchmarks/run.py --output bench.json
+    python benchmarks/run.py --quick --baseline bench.json
+
+With `--baseline`, the run fails if a stage got slower than `--tolerance`
+times its baseline time.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+from nomad.datamodel import EntryArchive, EntryMetadata
+from nomad.datamodel.context import ClientContext
+from synthetic import write_export
+
+from nomad_luqy_plugin.schema_packages.abspl_normalizer import (
+    PARSER_VERSION,
+    parse_abspl_data,
+    parse_header,
+    parse_numeric_data,
+    read_header_lines,
+)
+from nomad_luqy_plugin.schema_packages.schema_package import AbsPLMeasurementELN
+
+# (name, generator keyword arguments)
+SCENARIOS = [
+    *[
+        (f'{header}-{rows}', {'rows': rows, 'header': header})
+        for rows in (1_000, 10_000, 100_000, 1_000_000)
+        for header in ('qfls', 'ivoc')
+    ],
+    ('utf8-squared-10000', {'rows': 10_000, 'squared': 'utf-8'}),
+    ('malformed-10000', {'rows': 10_000, 'malformed_rows': 20}),
+    ('malformed-100000', {'rows': 100_000, 'malformed_rows': 20}),
+    ('sweep-5x10000', {'rows': 10_000, 'n_spectra': 5}),
+    ('sweep-5x100000', {'rows': 100_000, 'n_spectra': 5}),
+]
+QUICK_SCENARIOS = [
+    ('qfls-1000', {'rows': 1_000}),
+    ('ivoc-10000', {'rows': 10_000, 'header': 'ivoc'}),
+    ('utf8-squared-1000', {'rows': 1_000, 'squared': 'utf-8'}),
+    ('malformed-10000', {'rows': 10_000, 'malformed_rows': 20}),
+    ('sweep-3x10000', {'rows': 10_000, 'n_spectra': 3}),
+]
+
+
+class _NullLogger:
+    def debug(self, *args, **kwargs):
+        pass
+
+    info = warning = error = debug
+
+
+def _stages(directory, filename):
+    """Returns the benchmarked stages as ``(name, setup, run)`` triples."""
+    path = os.path.join(directory, filename)
+    logger = _NullLogger()
+
+    def read_lines():
+        with open(path, 'rb') as f:
+            return f.read().decode('cp1252', errors='replace').splitlines()
+
+    def header(_):
+        with open(path, 'rb') as f:
+            parse_header(read_header_lines(f), logger)
+
+    def numeric(lines):
+        _, _, data_start_idx = parse_header(lines, logger)
+        parse_numeric_data(lines, data_start_idx, logger)
+
+    def archive():
+        return EntryArchive(
+            metadata=EntryMetadata(entry_name=f'{filename} data file'),
+            m_context=ClientContext(local_dir=directory),
+        )
+
+    def abspl_data(entry_archive):
+        parse_abspl_data(filename, entry_archive, logger)
+
+    def normalize(entry_archive):
+        entry_archive.data = AbsPLMeasurementELN(data_file=filename)
+        entry_archive.data.normalize(entry_archive, logger)
+
+    return [
+        ('parse_header', lambda: None, header),
+        ('parse_numeric_data', read_lines, numeric),
+        ('parse_abspl_data', archive, abspl_data),
+        ('normalize', archive, normalize),
+    ]
+
+
+def measure(setup, run, repeat):
+    """
+    Returns the best wall time of `repeat` runs and the tracemalloc peak of
+    an extra run. `setup` is excluded from both.
+    """
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        gc.collect()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+    state = setup()
+    gc.collect()
+    tracemalloc.start()
+    run(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def run_benchmarks(scenarios, repeat, log=sys.stderr):
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, options in scenarios:
+            filename = f'{name}.txt'
+            size = write_export(os.path.join(directory, filename), **options)
+            for stage, setup, run in _stages(directory, filename):
+                seconds, peak = measure(setup, run, repeat)
+                results.append(
+                    {
+                        'scenario': name,
+                        **options,
+                        'bytes': size,
+                        'stage': stage,
+                        'seconds': seconds,
+                        'peak_bytes': peak,
+                        'mb_per_s': size / seconds / 1e6 if seconds else None,
+                    }
+                )
+                print(
+                    f'{name:>20} {stage:>18} {seconds * 1e3:10.2f} ms '
+                    f'{peak / 1e6:10.2f} MB',
+                    file=log,
+                )
+            os.remove(os.path.join(directory, filename))
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Returns the stages that are slower than `tolerance` times the baseline."""
+    reference = {
+        (result['scenario'], result['stage']): result['seconds']
+        for result in baseline['results']
+    }
+    regressions = []
+    for result in results:
+        seconds = reference.get((result['scenario'], result['stage']))
+        if seconds and result['seconds'] > tolerance * seconds:
+            regressions.append({**result, 'baseline_seconds': seconds})
+    return regressions
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    arg_parser.add_argument('--output', help='JSON file for the results')
+    arg_parser.add_argument(
+        '--quick', action='store_true', help='run a small set of scenarios'
+    )
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--baseline', help='JSON results to compare with')
+    arg_parser.add_argument('--tolerance', type=float, default=1.5)
+    args = arg_parser.parse_args(argv)
+
+    scenarios = QUICK_SCENARIOS if args.quick else SCENARIOS
+    report = {
+        'parser_version': PARSER_VERSION,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': run_benchmarks(scenarios, args.repeat),
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report['results'], json.load(f), args.tolerance)
+        for regression in regressions:
+            print(
+                f'Regression in {regression["scenario"]} {regression["stage"]}: '
+                f'{regression["seconds"]:.4f} s vs. '
+                f'{regression["baseline_seconds"]:.4f} s',
+                file=sys.stderr,
+            )
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Generator for synthetic LuQY Pro exports.
+
+The files mimic the layout written by the instrument software: CRLF line
+endings, a tab separated header with either a QFLS or an iVoc result, the
+``cm²`` unit written as a cp1252 or UTF-8 byte sequence, a dashed separator,
+the column name line and four columns in the compact ``1.234567E+2`` notation.
+Malformed rows and concatenated spectra can be mixed in to exercise the slow
+parsing paths.
+"""
+
+import numpy as np
+
+HEADER_VARIANTS = ('qfls', 'ivoc')
+SQUARED_ENCODINGS = {'cp1252': b'\xb2', 'utf-8': b'\xc2\xb2'}
+WAVELENGTH_RANGE = (549.5, 1100.0)
+# Rows formatted per write, keeps memory bounded for million row files.
+WRITE_CHUNK_ROWS = 65536
+MALFORMED_ROWS = (
+    b'5.500000E+2\t1.000000E+0\r\n',
+    b'n/a\tn/a\tn/a\tn/a\r\n',
+    b'\r\n',
+)
+
+
+def header_bytes(header='qfls', squared='cp1252', laser_intensity=0.98, luqy=0.9693):
+    """Returns the header of one spectrum, including the column name line."""
+    if header not in HEADER_VARIANTS:
+        raise ValueError(f'Unknown header variant {header!r}')
+    squared = SQUARED_ENCODINGS[squared]
+    if header == 'qfls':
+        result = [b'QFLS (eV)\t1.094', b'QFLS Confidence\t1']
+    else:
+        result = [b'iVoc (V)\t1.532', b'iVoc Confidence\t0']
+    lines = [
+        b'1/20/2025 9:46:09 PM',
+        b'LuQY (%%)\t%.4f' % luqy,
+        *result,
+        b'Laser intensity (suns)\t%.2f' % laser_intensity,
+        b'Bias Voltage (V)\t0.0000',
+        b'SMU current density (mA/cm2)\t0.000',
+        b'Integration Time (ms)\t14',
+        b'Delay time (s)\t0.000',
+        b'Bandgap (eV)\t1.424',
+        b'Jsc (mA/cm2)\t26.46',
+        b'EQE @ laser wavelength\t0.90',
+        b'Laser spot size (cm' + squared + b')\t1.0',
+        b'Subcell area (cm' + squared + b')\t1.000',
+        b'Subcell\t--',
+        b'-' * 28,
+        b'Wavelength (nm)\tLuminescence flux density (photons/(s cm'
+        + squared
+        + b' nm))\tRaw spectrum (counts)\tDark spectrum (counts)',
+    ]
+    return b'\r\n'.join(lines) + b'\r\n'
+
+
+def spectrum(rows, scale=1.0, seed=0):
+    """
+    Returns an ``(rows, 4)`` array with a Gaussian emission peak on a noisy
+    dark background.
+    """
+    rng = np.random.default_rng(seed)
+    wavelength = np.linspace(*WAVELENGTH_RANGE, rows)
+    flux = scale * 1e13 * np.exp(-0.5 * ((wavelength - 870.0) / 12.0) ** 2)
+    dark = 1500.0 + rng.normal(0.0, 2.0, rows)
+    raw = dark + flux * 1e-10 + rng.normal(0.0, 2.0, rows)
+    return np.column_stack([wavelength, flux, raw, dark])
+
+
+def format_rows(data):
+    """Formats rows like the instrument, with unpadded exponents."""
+    text = ''.join(
+        f'{w:.6E}\t{y:.6E}\t{r:.6E}\t{d:.6E}\r\n' for w, y, r, d in data.tolist()
+    ).encode('ascii')
+    return text.replace(b'E+0', b'E+').replace(b'E-0', b'E-')
+
+
+def write_export(  # noqa: PLR0913
+    path,
+    *,
+    rows=1000,
+    header='qfls',
+    squared='cp1252',
+    malformed_rows=0,
+    n_spectra=1,
+    seed=0,
+):
+    """
+    Writes a synthetic export with `n_spectra` concatenated spectra of `rows`
+    rows each to `path` and returns the file size in bytes. Each spectrum is
+    measured at a lower laser intensity than the previous one, so multi-spectrum
+    files look like intensity sweeps. `malformed_rows` are put at random positions
+    among the data rows of every spectrum.
+    """
+    rng = np.random.default_rng(seed)
+    size = 0
+    with open(path, 'wb') as f:
+        for i in range(n_spectra):
+            intensity = 0.98 / 2**i
+            size += f.write(
+                header_bytes(header, squared, intensity, 0.9693 * intensity)
+            )
+            data = spectrum(rows, scale=intensity, seed=seed + i)
+            bad_at = set(
+                rng.choice(rows, size=min(malformed_rows, rows), replace=False)
+            )
+            for start in range(0, rows, WRITE_CHUNK_ROWS):
+                stop = min(start + WRITE_CHUNK_ROWS, rows)
+                chunk_bad = sorted(r for r in bad_at if start <= r < stop)
+                previous = start
+                for row in chunk_bad:
+                    size += f.write(format_rows(data[previous:row]))
+                    size += f.write(MALFORMED_ROWS[row % len(MALFORMED_ROWS)])
+                    previous = row
+                size += f.write(format_rows(data[previous:stop]))
+    return size
@@ -62,6 +62,51 @@ app_entry_point = AppEntryPoint(
                     unit='mA/cm**2',
                     label='Jsc',
                 ),
+                'peak_wavelength': Column(
+                    quantity='data.results[0].peak_wavelength#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                    selected=False,
+                    label='PL peak',
+                    unit='nm',
+                ),
+                'fwhm': Column(
+                    quantity='data.results[0].fwhm#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                    selected=False,
+                    label='FWHM',
+                    unit='nm',
+                ),
+                'urbach_energy': Column(
+                    quantity='data.results[0].urbach_energy#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                    selected=False,
+                    label='Urbach energy',
+                    unit='meV',
+                ),
+                'quality_passed': Column(
+                    quantity='data.results[0].quality_passed#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                    selected=False,
+                    label='Quality passed',
+                ),
+                'fitted_quasi_fermi_level_splitting': Column(
+                    quantity='data.results[0].fitted_quasi_fermi_level_splitting#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                    selected=False,
+                    label='QFLS (fit)',
+                ),
+                'luminescence_quantum_yield_std': Column(
+                    quantity='data.results[0].luminescence_quantum_yield_std#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                    selected=False,
+                    label='LuQY std (%)',
+                ),
+                'quasi_fermi_level_splitting_std': Column(
+                    quantity='data.results[0].quasi_fermi_level_splitting_std#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                    selected=False,
+                    label='QFLS std',
+                    unit='meV',
+                ),
+                'derived_jsc_std': Column(
+                    quantity='data.results[0].derived_jsc_std#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                    selected=False,
+                    label='Jsc std',
+                    unit='mA/cm**2',
+                ),
             },
         ),
         menu=Menu(
@@ -111,6 +156,113 @@ app_entry_point = AppEntryPoint(
                         MenuItemTerms(search_quantity='datasets.dataset_name'),
                     ],
                 ),
+                # Menu for descriptors computed from the spectra
+                Menu(
+                    title='Spectral Descriptors',
+                    size=MenuSizeEnum.MD,
+                    items=[
+                        MenuItemHistogram(
+                            x=Axis(
+                                search_quantity='data.results.peak_wavelength#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                                unit='nm',
+                            ),
+                            title='PL Peak Wavelength',
+                            show_input=True,
+                            nbins=30,
+                        ),
+                        MenuItemHistogram(
+                            x=Axis(
+                                search_quantity='data.results.peak_energy#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                                unit='eV',
+                            ),
+                            title='PL Peak Energy',
+                            show_input=True,
+                            nbins=30,
+                        ),
+                        MenuItemHistogram(
+                            x=Axis(
+                                search_quantity='data.results.fwhm#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                                unit='nm',
+                            ),
+                            title='FWHM',
+                            show_input=True,
+                            nbins=30,
+                        ),
+                        MenuItemHistogram(
+                            x=Axis(
+                                search_quantity='data.results.centroid_wavelength#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                                unit='nm',
+                            ),
+                            title='Centroid Wavelength',
+                            show_input=True,
+                            nbins=30,
+                        ),
+                        MenuItemHistogram(
+                            x=Axis(
+                                search_quantity='data.results.integrated_photon_flux#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                            ),
+                            title='Integrated Photon Flux',
+                            show_input=True,
+                            nbins=30,
+                        ),
+                        MenuItemHistogram(
+                            x=Axis(
+                                search_quantity='data.results.urbach_energy#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                                unit='meV',
+                            ),
+                            title='Urbach Energy',
+                            show_input=True,
+                            nbins=30,
+                        ),
+                    ],
+                ),
+                # Menu for the quality checks of the spectra
+                Menu(
+                    title='Quality Checks',
+                    size=MenuSizeEnum.MD,
+                    items=[
+                        MenuItemTerms(
+                            search_quantity='data.results.quality_passed#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                            title='Passed',
+                        ),
+                        MenuItemTerms(
+                            search_quantity='data.results.quality_issues#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                            title='Issues',
+                        ),
+                        MenuItemHistogram(
+                            x=Axis(
+                                search_quantity='data.results.signal_to_noise_ratio#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                            ),
+                            title='Signal to Noise Ratio',
+                            show_input=True,
+                            nbins=30,
+                        ),
+                        MenuItemHistogram(
+                            x=Axis(
+                                search_quantity='data.results.saturation_fraction#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                            ),
+                            title='Saturated Fraction',
+                            show_input=True,
+                            nbins=30,
+                        ),
+                        MenuItemHistogram(
+                            x=Axis(
+                                search_quantity='data.results.negative_count_fraction#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                            ),
+                            title='Negative Count Fraction',
+                            show_input=True,
+                            nbins=30,
+                        ),
+                        MenuItemHistogram(
+                            x=Axis(
+                                search_quantity='data.results.empty_flux_fraction#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                            ),
+                            title='Zero Flux Fraction',
+                            show_input=True,
+                            nbins=30,
+                        ),
+                    ],
+                ),
                 # New Menu for Results Histograms
                 MenuItemHistogram(
                     x=Axis(
@@ -170,6 +322,27 @@ app_entry_point = AppEntryPoint(
                     color='data.results[0].quasi_fermi_level_splitting#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501s
                     size=1000,
                 ),
+                WidgetScatterPlot(
+                    title='PL Peak vs. FWHM',
+                    autorange=True,
+                    layout={
+                        'lg': Layout(h=4, minH=3, minW=3, w=6, x=6, y=0),
+                        'md': Layout(h=5, minH=3, minW=3, w=7, x=7, y=0),
+                        'sm': Layout(h=6, minH=3, minW=3, w=6, x=6, y=0),
+                        'xl': Layout(h=6, minH=3, minW=3, w=6, x=6, y=0),
+                        'xxl': Layout(h=6, minH=3, minW=3, w=6, x=6, y=0),
+                    },
+                    x=Axis(
+                        search_quantity='data.results[0].peak_wavelength#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                        unit='nm',
+                    ),
+                    y=Axis(
+                        search_quantity='data.results[0].fwhm#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                        unit='nm',
+                    ),
+                    color='data.results[0].quasi_fermi_level_splitting#nomad_luqy_plugin.schema_packages.schema_package.AbsPLMeasurementELN',  # noqa: E501
+                    size=1000,
+                ),
             ]
         ),
         filters_locked={
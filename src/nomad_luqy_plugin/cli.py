@@ -0,0 +1,227 @@
+"""
+Offline bulk ingest of LuQY Pro exports.
+
+Parses every ``.txt`` export below a directory or inside a zip file in a process
+pool, writes one NOMAD archive file per export and a CSV summary table with the
+header values of all exports::
+
+    luqy-ingest <directory or zip> <output directory> --processes 8
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+import zipfile
+
+import numpy as np
+from nomad.datamodel import EntryArchive, EntryMetadata
+from nomad.datamodel.context import ClientContext
+
+from nomad_luqy_plugin.parsers import parser_entry_point
+from nomad_luqy_plugin.schema_packages.schema_package import (
+    AbsPLMeasurementELN,
+    AbsPLResult,
+    AbsPLSettings,
+)
+
+SUMMARY_FILE = 'summary.csv'
+PROGRESS_INTERVAL = 500
+SNIFF_BYTES = 1024
+
+# one open zip file per worker process
+_zip_files = {}
+
+
+def _source_context(source):
+    """Returns an archive context that serves raw files from a directory or zip."""
+    if not zipfile.is_zipfile(source):
+        return ClientContext(local_dir=source)
+
+    class ZipContext(ClientContext):
+        def raw_file(self, path, *args, **kwargs):
+            return _zip_file(source).open(path)
+
+    return ZipContext()
+
+
+def _zip_file(source):
+    """Returns the open zip file of this worker process for `source`."""
+    if source not in _zip_files:
+        _zip_files[source] = zipfile.ZipFile(source)
+    return _zip_files[source]
+
+
+def _file_size(source, path):
+    """Returns the size of a raw file without reading or decompressing it."""
+    if zipfile.is_zipfile(source):
+        return _zip_file(source).getinfo(path).file_size
+    return os.path.getsize(os.path.join(source, path))
+
+
+class _RecordingLogger:
+    """Collects warnings and errors so they can be reported per file."""
+
+    def __init__(self):
+        self.warnings = []
+        self.errors = []
+
+    def debug(self, *args, **kwargs):
+        pass
+
+    info = debug
+
+    def warning(self, event, *args, **kwargs):
+        self.warnings.append(event)
+
+    def error(self, event, *args, **kwargs):
+        self.errors.append(event)
+
+
+def iter_exports(source):
+    """Yields the paths of all ``.txt`` files below `source`, relative to it."""
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as zip_file:
+            for info in zip_file.infolist():
+                if not info.is_dir() and info.filename.lower().endswith('.txt'):
+                    yield info.filename
+        return
+    for root, _, files in os.walk(source):
+        for name in sorted(files):
+            if name.lower().endswith('.txt'):
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, source).replace(os.sep, '/')
+
+
+def summary_columns():
+    def scalars(section_cls):
+        return [
+            quantity.name
+            for quantity in section_cls.m_def.quantities
+            if not quantity.shape
+        ]
+
+    return [
+        'file',
+        'error',
+        'warnings',
+        'bytes',
+        *scalars(AbsPLSettings),
+        *scalars(AbsPLResult),
+    ]
+
+
+def ingest_file(task):
+    """
+    Parses one export and writes its archive. Returns a summary row; failures
+    are reported in its 'error' column instead of being raised, recoverable
+    problems in its 'warnings' column.
+    """
+    source, path, output_dir = task
+    row = {'file': path}
+    logger = _RecordingLogger()
+    try:
+        context = _source_context(source)
+        with context.raw_file(path, 'rb') as f:
+            head = f.read(SNIFF_BYTES).decode('cp1252', errors='replace')
+        row['bytes'] = _file_size(source, path)
+        if not re.search(parser_entry_point.mainfile_contents_re, head):
+            raise ValueError('not a LuQY Pro export')
+        entry = AbsPLMeasurementELN(
+            name=os.path.splitext(os.path.basename(path))[0], data_file=path
+        )
+        archive = EntryArchive(
+            data=entry, m_context=context, metadata=EntryMetadata(mainfile=path)
+        )
+        entry.normalize(archive, logger)
+        if logger.errors:
+            raise ValueError('; '.join(logger.errors))
+        if not entry.results:
+            # the parse failed, the warnings say why
+            raise ValueError('; '.join(logger.warnings) or 'no results')
+        if logger.warnings:
+            row['warnings'] = '; '.join(logger.warnings)
+
+        for section in (entry.settings, entry.results[0]):
+            for name, value in section.m_to_dict().items():
+                if np.ndim(value) == 0 and not isinstance(value, dict):
+                    row[name] = value
+
+        archive_path = os.path.join(
+            output_dir, os.path.splitext(path)[0] + '.archive.json'
+        )
+        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+        with open(archive_path, 'w') as f:
+            json.dump(archive.m_to_dict(), f)
+    except Exception as e:
+        row['error'] = str(e) or type(e).__name__
+
+    return row
+
+
+def ingest(source, output_dir, processes=None, log=sys.stderr):
+    """
+    Ingests all exports of `source` into `output_dir` and returns the number of
+    files, failed files and bytes read.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    columns = summary_columns()
+    tasks = ((source, path, output_dir) for path in iter_exports(source))
+    n_files = n_failed = n_bytes = 0
+    start = time.perf_counter()
+
+    with open(os.path.join(output_dir, SUMMARY_FILE), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        with multiprocessing.Pool(processes) as pool:
+            for row in pool.imap_unordered(ingest_file, tasks, chunksize=8):
+                writer.writerow(row)
+                n_files += 1
+                n_bytes += row.get('bytes', 0)
+                if 'error' in row:
+                    n_failed += 1
+                    print(f'{row["file"]}: {row["error"]}', file=log)
+                elif 'warnings' in row:
+                    print(f'{row["file"]}: warning: {row["warnings"]}', file=log)
+                if n_files % PROGRESS_INTERVAL == 0:
+                    _report(n_files, n_failed, n_bytes, start, log)
+
+    _report(n_files, n_failed, n_bytes, start, log)
+    return n_files, n_failed, n_bytes
+
+
+def _report(n_files, n_failed, n_bytes, start, log):
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(
+        f'{n_files} files ({n_failed} failed) in {elapsed:.1f} s: '
+        f'{n_files / elapsed:.1f} files/s, {n_bytes / elapsed / 1e6:.2f} MB/s',
+        file=log,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='luqy-ingest', description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument('source', help='directory or zip file with LuQY Pro exports')
+    parser.add_argument('output', help='directory for archives and the summary')
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=None,
+        help='number of worker processes (default: number of CPUs)',
+    )
+    args = parser.parse_args(argv)
+
+    _, n_failed, _ = ingest(args.source, args.output, processes=args.processes)
+    return 1 if n_failed else 0
+
+
+if __name__ == '__main__':
+    with contextlib.suppress(KeyboardInterrupt):
+        sys.exit(main())
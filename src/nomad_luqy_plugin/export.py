@@ -0,0 +1,351 @@
+"""
+Columnar export of AbsPL spectra from a local archive store.
+
+Reads the ``*.archive.json`` files below a directory, e.g. the output of
+``luqy-ingest``, one at a time and writes one row per spectrum with the header
+scalars and the spectral arrays into chunked NPZ files (or Parquet row groups,
+if pyarrow is installed)::
+
+    luqy-export <archive directory> <output directory> --grid 550 1100 1101
+
+Only one chunk of rows is held in memory. With ``--grid``, all spectra are
+resampled onto a common wavelength grid, so the arrays of a chunk form
+``(rows, n_grid)`` matrices.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+from nomad.datamodel import EntryArchive
+from nomad.datamodel.context import ClientContext
+
+from nomad_luqy_plugin.schema_packages.schema_package import (
+    SERIES_HEADER_KEYS,
+    AbsPLResult,
+    AbsPLSettings,
+)
+
+ARCHIVE_SUFFIX = '.archive.json'
+CHUNK_ROWS = 1000
+TEXT_TYPES = ('str', 'enum', 'datetime')
+SPECTRAL_COLUMNS = (
+    'luminescence_flux_density',
+    'raw_spectrum_counts',
+    'dark_spectrum_counts',
+)
+
+
+def scalar_columns():
+    """
+    Returns the names of the scalar header quantities, settings first, mapped
+    to whether they hold text.
+    """
+    return {
+        quantity.name: quantity.type.standard_type() in TEXT_TYPES
+        for section_cls in (AbsPLSettings, AbsPLResult)
+        for quantity in section_cls.m_def.quantities
+        if not quantity.shape
+    }
+
+
+def iter_local_archives(store, entry_ids=None):
+    """
+    Yields ``(entry_id, archive)`` for the archive files below `store`, one at a
+    time. The entry id is the one in the archive metadata or, for archives
+    written offline, the path of the file relative to `store` without suffix.
+    With `entry_ids`, files are only decoded if their path matches one of them
+    or if they contain an entry id at all.
+    """
+    entry_ids = None if entry_ids is None else set(entry_ids)
+    for root, _, files in os.walk(store):
+        for name in sorted(files):
+            if not name.endswith(ARCHIVE_SUFFIX):
+                continue
+            path = os.path.join(root, name)
+            path_id = os.path.relpath(path, store)[: -len(ARCHIVE_SUFFIX)].replace(
+                os.sep, '/'
+            )
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            if (
+                entry_ids is not None
+                and path_id not in entry_ids
+                and '"entry_id"' not in text
+            ):
+                # archives written offline have no entry id in their metadata
+                continue
+            archive_dict = json.loads(text)
+            entry_id = archive_dict.get('metadata', {}).get('entry_id') or path_id
+            if entry_ids is not None and not {entry_id, path_id} & entry_ids:
+                continue
+            yield entry_id, archive_dict
+
+
+def spectrum_rows(entry_id, archive, grid=None):
+    """
+    Yields one row dict per spectrum of the AbsPL results of `archive`, with the
+    scalar header values, the series index and the spectral arrays, resampled
+    onto `grid` if given (NaN outside the measured range). Header values that
+    differ between the spectra of a series are taken from its ``*_series``
+    quantities.
+    """
+    data = archive.data
+    if data is None or not getattr(data, 'results', None):
+        return
+    settings = {}
+    if data.settings is not None:
+        settings = _scalars(data.settings)
+    for result in data.results:
+        wavelength = result.spectral_array('wavelength')
+        if wavelength is None or not wavelength.size:
+            continue
+        scalars = {**settings, **_scalars(result)}
+        arrays = {name: result.series_array(name) for name in SPECTRAL_COLUMNS}
+        n_series = max(values.shape[0] for values in arrays.values())
+        series = _series_scalars(result) if n_series > 1 else {}
+        for index in range(n_series):
+            row = {'entry_id': entry_id, 'series_index': index, **scalars}
+            for name, values in series.items():
+                value = values[index] if index < values.size else np.nan
+                if np.isfinite(value):
+                    row[name] = value
+                else:
+                    row.pop(name, None)
+            row['wavelength'] = wavelength if grid is None else grid
+            for name, values in arrays.items():
+                spectrum = (
+                    values[index]
+                    if index < values.shape[0] and values.shape[-1] == wavelength.size
+                    else np.full(wavelength.size, np.nan)
+                )
+                if grid is not None:
+                    spectrum = resample(wavelength, spectrum, grid)
+                row[name] = spectrum
+            yield row
+
+
+def _scalars(section):
+    values = {}
+    for quantity in section.m_def.quantities:
+        if quantity.shape:
+            continue
+        value = getattr(section, quantity.name)
+        if value is not None:
+            values[quantity.name] = getattr(value, 'magnitude', value)
+    return values
+
+
+def _series_scalars(result):
+    values = {}
+    for key in SERIES_HEADER_KEYS:
+        series = getattr(result, f'{key}_series')
+        if series is not None:
+            series = getattr(series, 'magnitude', series)
+            values[key] = np.asarray(series, dtype=np.float64)
+    return values
+
+
+def resample(wavelength, values, grid):
+    """Linearly interpolates `values` onto `grid`, NaN outside `wavelength`."""
+    order = np.argsort(wavelength)
+    return np.interp(grid, wavelength[order], values[order], left=np.nan, right=np.nan)
+
+
+class NpzChunkWriter:
+    """
+    Writes rows into ``part-<n>.npz`` files of up to `chunk_rows` rows. Scalars
+    become one array per column. Spectral arrays become ``(rows, n_grid)``
+    matrices on a common grid, otherwise they are concatenated into one flat
+    array per column with ``offsets`` marking the row boundaries.
+    """
+
+    def __init__(self, output_dir, columns, chunk_rows=CHUNK_ROWS):
+        self.output_dir = output_dir
+        self.columns = columns
+        self.chunk_rows = chunk_rows
+        self.rows = []
+        self.n_chunks = 0
+        self.n_rows = 0
+
+    def write(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        arrays = {
+            'entry_id': np.array([row['entry_id'] for row in self.rows]),
+            'series_index': np.array([row['series_index'] for row in self.rows]),
+        }
+        for name, text in self.columns.items():
+            values = [row.get(name) for row in self.rows]
+            if text:
+                arrays[name] = np.array(['' if v is None else str(v) for v in values])
+            else:
+                arrays[name] = np.array(
+                    [np.nan if v is None else v for v in values], dtype=np.float64
+                )
+        lengths = np.array([row['wavelength'].size for row in self.rows])
+        uniform = all(
+            np.array_equal(row['wavelength'], self.rows[0]['wavelength'])
+            for row in self.rows
+        )
+        for name in ('wavelength', *SPECTRAL_COLUMNS):
+            if uniform and name == 'wavelength':
+                arrays[name] = self.rows[0][name]
+            elif uniform:
+                arrays[name] = np.stack([row[name] for row in self.rows])
+            else:
+                arrays[name] = np.concatenate([row[name] for row in self.rows])
+        if not uniform:
+            arrays['offsets'] = np.concatenate([[0], np.cumsum(lengths)])
+
+        path = os.path.join(self.output_dir, f'part-{self.n_chunks:05d}.npz')
+        np.savez_compressed(path, **arrays)
+        self.n_chunks += 1
+        self.n_rows += len(self.rows)
+        self.rows = []
+
+    def close(self):
+        self.flush()
+
+
+class ParquetChunkWriter(NpzChunkWriter):
+    """Writes rows into one Parquet file with a row group per chunk."""
+
+    def __init__(self, output_dir, columns, chunk_rows=CHUNK_ROWS):
+        try:
+            import pyarrow  # noqa: PLC0415
+            import pyarrow.parquet  # noqa: PLC0415
+        except ImportError as e:
+            raise RuntimeError(
+                'Parquet export needs pyarrow, install it or export to NPZ'
+            ) from e
+        super().__init__(output_dir, columns, chunk_rows)
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema(
+            [
+                ('entry_id', pyarrow.string()),
+                ('series_index', pyarrow.int64()),
+                *[
+                    (name, pyarrow.string() if text else pyarrow.float64())
+                    for name, text in columns.items()
+                ],
+                *[
+                    (name, pyarrow.list_(pyarrow.float64()))
+                    for name in ('wavelength', *SPECTRAL_COLUMNS)
+                ],
+            ]
+        )
+        self.writer = pyarrow.parquet.ParquetWriter(
+            os.path.join(output_dir, 'spectra.parquet'), self.schema
+        )
+
+    def flush(self):
+        if not self.rows:
+            return
+        columns = {
+            'entry_id': [row['entry_id'] for row in self.rows],
+            'series_index': [row['series_index'] for row in self.rows],
+        }
+        for name, text in self.columns.items():
+            values = [row.get(name) for row in self.rows]
+            columns[name] = [
+                None if v is None else str(v) if text else float(v) for v in values
+            ]
+        for name in ('wavelength', *SPECTRAL_COLUMNS):
+            columns[name] = [np.asarray(row[name]).tolist() for row in self.rows]
+        self.writer.write_table(self.pyarrow.table(columns, schema=self.schema))
+        self.n_chunks += 1
+        self.n_rows += len(self.rows)
+        self.rows = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+def export(  # noqa: PLR0913
+    store,
+    output_dir,
+    *,
+    entry_ids=None,
+    grid=None,
+    file_format='npz',
+    chunk_rows=CHUNK_ROWS,
+    raw_dir=None,
+):
+    """
+    Exports the spectra of the archives in `store` (optionally only those of
+    `entry_ids`) into `output_dir` and returns the number of entries and rows.
+    Raw files referenced by the archives, e.g. HDF5 files with offloaded
+    arrays, are looked up in `raw_dir`, by default `store`.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    writer_cls = ParquetChunkWriter if file_format == 'parquet' else NpzChunkWriter
+    writer = writer_cls(output_dir, scalar_columns(), chunk_rows)
+    context = ClientContext(local_dir=raw_dir or store)
+    grid = None if grid is None else np.asarray(grid, dtype=np.float64)
+
+    n_entries = 0
+    for entry_id, archive_dict in iter_local_archives(store, entry_ids):
+        archive = EntryArchive.m_from_dict(archive_dict, m_context=context)
+        n_entries += 1
+        for row in spectrum_rows(entry_id, archive, grid):
+            writer.write(row)
+    writer.close()
+
+    return n_entries, writer.n_rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='luqy-export', description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument('store', help='directory with *.archive.json files')
+    parser.add_argument('output', help='directory for the exported chunks')
+    parser.add_argument(
+        '--entry-ids',
+        help='file with one entry id per line, exports only these entries',
+    )
+    parser.add_argument(
+        '--grid',
+        nargs=3,
+        type=float,
+        metavar=('START', 'STOP', 'NUM'),
+        help='resample all spectra onto NUM wavelengths from START to STOP nm',
+    )
+    parser.add_argument('--format', choices=('npz', 'parquet'), default='npz')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--raw-dir', help='directory with the raw files')
+    args = parser.parse_args(argv)
+
+    entry_ids = None
+    if args.entry_ids:
+        with open(args.entry_ids, encoding='utf-8') as f:
+            entry_ids = [line.strip() for line in f if line.strip()]
+    grid = None
+    if args.grid:
+        start, stop, num = args.grid
+        grid = np.linspace(start, stop, int(num))
+
+    n_entries, n_rows = export(
+        args.store,
+        args.output,
+        entry_ids=entry_ids,
+        grid=grid,
+        file_format=args.format,
+        chunk_rows=args.chunk_rows,
+        raw_dir=args.raw_dir,
+    )
+    print(f'Exported {n_rows} spectra of {n_entries} entries', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,17 +2,43 @@ from nomad.config.models.plugins import ParserEntryPoint
 from pydantic import Field
 
 
-class NewParserEntryPoint(ParserEntryPoint):
-    parameter: int = Field(0, description='Custom configuration parameter')
+class LuQYParserEntryPoint(ParserEntryPoint):
+    def load(self):
+        from nomad_luqy_plugin.parsers.parser import LuQYParser
+
+        return LuQYParser(**self.dict())
+
+
+parser_entry_point = LuQYParserEntryPoint(
+    name='LuQYParser',
+    description='Parser for absolute PL text exports of the LuQY Pro.',
+    mainfile_name_re=r'.*\.txt',
+    # timestamp line, then the LuQY line, then the dashed separator within
+    # the header; only the first bytes of a candidate file are searched
+    mainfile_contents_re=(
+        r'^\s*\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{2}:\d{2}(?: [AP]M)?\s*\n'
+        r'LuQY \(%\)\t[^\n]*\n'
+        r'(?:[^\n]*\n){0,30}?-{4,}'
+    ),
+)
+
+
+class LuQYBundleParserEntryPoint(ParserEntryPoint):
+    max_workers: int = Field(
+        4, description='Number of threads that parse the exports of a bundle.'
+    )
 
     def load(self):
-        from nomad_luqy_plugin.parsers.parser import NewParser
+        from nomad_luqy_plugin.parsers.bundle_parser import LuQYBundleParser
 
-        return NewParser(**self.dict())
+        return LuQYBundleParser(**self.dict())
 
 
-parser_entry_point = NewParserEntryPoint(
-    name='NewParser',
-    description='New parser entry point configuration.',
-    mainfile_name_re='.*\.newmainfilename',
+bundle_parser_entry_point = LuQYBundleParserEntryPoint(
+    name='LuQYBundleParser',
+    description=(
+        'Parser for zip bundles of LuQY Pro exports, with one entry per export.'
+    ),
+    mainfile_name_re=r'.*\.zip',
+    mainfile_mime_re=r'application/(x-)?zip.*',
 )
@@ -0,0 +1,137 @@
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+)
+
+if TYPE_CHECKING:
+    from nomad.datamodel.datamodel import (
+        EntryArchive,
+    )
+    from structlog.stdlib import (
+        BoundLogger,
+    )
+
+from nomad.datamodel.context import ServerContext
+from nomad.parsing.parser import MatchingParser
+
+from nomad_luqy_plugin.parsers import parser_entry_point
+from nomad_luqy_plugin.schema_packages.abspl_normalizer import (
+    ENCODING,
+    parse_abspl_stream,
+    unpack_series,
+)
+from nomad_luqy_plugin.schema_packages.schema_package import (
+    AbsPLMeasurementELN,
+    AbsPLSession,
+    AbsPLSettings,
+)
+
+SNIFF_BYTES = 1024
+
+
+def bundle_members(bundle):
+    """Returns the paths of the LuQY Pro exports in an open zip file."""
+    contents_re = re.compile(parser_entry_point.mainfile_contents_re)
+    members = []
+    for info in bundle.infolist():
+        if info.is_dir() or not info.filename.lower().endswith('.txt'):
+            continue
+        with bundle.open(info) as f:
+            head = f.read(SNIFF_BYTES).decode(ENCODING, errors='replace')
+        if contents_re.search(head):
+            members.append(info.filename)
+    return members
+
+
+def shared_settings(settings):
+    """Returns the settings that have the same value in all dicts of `settings`."""
+    if not settings:
+        return {}
+    first, *others = settings
+    return {
+        key: value
+        for key, value in first.items()
+        if all(other.get(key) == value for other in others)
+    }
+
+
+class LuQYBundleParser(MatchingParser):
+    """
+    Parser for zip bundles with the LuQY Pro exports of a session. The bundle
+    becomes an `AbsPLSession` entry and every export in it a child
+    `AbsPLMeasurementELN` entry. The bundle is opened once and its exports are
+    parsed in a thread pool straight from the zip file.
+    """
+
+    creates_children = True
+
+    def __init__(self, max_workers=4, **kwargs):
+        super().__init__(**kwargs)
+        self.max_workers = max_workers
+
+    def is_mainfile(
+        self,
+        filename: str,
+        mime: str,
+        buffer: bytes,
+        decoded_buffer: str,
+        compression: str = None,
+    ):
+        if not super().is_mainfile(filename, mime, buffer, decoded_buffer, compression):
+            return False
+        try:
+            with zipfile.ZipFile(filename) as bundle:
+                return set(bundle_members(bundle)) or False
+        except (OSError, zipfile.BadZipFile):
+            return False
+
+    def parse(
+        self,
+        mainfile: str,
+        archive: 'EntryArchive',
+        logger: 'BoundLogger',
+        child_archives: dict[str, 'EntryArchive'] = None,
+    ) -> None:
+        bundle_file = mainfile.rsplit('/', maxsplit=1)[-1]
+        if isinstance(archive.m_context, ServerContext):
+            bundle_file = mainfile.split('/raw/', 1)[1]
+        child_archives = child_archives or {}
+
+        with zipfile.ZipFile(mainfile) as bundle:
+            members = sorted(child_archives) or bundle_members(bundle)
+
+            def parse_member(member):
+                try:
+                    with bundle.open(member) as f:
+                        return unpack_series(*parse_abspl_stream(f, logger))
+                except Exception as e:
+                    logger.warning(f'Could not parse "{member}" in the bundle: {e}')
+                    return None
+
+            with ThreadPoolExecutor(self.max_workers) as pool:
+                parsed = dict(zip(members, pool.map(parse_member, members)))
+
+        parsed = {member: values for member, values in parsed.items() if values}
+        logger.debug('LuQYBundleParser.parse', members=len(parsed))
+        archive.data = AbsPLSession(
+            bundle_file=bundle_file,
+            members=list(parsed),
+            n_spectra=sum(values[3].shape[0] for values in parsed.values()),
+            settings=AbsPLSettings(
+                **shared_settings([values[0] for values in parsed.values()])
+            ),
+        )
+        archive.metadata.entry_name = f'{bundle_file} session'
+
+        for member, values in parsed.items():
+            child_archive = child_archives.get(member)
+            if child_archive is None:
+                continue
+            child_archive.data = AbsPLMeasurementELN(
+                name=member.rsplit('/', maxsplit=1)[-1].rsplit('.', 1)[0],
+                bundle_member=member,
+            )
+            child_archive.data.set_spectra(values)
+            child_archive.metadata.entry_name = f'{member} in {bundle_file}'
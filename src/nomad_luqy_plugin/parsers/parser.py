@@ -10,16 +10,19 @@ if TYPE_CHECKING:
         BoundLogger,
     )
 
-from nomad.config import config
-from nomad.datamodel.metainfo.workflow import Workflow
+from nomad.datamodel.context import ServerContext
 from nomad.parsing.parser import MatchingParser
 
-configuration = config.get_plugin_entry_point(
-    'nomad_luqy_plugin.parsers:parser_entry_point'
-)
+from nomad_luqy_plugin.schema_packages.schema_package import AbsPLMeasurementELN
+
 
+class LuQYParser(MatchingParser):
+    """
+    Parser for LuQY Pro text exports. Every matched file becomes an
+    `AbsPLMeasurementELN` entry whose normalizer reads the file through
+    `parse_abspl_data`, so no ELN file has to be written per spectrum.
+    """
 
-class NewParser(MatchingParser):
     def parse(
         self,
         mainfile: str,
@@ -27,6 +30,13 @@ class NewParser(MatchingParser):
         logger: 'BoundLogger',
         child_archives: dict[str, 'EntryArchive'] = None,
     ) -> None:
-        logger.info('NewParser.parse', parameter=configuration.parameter)
+        data_file = mainfile.rsplit('/', maxsplit=1)[-1]
+        if isinstance(archive.m_context, ServerContext):
+            data_file = mainfile.split('/raw/', 1)[1]
+        logger.debug('LuQYParser.parse', data_file=data_file)
 
-        archive.workflow2 = Workflow(name='test')
+        archive.data = AbsPLMeasurementELN(
+            name=data_file.rsplit('/', maxsplit=1)[-1].rsplit('.', 1)[0],
+            data_file=data_file,
+        )
+        archive.metadata.entry_name = f'{data_file} data file'
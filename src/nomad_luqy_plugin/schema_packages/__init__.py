@@ -1,9 +1,103 @@
+from typing import Optional
+
 from nomad.config.models.plugins import SchemaPackageEntryPoint
 from pydantic import Field
 
 
 class NewSchemaPackageEntryPoint(SchemaPackageEntryPoint):
     parameter: int = Field(0, description='Custom configuration parameter')
+    parse_cache_dir: Optional[str] = Field(
+        None,
+        description=(
+            'Directory of the on-disk cache for parsed AbsPL data files. It can be '
+            'shared by all workers on a node. Caching is disabled if not set.'
+        ),
+    )
+    parse_cache_max_bytes: int = Field(
+        1024**3,
+        description='Size of the parse cache above which old entries are evicted.',
+    )
+    hdf5_arrays: bool = Field(
+        False,
+        description=(
+            'Store the spectral arrays of AbsPL results in a chunked and compressed '
+            'HDF5 file next to the data file and keep only references in the '
+            'archive. The arrays are then read only when they are needed.'
+        ),
+    )
+    shared_arrays: bool = Field(
+        False,
+        description=(
+            'Store the wavelength axis and dark spectra of AbsPL results once per '
+            'upload in HDF5 files named by a fingerprint of their content, and keep '
+            'only references in the archive. Entries of a spectrometer session then '
+            'share these arrays on disk and, when read, in memory.'
+        ),
+    )
+    figure_max_points: int = Field(
+        2000,
+        description=(
+            'Maximum number of points per trace in the AbsPL spectrum figure. '
+            'Longer spectra are reduced by min/max decimation before plotting, '
+            'the stored results keep full resolution. 0 disables the reduction.'
+        ),
+    )
+    figure_typed_arrays: bool = Field(
+        False,
+        description=(
+            'Store the trace data of the AbsPL spectrum figure as base64-encoded '
+            'float32 typed arrays, which needs plotly.js 2.28 or later in the GUI. '
+            'The GUI of NOMAD 1.4 bundles plotly.js 2.16, which cannot draw them. '
+            'Otherwise the values are stored as JSON lists.'
+        ),
+    )
+    saturation_counts: float = Field(
+        65000.0,
+        description=(
+            'Detector counts (raw plus dark) from which a point of an AbsPL '
+            'spectrum counts as saturated in the quality checks.'
+        ),
+    )
+    uncertainty_samples: int = Field(
+        4000,
+        description=(
+            'Number of Monte-Carlo samples with which the count noise and the spot '
+            'size and EQE uncertainties are propagated to the standard deviations '
+            'of the LuQY, QFLS, iVoc and Jsc. 0 disables the propagation.'
+        ),
+    )
+    spot_size_rel_uncertainty: float = Field(
+        0.05,
+        description='Relative standard uncertainty of the laser spot size.',
+    )
+    eqe_rel_uncertainty: float = Field(
+        0.02,
+        description='Relative standard uncertainty of the EQE at the laser wavelength.',
+    )
+    header_only: bool = Field(
+        False,
+        description=(
+            'Parse only the header of AbsPL data files, i.e. the settings and result '
+            'scalars needed for search. The spectral arrays are read when they are '
+            'first requested. These entries have no spectral analysis and no figure '
+            'until `full_parse` is set on the entry.'
+        ),
+    )
+    profile_sample_rate: float = Field(
+        0.0,
+        description=(
+            'Fraction of AbsPL normalizations for which the wall time, bytes read, '
+            'rows parsed and peak allocation of every parsing and plotting stage '
+            'are logged. 0 disables the profiling, 1 profiles every entry.'
+        ),
+    )
+    profile_memory: bool = Field(
+        True,
+        description=(
+            'Trace allocations with tracemalloc in profiled normalizations. This '
+            'slows them down noticeably, disable it to log timings only.'
+        ),
+    )
 
     def load(self):
         from nomad_luqy_plugin.schema_packages.schema_package import m_package
@@ -1,108 +1,455 @@
-def parse_abspl_data(data_file, archive, logger):
-    """Parses the AbsPL data file and returns extracted settings and spectral arrays."""
+import io
+import warnings
+
+import numpy as np
+
+from .header_layouts import (
+    apply_plan,
+    header_signature,
+    parse_plan,
+    report_unknown_layout,
+)
+from .profiling import span
+
+# Bump whenever a change to the parsing functions changes their output, so
+# that cached or fingerprinted parse results are invalidated.
+PARSER_VERSION = '4'
+NUMERIC_COLUMNS = 4
+# Bytes of the data section read per buffer, every buffer ends at a line end.
+NUMERIC_CHUNK_BYTES = 1 << 22
+# Kinds of the bytes of the data rows: whitespace, characters of numbers
+# (including nan and inf(inity)) and all others
+WHITESPACE, NUMBER_CHARACTER, OTHER_CHARACTER = range(3)
+BYTE_KINDS = np.full(256, OTHER_CHARACTER, dtype=np.uint8)
+BYTE_KINDS[list(b'0123456789.+-eEnNaAiIfFtTyY')] = NUMBER_CHARACTER
+BYTE_KINDS[list(b' \t\r\n\v\f')] = WHITESPACE
+# Exports are written in cp1252 or, by newer firmware, in UTF-8
+ENCODING = 'cp1252'
+
+
+def parse_abspl_data(data_file, archive, logger, cache=None, key=None):
+    """Parses the AbsPL data file and returns extracted settings and spectral arrays.
+
+    Only the header is decoded as text. The numeric block is streamed from the
+    open file straight into an array, so the raw file is never held in memory
+    as a whole. If a `ParseCache` is given, files whose content was parsed
+    before are served from it. The cache `key` is the content hash of the file,
+    if already known, e.g. from its fingerprint.
+
+    Exports with several concatenated spectra (intensity or bias sweeps,
+    repeated acquisitions) are returned as ``(n_series, N)`` arrays on the
+    wavelength axis of the first spectrum. The settings and results are those
+    of the first spectrum, `series_headers` holds the ``(settings, results)``
+    pair of every spectrum.
+    """
+    with span('open raw file'):
+        f = archive.m_context.raw_file(data_file, mode='rb')
+    with f:
+        cached = None
+        if cache is not None:
+            with span('parse cache lookup') as stats:
+                key = key or cache.key(f)
+                cached = cache.load(key, logger)
+                stats.update(bytes=f.tell(), hit=cached is not None)
+            f.seek(0)
+        if cached is not None:
+            series_headers, data = cached
+        else:
+            series_headers, data = parse_abspl_stream(f, logger)
+            if cache is not None:
+                with span('parse cache store'):
+                    cache.store(key, series_headers, data, logger)
+
+    return unpack_series(series_headers, data)
+
+
+def unpack_series(series_headers, data):
+    """
+    Splits the output of `parse_abspl_stream` into the values returned by
+    `parse_abspl_data`.
+    """
+    settings_vals, result_vals = series_headers[0]
+    wavelengths = data[0, :, 0]
+    lum_flux, raw_counts, dark_counts = data[:, :, 1], data[:, :, 2], data[:, :, 3]
+
+    return (
+        settings_vals,
+        result_vals,
+        wavelengths,
+        lum_flux,
+        raw_counts,
+        dark_counts,
+        series_headers,
+    )
+
+
+def parse_abspl_header(data_file, archive, logger):
+    """
+    Parses only the header of the AbsPL data file and returns the extracted
+    settings and results. The file is read up to the column name line below
+    the dashed separator, i.e. a few KB independent of the number of rows.
+    """
     with archive.m_context.raw_file(data_file, mode='rb') as f:
-        raw_bytes = f.read()
-    text = raw_bytes.decode('cp1252', errors='replace')
-    lines = text.splitlines()
-    logger.debug('Read data file lines', file=data_file, total_lines=len(lines))
-
-    settings_vals, result_vals, data_start_idx = parse_header(lines, logger)
-    wavelengths, lum_flux, raw_counts, dark_counts = parse_numeric_data(
-        lines, data_start_idx, logger
+        with span('read header') as stats:
+            header_lines = read_header_lines(f)
+            stats.update(bytes=f.tell(), lines=len(header_lines))
+    with span('parse header'):
+        settings_vals, result_vals, _ = parse_header(header_lines, logger)
+
+    return settings_vals, result_vals
+
+
+def parse_abspl_stream(f, logger):
+    """
+    Parses an open binary AbsPL file into a list with the ``(settings,
+    results)`` header values of every spectrum and an ``(n_series, N, 4)``
+    data array.
+
+    The data section is split into spectra at each dashed separator and the
+    spectra are aligned on the wavelength axis of the first one.
+    """
+    with span('read header') as stats:
+        header_lines = read_header_lines(f)
+        stats.update(bytes=f.tell(), lines=len(header_lines))
+    logger.debug('Read data file header', header_lines=len(header_lines))
+    with span('parse header'):
+        settings_vals, result_vals, data_start_idx = parse_header(header_lines, logger)
+    series_headers = [(settings_vals, result_vals)]
+    if data_start_idx is None:
+        return series_headers, np.empty((1, 0, NUMERIC_COLUMNS), dtype=np.float64)
+
+    start = f.tell()
+    with span('parse numeric data') as stats:
+        blocks = _parse_numeric_blocks(f, logger)
+        stats.update(
+            bytes=f.tell() - start,
+            rows=sum(block_data.shape[0] for _, block_data in blocks),
+        )
+    if len(blocks) == 1:
+        logger.debug('Parsed numeric data', series=1, rows=blocks[0][1].shape[0])
+        return series_headers, blocks[0][1][np.newaxis]
+
+    spectra = [blocks[0][1]]
+    for block_header_lines, block_data in blocks[1:]:
+        if not block_data.size:
+            logger.debug('Skipping spectrum without data rows')
+            continue
+        block_settings, block_results, _ = parse_header(block_header_lines, logger)
+        series_headers.append((block_settings, block_results))
+        spectra.append(block_data)
+    with span('align spectra', series=len(spectra)):
+        data = align_spectra(spectra, logger)
+    logger.debug(
+        'Parsed numeric data', series=data.shape[0], rows=data.shape[0] * data.shape[1]
     )
 
-    return settings_vals, result_vals, wavelengths, lum_flux, raw_counts, dark_counts
+    return series_headers, data
+
+
+def align_spectra(spectra, logger):
+    """
+    Stacks ``(N_i, 4)`` spectra into one ``(n_series, N, 4)`` array sharing the
+    wavelength axis of the first spectrum. Spectra on a different axis are
+    linearly interpolated onto it.
+    """
+    reference = spectra[0]
+    wavelengths = reference[:, 0]
+    data = np.empty((len(spectra), *reference.shape), dtype=np.float64)
+    data[0] = reference
+    for i, spectrum in enumerate(spectra[1:], start=1):
+        if spectrum.shape == reference.shape and np.array_equal(
+            spectrum[:, 0], wavelengths
+        ):
+            data[i] = spectrum
+            continue
+        logger.warning(
+            'Spectrum is interpolated onto the wavelength axis of the first one',
+            series=i,
+        )
+        order = np.argsort(spectrum[:, 0])
+        data[i, :, 0] = wavelengths
+        for column in range(1, NUMERIC_COLUMNS):
+            data[i, :, column] = np.interp(
+                wavelengths,
+                spectrum[order, 0],
+                spectrum[order, column],
+                left=np.nan,
+                right=np.nan,
+            )
+
+    return data
+
+
+def classify_series(series_headers):
+    """
+    Names the kind of a multi-spectrum export from the settings that change
+    between its spectra.
+    """
+    if len(series_headers) < 2:  # noqa: PLR2004
+        return 'single'
+
+    def varies(key):
+        return len({settings.get(key) for settings, _ in series_headers}) > 1
+
+    if varies('laser_intensity_suns'):
+        return 'intensity sweep'
+    if varies('bias_voltage'):
+        return 'bias sweep'
+    return 'repeated acquisition'
+
+
+def decode_line(raw_line):
+    """Decodes a line of an export as UTF-8 or, failing that, as cp1252."""
+    try:
+        return raw_line.decode('utf-8')
+    except UnicodeDecodeError:
+        return raw_line.decode(ENCODING, errors='replace')
+
+
+def read_header_lines(f):
+    """
+    Reads and decodes the header of an open binary AbsPL file, up to and
+    including the column name line below the dashed separator. The file is
+    left positioned at the first data row.
+    """
+    lines = []
+    for raw_line in iter(f.readline, b''):
+        line = decode_line(raw_line).rstrip('\r\n')
+        lines.append(line)
+        if line.strip().startswith('---'):
+            column_names = f.readline()
+            if column_names:
+                lines.append(decode_line(column_names))
+            break
+    return lines
 
 
 def parse_header(lines, logger):
-    header_map_settings = {
-        'Laser intensity (suns)': 'laser_intensity_suns',
-        'Bias Voltage (V)': 'bias_voltage',
-        'SMU current density (mA/cm2)': 'smu_current_density',
-        'Integration Time (ms)': 'integration_time',
-        'Delay time (s)': 'delay_time',
-        'EQE @ laser wavelength': 'eqe_laser_wavelength',
-        'Laser spot size (cm²)': 'laser_spot_size',
-        'Laser spot size (cm�)': 'laser_spot_size',
-        'Subcell area (cm²)': 'subcell_area',
-        'Subcell area (cm�)': 'subcell_area',
-        'Subcell': 'subcell_description',
-    }
-    header_map_result = {
-        'LuQY (%)': 'luminescence_quantum_yield',
-        'QFLS (eV)': 'quasi_fermi_level_splitting',
-        'Bandgap (eV)': 'bandgap',
-        'Jsc (mA/cm2)': 'derived_jsc',
-    }
-
-    settings_vals = {}
-    result_vals = {}
-    header_done = False
+    """
+    Parses the header lines of one spectrum with the cached parse plan of their
+    layout. Returns the settings and results dicts and the index of the first
+    data row, None if the lines contain no dashed separator.
+    """
     data_start_idx = None
-
     for idx, line in enumerate(lines):
-        line_stripped = line.strip()
-        if line_stripped.startswith('---'):
+        if line.strip().startswith('---'):
             data_start_idx = idx + 2  # skip dashed line and header line
-            header_done = True
             break
-        if '\t' in line:
-            parts = line.split('\t', 1)
-            if len(parts) == 2:  # noqa: PLR2004
-                key = parts[0].strip()
-                val_str = parts[1].strip()
-                if key in header_map_settings:
-                    if key == 'Subcell':
-                        settings_vals[header_map_settings[key]] = val_str
-                    else:
-                        try:
-                            settings_vals[header_map_settings[key]] = float(val_str)
-                        except ValueError:
-                            logger.debug(
-                                'Could not convert header to float',
-                                key=key,
-                                val=val_str,
-                            )
-                elif key in header_map_result:
-                    try:
-                        result_vals[header_map_result[key]] = float(val_str)
-                    except ValueError:
-                        logger.debug(
-                            'Could not convert result to float', key=key, val=val_str
-                        )
-
-    logger.debug('Header parsed', header_done=header_done, data_start=data_start_idx)
+    header_end = len(lines) if data_start_idx is None else data_start_idx - 2
+
+    pairs, signature = header_signature(lines[:header_end])
+    plan = parse_plan(signature)
+    report_unknown_layout(signature, plan, logger)
+    settings_vals, result_vals = apply_plan(plan, pairs, logger)
+
+    logger.debug(
+        'Header parsed',
+        layout=plan.layout,
+        header_done=data_start_idx is not None,
+        data_start=data_start_idx,
+    )
     return settings_vals, result_vals, data_start_idx
 
 
 def parse_numeric_data(lines, data_start_idx, logger):
-    wavelengths = []
-    lum_flux = []
-    raw_counts = []
-    dark_counts = []
+    """Parses the data rows below the header into an ``(N, 4)`` float64 array.
 
+    The columns are wavelength, luminescence flux density, raw counts and dark
+    counts.
+    """
     if data_start_idx is not None and data_start_idx < len(lines):
-        MIN_PARTS_COUNT = 4
-        for line in lines[data_start_idx:]:
-            if not line.strip():
-                continue
-            parts = line.split()
-            if len(parts) < MIN_PARTS_COUNT:
-                continue
-            try:
-                wavelengths.append(float(parts[0]))
-                lum_flux.append(float(parts[1]))
-                raw_counts.append(float(parts[2]))
-                dark_counts.append(float(parts[3]))
-            except ValueError:
-                logger.debug('Could not parse numeric row', row=line)
+        data = parse_numeric_block('\n'.join(lines[data_start_idx:]), logger)
+    else:
+        data = np.empty((0, NUMERIC_COLUMNS), dtype=np.float64)
+
+    logger.debug('Parsed numeric data', rows=data.shape[0])
+
+    return data
+
+
+def parse_numeric_block(block, logger):
+    """
+    Converts a whitespace separated data block (str or bytes) into an
+    ``(N, 4)`` float64 array.
+    """
+    stream = io.BytesIO(block) if isinstance(block, bytes) else io.StringIO(block)
+    return parse_numeric_stream(stream, logger)
+
+
+def parse_numeric_stream(stream, logger):
+    """
+    Converts the remaining rows of a text or binary stream into an ``(N, 4)``
+    float64 array, skipping short and non-numeric rows.
+    """
+    blocks = _parse_numeric_blocks(stream, logger)
+    return np.concatenate([block_data for _, block_data in blocks])
+
+
+def _load_numeric_stream(stream):
+    with warnings.catch_warnings():
+        # an empty block is not an error, the caller gets a (0, 4) array
+        warnings.simplefilter('ignore', UserWarning)
+        return np.loadtxt(
+            stream,
+            dtype=np.float64,
+            comments=None,
+            usecols=range(NUMERIC_COLUMNS),
+            ndmin=2,
+        )
+
+
+def _read_buffers(stream):
+    """Yields the rest of `stream` as bytes in buffers of whole lines."""
+    while True:
+        buffer = stream.read(NUMERIC_CHUNK_BYTES)
+        if not buffer:
+            return
+        buffer += stream.readline()
+        yield buffer.encode('utf-8') if isinstance(buffer, str) else buffer
+
+
+def _parse_numeric_blocks(stream, logger):
+    """
+    Parses the data rows of `stream` into a list of ``(header_lines, data)``
+    pairs, one per spectrum: every dashed separator starts a new spectrum whose
+    header are the non-numeric lines above it. The header of the first
+    spectrum is not part of `stream` and is None.
+
+    The stream is read in buffers that are split at the separators first, the
+    rows in between are handed to NumPy's C tokenizer.
+    """
+    blocks = []
+    header_lines = None
+    chunks = []
+    trailing = []
+    skip_column_names = False
+    for buffer in _read_buffers(stream):
+        position = _next_line(buffer, 0) if skip_column_names else 0
+        skip_column_names = False
+        for start, end in _separators(buffer, position):
+            data, trailing = _convert_rows(buffer[position:start], trailing, logger)
+            chunks.append(data)
+            blocks.append((header_lines, np.concatenate(chunks)))
+            header_lines = [*trailing, decode_line(buffer[start:end]).rstrip('\r\n')]
+            chunks, trailing = [], []
+            position = _next_line(buffer, end)
+            skip_column_names = end == len(buffer)
+        data, trailing = _convert_rows(buffer[position:], trailing, logger)
+        chunks.append(data)
+    chunks.append(np.empty((0, NUMERIC_COLUMNS), dtype=np.float64))
+    blocks.append((header_lines, np.concatenate(chunks)))
+
+    return blocks
 
+
+def _separators(buffer, position):
+    """Yields the start and end of every dashed separator line in `buffer`."""
+    while (dashes := buffer.find(b'---', position)) >= 0:
+        start = buffer.rfind(b'\n', 0, dashes) + 1
+        position = _next_line(buffer, dashes)
+        if not buffer[start:dashes].strip():
+            yield start, position
+
+
+def _next_line(buffer, position):
+    """Returns the start of the line after the one at `position`."""
+    end = buffer.find(b'\n', position)
+    return len(buffer) if end < 0 else end + 1
+
+
+def _convert_rows(rows, trailing, logger):
+    """
+    Converts the bytes `rows` of one spectrum into an ``(N, 4)`` array. Returns
+    it with the non-numeric lines after its last row, appended to `trailing`
+    if it has no rows; above a separator, these are the header of the next
+    spectrum.
+    """
+    # the header of the next spectrum is cut off before the block is converted
+    end = len(rows)
+    tail = []
+    while end:
+        start = rows.rfind(b'\n', 0, end - 1) + 1
+        line = rows[start:end]
+        if _numeric_row(line):
+            break
+        tail.append(decode_line(line).rstrip('\r\n'))
+        end = start
+    tail.reverse()
+
+    try:
+        data = _load_numeric_stream(io.BytesIO(rows[:end]))
+    except ValueError:
+        data = _filter_numeric_rows(rows[:end], logger)
+    return data, tail if data.size else trailing + tail
+
+
+def _numeric_row(line):
+    """Returns whether `line` starts with `NUMERIC_COLUMNS` numbers."""
+    parts = line.split()
+    if len(parts) < NUMERIC_COLUMNS:
+        return False
+    try:
+        [float(part) for part in parts[:NUMERIC_COLUMNS]]
+    except ValueError:
+        return False
+    return True
+
+
+def _filter_numeric_rows(rows, logger):
+    """
+    Converts the bytes `rows` into an ``(N, 4)`` array, skipping short and
+    non-numeric rows.
+
+    The rows are screened on the bytes at once: rows with fewer than
+    `NUMERIC_COLUMNS` fields are dropped, and only the few rows with other
+    characters than those of numbers are checked one by one. If the kept rows
+    still fail to convert, e.g. on a field like '1-2', the failing rows are
+    found by bisection.
+    """
+    text = np.frombuffer(rows, dtype=np.uint8)
+    kinds = BYTE_KINDS[text]
+    whitespace = kinds == WHITESPACE
+    line_start = np.concatenate([[0], np.flatnonzero(text == ord('\n')) + 1])
+    line_start = line_start[line_start < text.size]
+    field_start = np.flatnonzero(~whitespace[1:] & whitespace[:-1]) + 1
+    if not whitespace[0]:
+        field_start = np.concatenate([[0], field_start])
+
+    def per_line(positions):
+        lines = np.searchsorted(line_start, positions, side='right') - 1
+        return np.bincount(lines, minlength=line_start.size)
+
+    valid = per_line(field_start) >= NUMERIC_COLUMNS
+    line_end = np.append(line_start[1:], text.size)
+    other = np.flatnonzero(per_line(np.flatnonzero(kinds == OTHER_CHARACTER)) > 0)
+    for line in other[valid[other]]:
+        valid[line] = _numeric_row(rows[line_start[line] : line_end[line]])
+
+    # the kept rows are joined from runs of valid lines
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], valid, [0]]).astype(np.int8)))
+    kept = b''.join(
+        rows[line_start[first] : line_end[last - 1]]
+        for first, last in zip(edges[::2], edges[1::2])
+    )
+    data, n_failed = _load_bisected(kept)
     logger.debug(
-        'Parsed numeric data',
-        w_count=len(wavelengths),
-        lf_count=len(lum_flux),
-        rc_count=len(raw_counts),
-        dc_count=len(dark_counts),
+        'Skipped malformed rows', rows=int(line_start.size - valid.sum() + n_failed)
     )
+    return data
+
 
-    return wavelengths, lum_flux, raw_counts, dark_counts
+def _load_bisected(rows):
+    """
+    Converts the bytes `rows` into an ``(N, 4)`` array, splitting them in halves
+    until the rows that fail to convert are single lines, which are skipped.
+    Returns the array and the number of skipped lines.
+    """
+    try:
+        return _load_numeric_stream(io.BytesIO(rows)), 0
+    except ValueError:
+        middle = rows.rfind(b'\n', 0, len(rows) // 2) + 1 or _next_line(rows, 0)
+        if middle >= len(rows):
+            return np.empty((0, NUMERIC_COLUMNS), dtype=np.float64), 1
+        first, n_first = _load_bisected(rows[:middle])
+        second, n_second = _load_bisected(rows[middle:])
+        return np.concatenate([first, second]), n_first + n_second
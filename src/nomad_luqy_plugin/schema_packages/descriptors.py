@@ -0,0 +1,103 @@
+"""
+Scalar descriptors of absolute PL spectra, computed for ``(n_spectra, N)``
+arrays on a shared wavelength axis in one vectorized pass.
+"""
+
+import numpy as np
+
+from .generalized_planck import (
+    flux_per_energy,
+    masked_linear_fit,
+    wavelength_to_energy,
+)
+
+# The Urbach tail is fitted on the low-energy side of the peak, where the flux
+# lies between URBACH_END and URBACH_START times the peak flux.
+URBACH_START = 0.5
+URBACH_END = 1e-2
+MIN_URBACH_POINTS = 5
+
+
+def _trapezoid(y, x):
+    return 0.5 * ((y[:, 1:] + y[:, :-1]) * np.diff(x)).sum(axis=1)
+
+
+def _half_max_crossing(wavelength, flux, half, lower, upper):
+    """Linearly interpolates the wavelength where the flux crosses `half`."""
+    w0, w1 = wavelength[lower], wavelength[upper]
+    f0 = np.take_along_axis(flux, lower[:, None], axis=1)[:, 0]
+    f1 = np.take_along_axis(flux, upper[:, None], axis=1)[:, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return w0 + (half - f0) * (w1 - w0) / (f1 - f0)
+
+
+def spectral_descriptors(wavelength, flux):
+    """
+    Computes descriptors of the spectra `flux` (``(n_spectra, N)``, photons per
+    s, cm² and nm) on the wavelength axis `wavelength` (``(N,)``, in nm).
+
+    Returns a dict of ``(n_spectra,)`` arrays: peak wavelength (nm) and energy
+    (eV), full width at half maximum (nm), flux-weighted centroid wavelength
+    (nm), integrated photon flux (photons per s and cm²) and the Urbach energy
+    (eV) of the low-energy tail. Values that cannot be determined are NaN.
+    """
+    wavelength = np.asarray(wavelength, dtype=np.float64)
+    flux = np.atleast_2d(np.asarray(flux, dtype=np.float64))
+    order = np.argsort(wavelength)
+    wavelength = wavelength[order]
+    flux = np.nan_to_num(flux[:, order])
+    n_spectra, n_points = flux.shape
+    rows = np.arange(n_spectra)
+
+    peak_idx = flux.argmax(axis=1)
+    peak_flux = flux[rows, peak_idx]
+    peak_wavelength = wavelength[peak_idx]
+
+    # last point below half maximum left of the peak, first one right of it
+    half = peak_flux / 2
+    idx = np.arange(n_points)
+    below = flux < half[:, None]
+    left = np.where(below & (idx < peak_idx[:, None]), idx, -1).max(axis=1)
+    right = np.where(below & (idx > peak_idx[:, None]), idx, n_points).min(axis=1)
+    has_width = (left >= 0) & (right < n_points) & (peak_flux > 0)
+    left = np.clip(left, 0, n_points - 2)
+    right = np.clip(right, 1, n_points - 1)
+    fwhm = _half_max_crossing(
+        wavelength, flux, half, right - 1, right
+    ) - _half_max_crossing(wavelength, flux, half, left, left + 1)
+
+    integrated = _trapezoid(flux, wavelength)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        centroid = _trapezoid(flux * wavelength, wavelength) / integrated
+
+    # ln(phi(E)) rises linearly with E below the gap, the slope is 1 / E_U
+    energy = wavelength_to_energy(wavelength)
+    flux_e = flux_per_energy(wavelength, flux)
+    peak_flux_e = flux_e[rows, peak_idx]
+    urbach_mask = (
+        (idx > peak_idx[:, None])
+        & (flux_e <= URBACH_START * peak_flux_e[:, None])
+        & (flux_e >= URBACH_END * peak_flux_e[:, None])
+        & (flux_e > 0)
+    )
+    with np.errstate(divide='ignore'):
+        log_flux = np.log(np.where(urbach_mask, flux_e, 1.0))
+    slope, _, n = masked_linear_fit(
+        np.broadcast_to(energy, flux.shape), log_flux, urbach_mask
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        urbach_energy = np.where(
+            (n >= MIN_URBACH_POINTS) & (slope > 0), 1 / slope, np.nan
+        )
+
+    has_peak = peak_flux > 0
+    return {
+        'peak_wavelength': np.where(has_peak, peak_wavelength, np.nan),
+        'peak_energy': np.where(
+            has_peak, wavelength_to_energy(peak_wavelength), np.nan
+        ),
+        'fwhm': np.where(has_width, fwhm, np.nan),
+        'centroid_wavelength': np.where(has_peak, centroid, np.nan),
+        'integrated_photon_flux': integrated,
+        'urbach_energy': urbach_energy,
+    }
@@ -0,0 +1,49 @@
+import numpy as np
+
+
+def minmax_decimate(x, y_2d, max_points):
+    """
+    Reduces each row of `y_2d` (shape ``(n_series, N)``, sharing the axis `x`)
+    to at most `max_points` points for plotting.
+
+    The interior points are split into equally sized buckets and the minimum and
+    maximum of every bucket are kept in their original order, so peaks, dips and
+    steep edges survive. The first and last point are always kept. Returns the
+    x and y values as ``(n_series, M)`` arrays; if no reduction is needed, `x`
+    is broadcast to the shape of `y_2d`.
+    """
+    x = np.asarray(x)
+    y_2d = np.asarray(y_2d)
+    if not y_2d.size:
+        empty = np.empty((len(y_2d), 0))
+        return empty, empty
+    n_series, n = y_2d.shape
+    n_buckets = (max_points - 2) // 2
+    if max_points <= 0 or n <= max_points or n_buckets < 1:
+        return np.broadcast_to(x, y_2d.shape), y_2d
+
+    interior = y_2d[:, 1:-1]
+    bucket_size = -(-interior.shape[1] // n_buckets)
+    n_buckets = -(-interior.shape[1] // bucket_size)
+    pad = n_buckets * bucket_size - interior.shape[1]
+    buckets = np.pad(interior, ((0, 0), (0, pad)), mode='edge').reshape(
+        n_series, n_buckets, bucket_size
+    )
+
+    offsets = 1 + bucket_size * np.arange(n_buckets)
+    picks = np.stack(
+        [buckets.argmin(axis=2) + offsets, buckets.argmax(axis=2) + offsets],
+        axis=2,
+    )
+    # padded positions repeat the last interior point
+    picks = np.sort(np.minimum(picks, n - 2), axis=2).reshape(n_series, -1)
+
+    idx = np.concatenate(
+        [
+            np.zeros((n_series, 1), dtype=picks.dtype),
+            picks,
+            np.full((n_series, 1), n - 1, dtype=picks.dtype),
+        ],
+        axis=1,
+    )
+    return x[idx], np.take_along_axis(y_2d, idx, axis=1)
@@ -0,0 +1,76 @@
+"""
+Compact JSON encoding of the line traces of AbsPL figures.
+
+Plotly.js (2.28 and later) reads arrays given as ``{'dtype', 'bdata'}`` objects
+with the base64-encoded little-endian values. As float32, a point takes under
+11 characters for x and y together instead of a JSON literal of about 10
+characters per value, at the 7 significant digits of the exports. An axis with
+equal steps is stored as ``x0`` and ``dx`` instead of an array, and traces with
+many points are drawn with WebGL. The wavelength axes of the LuQY Pro do not
+have equal steps, so their traces still carry the x values.
+"""
+
+import base64
+
+import numpy as np
+
+# above this number of points in a figure, its traces are drawn with WebGL
+WEBGL_MIN_POINTS = 10000
+# largest deviation from equal steps, in steps, of an axis stored as x0 and dx
+UNIFORM_AXIS_TOLERANCE = 1e-3
+
+
+def typed_array(values, dtype='f4'):
+    """Encodes `values` as a plotly.js typed array of `dtype`, e.g. 'f4'."""
+    values = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder('<'))
+    return {'dtype': dtype, 'bdata': base64.b64encode(values.tobytes()).decode()}
+
+
+def uniform_axis(x):
+    """Returns the start and step of `x` if its steps are equal, else None."""
+    if x.size < 2:  # noqa: PLR2004
+        return None
+    dx = (x[-1] - x[0]) / (x.size - 1)
+    deviation = np.abs(x - (x[0] + dx * np.arange(x.size))).max()
+    if dx == 0 or deviation > UNIFORM_AXIS_TOLERANCE * abs(dx):
+        return None
+    return float(x[0]), float(dx)
+
+
+def line_traces(  # noqa: PLR0913
+    x_2d,
+    y_2d,
+    names,
+    *,
+    hovertemplate=None,
+    typed_arrays=True,
+    webgl_min_points=WEBGL_MIN_POINTS,
+):
+    """
+    Returns the plotly trace dicts of the lines `y_2d` over `x_2d` (both
+    ``(n_series, N)``) named `names`. If all rows of `x_2d` are the same axis
+    with equal steps, the traces get ``x0`` and ``dx`` instead of x arrays.
+    Without `typed_arrays`, the arrays are written as lists.
+    """
+    x_2d = np.asarray(x_2d, dtype=np.float64)
+    y_2d = np.asarray(y_2d, dtype=np.float64)
+    if not y_2d.size:
+        return []
+    axis = None
+    if x_2d.shape[0] and (x_2d == x_2d[0]).all():
+        axis = uniform_axis(x_2d[0])
+    encode = typed_array if typed_arrays else np.ndarray.tolist
+    trace_type = 'scattergl' if y_2d.size > webgl_min_points else 'scatter'
+
+    traces = []
+    for name, x, y in zip(names, x_2d, y_2d):
+        trace = {'type': trace_type, 'mode': 'lines', 'name': name}
+        if hovertemplate is not None:
+            trace['hovertemplate'] = hovertemplate
+        if axis is None:
+            trace['x'] = encode(x)
+        else:
+            trace['x0'], trace['dx'] = axis
+        trace['y'] = encode(y)
+        traces.append(trace)
+    return traces
@@ -0,0 +1,47 @@
+"""
+Compact fingerprints of absolute PL spectra for similarity search.
+
+A fingerprint is the photon flux per energy resampled onto the fixed energy
+grid `FINGERPRINT_ENERGY` and scaled to unit length, stored as float32. The
+cosine similarity of two spectra is then the dot product of their fingerprints,
+independent of their wavelength axes and absolute intensities.
+"""
+
+import numpy as np
+
+from .generalized_planck import flux_per_energy, wavelength_to_energy
+
+# 10 meV steps from 1.15 to 2.3 eV, the range of the LuQY Pro spectrometer
+FINGERPRINT_ENERGY = np.linspace(1.15, 2.3, 116)
+
+
+def spectral_fingerprints(wavelength, flux, energy_grid=FINGERPRINT_ENERGY):
+    """
+    Computes the fingerprints of the spectra `flux` (``(n_spectra, N)``, per
+    nm) on the wavelength axis `wavelength` (``(N,)``, in nm).
+
+    Returns an ``(n_spectra, len(energy_grid))`` float32 array. The flux is
+    linearly interpolated and zero outside the measured range. Rows of spectra
+    without positive flux on the grid are NaN.
+    """
+    wavelength = np.asarray(wavelength, dtype=np.float64)
+    flux = np.atleast_2d(flux_per_energy(wavelength, np.nan_to_num(flux)))
+    energy = wavelength_to_energy(wavelength)
+    order = np.argsort(energy)
+    energy, flux = energy[order], flux[:, order]
+
+    # interpolation weights are shared by all spectra on the same axis
+    right = np.clip(np.searchsorted(energy, energy_grid), 1, energy.size - 1)
+    left = right - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = (energy_grid - energy[left]) / (energy[right] - energy[left])
+    inside = (energy_grid >= energy[0]) & (energy_grid <= energy[-1])
+    resampled = np.where(
+        inside, flux[:, left] * (1 - weight) + flux[:, right] * weight, 0.0
+    )
+    resampled = np.clip(resampled, 0.0, None)
+
+    norm = np.linalg.norm(resampled, axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fingerprints = np.where(norm > 0, resampled / norm, np.nan)
+    return fingerprints.astype(np.float32)
@@ -0,0 +1,138 @@
+"""
+Vectorized generalized-Planck analysis of absolute PL spectra.
+
+In the high-energy tail of the emission, where the absorptivity is close to one
+and ``E - QFLS >> kT``, the generalized Planck law reduces to
+
+    phi(E) = 2 pi E**2 / (h**3 c**2) * exp(-(E - QFLS) / kT),
+
+so ``ln(phi / (2 pi E**2 / (h**3 c**2)))`` is a straight line in E with slope
+``-1/kT`` and intercept ``QFLS/kT``. The line is fitted with closed-form least
+squares on whole ``(n_spectra, N)`` arrays at once.
+"""
+
+import numpy as np
+
+HC_EV_NM = 1239.841984  # h*c in eV nm
+K_B_EV = 8.617333262e-5  # Boltzmann constant in eV/K
+# 2 pi / (h**3 c**2) in photons / (s cm**2 eV**3)
+PLANCK_PREFACTOR = 2 * np.pi / ((4.135667696e-15) ** 3 * (2.99792458e10) ** 2)
+
+# The tail window starts where the flux dropped below TAIL_START of the peak
+# and ends where it drops below TAIL_END of the peak.
+TAIL_START = 0.5
+TAIL_END = 1e-3
+MIN_TAIL_POINTS = 5
+# a few kT at room temperature, shorter tails do not fix the slope
+MIN_TAIL_SPAN = 0.05  # eV
+# carrier temperatures outside this range are not physical for a measurement
+# at room temperature, the tail is then not a Boltzmann tail
+MIN_TEMPERATURE = 250.0  # K
+MAX_TEMPERATURE = 500.0  # K
+
+
+def wavelength_to_energy(wavelength):
+    """Converts wavelengths in nm into photon energies in eV."""
+    return HC_EV_NM / np.asarray(wavelength, dtype=np.float64)
+
+
+def flux_per_energy(wavelength, flux_density):
+    """
+    Converts a spectral photon flux per nm into a flux per eV on the energy axis
+    `wavelength_to_energy(wavelength)`.
+    """
+    wavelength = np.asarray(wavelength, dtype=np.float64)
+    return np.asarray(flux_density, dtype=np.float64) * wavelength**2 / HC_EV_NM
+
+
+def tail_mask(energy, flux, tail_start=TAIL_START, tail_end=TAIL_END):
+    """
+    Selects the high-energy tail of every spectrum: points above the peak energy
+    whose flux lies between `tail_end` and `tail_start` times the peak flux.
+    """
+    flux = np.atleast_2d(flux)
+    energy = np.broadcast_to(energy, flux.shape)
+    peak_idx = np.nanargmax(np.where(np.isfinite(flux), flux, -np.inf), axis=1)
+    peak_flux = np.take_along_axis(flux, peak_idx[:, None], axis=1)
+    peak_energy = np.take_along_axis(energy, peak_idx[:, None], axis=1)
+    with np.errstate(invalid='ignore'):
+        return (
+            (energy > peak_energy)
+            & (flux <= tail_start * peak_flux)
+            & (flux >= tail_end * peak_flux)
+            & (flux > 0)
+        )
+
+
+def fit_generalized_planck(  # noqa: PLR0913
+    energy,
+    flux,
+    tail_start=TAIL_START,
+    tail_end=TAIL_END,
+    min_points=MIN_TAIL_POINTS,
+    *,
+    min_span=MIN_TAIL_SPAN,
+    temperature_range=(MIN_TEMPERATURE, MAX_TEMPERATURE),
+):
+    """
+    Fits the high-energy tail of ``(n_spectra, N)`` spectral photon fluxes per eV
+    on the energy axis `energy` (``(N,)`` or ``(n_spectra, N)``, in eV).
+
+    Returns the quasi-Fermi level splitting in eV and the carrier temperature in
+    K as ``(n_spectra,)`` arrays, NaN where the tail has fewer than `min_points`
+    points, spans less than `min_span` eV or gives a temperature outside
+    `temperature_range`.
+    """
+    flux = np.atleast_2d(np.asarray(flux, dtype=np.float64))
+    energy = np.broadcast_to(np.asarray(energy, dtype=np.float64), flux.shape)
+    mask = tail_mask(energy, flux, tail_start, tail_end)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y = np.log(np.where(mask, flux, 1.0) / (PLANCK_PREFACTOR * energy**2))
+    slope, intercept, n = masked_linear_fit(energy, y, mask)
+    span = np.where(mask, energy, -np.inf).max(axis=1) - np.where(
+        mask, energy, np.inf
+    ).min(axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        temperature = -1.0 / (slope * K_B_EV)
+        valid = (
+            (n >= min_points)
+            & (span >= min_span)
+            & (temperature >= temperature_range[0])
+            & (temperature <= temperature_range[1])
+        )
+        kt = np.where(valid, K_B_EV * temperature, np.nan)
+        qfls = np.where(valid, intercept * kt, np.nan)
+
+    return qfls, kt / K_B_EV
+
+
+def masked_linear_fit(x, y, mask):
+    """
+    Least-squares straight line through the points of every row of `x` and `y`
+    selected by `mask`. Returns the slopes, intercepts and number of points per
+    row; rows with fewer than two points get NaN.
+    """
+    x = np.where(mask, x, 0.0)
+    y = np.where(mask, y, 0.0)
+    n = mask.sum(axis=1)
+    sx = x.sum(axis=1)
+    sy = y.sum(axis=1)
+    sxx = (x * x).sum(axis=1)
+    sxy = (x * y).sum(axis=1)
+    slope, intercept = linear_fit_from_sums(n, sx, sy, sxx, sxy)
+
+    return slope, intercept, n
+
+
+def linear_fit_from_sums(n, sx, sy, sxx, sxy):
+    """
+    Least-squares slope and intercept from the number of points and the sums of
+    x, y, x**2 and x*y. NaN if there are fewer than two distinct x values.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (n * sxy - sx * sy) / (n * sxx - sx**2)
+        intercept = (sy - slope * sx) / n
+
+    return slope, intercept
@@ -0,0 +1,141 @@
+import collections
+import hashlib
+import os
+import shutil
+import uuid
+
+import h5py
+import numpy as np
+
+# chunked, shuffled and gzip compressed, readable with any HDF5 reader
+DATASET_OPTIONS = {'chunks': True, 'compression': 'gzip', 'shuffle': True}
+# Prefix of the raw files with the arrays shared by the entries of an upload.
+# Every file holds one array and is named by its content, so it never changes
+# once written.
+SHARED_ARRAYS_PREFIX = 'luqy_shared_'
+# Number of shared arrays kept in memory by `read_hdf5_reference`.
+SHARED_CACHE_SIZE = 256
+
+_shared_arrays = collections.OrderedDict()
+
+
+def hdf5_reference(archive, filename, path):
+    """
+    Returns the reference to the dataset `path` in the raw file `filename` in the
+    form expected by `HDF5Reference` quantities.
+    """
+    upload_id = getattr(archive.metadata, 'upload_id', None)
+    if upload_id:
+        return f'/uploads/{upload_id}/raw/{filename}#{path}'
+    return f'{filename}#{path}'
+
+
+def write_hdf5_datasets(archive, filename, datasets, logger, *, update=True):
+    """
+    Writes the arrays in `datasets`, a dict of dataset path to array, to the raw
+    file `filename`. With `update`, the other datasets of an existing file are
+    kept and those with the same path are replaced, otherwise the file is
+    created anew. Returns a dict of dataset path to reference.
+
+    The file is written under a temporary name next to it and then renamed, so
+    that readers and parallel writers never see a partially written file.
+    """
+    context = archive.m_context
+    suffix = f'.{uuid.uuid4().hex}.tmp'
+    with context.raw_file(f'{filename}{suffix}', 'w+b') as raw_file:
+        temporary_path = raw_file.name
+        try:
+            if update and context.raw_path_exists(filename):
+                with context.raw_file(filename, 'rb') as existing:
+                    shutil.copyfileobj(existing, raw_file)
+            with h5py.File(raw_file, 'a') as h5:
+                for path, data in datasets.items():
+                    if path in h5:
+                        del h5[path]
+                    h5.create_dataset(path, data=np.asarray(data), **DATASET_OPTIONS)
+        except BaseException:
+            raw_file.close()
+            os.remove(temporary_path)
+            raise
+    os.replace(temporary_path, temporary_path[: -len(suffix)])
+    logger.debug('Wrote spectral arrays to HDF5', file=filename, datasets=len(datasets))
+
+    return {path: hdf5_reference(archive, filename, path) for path in datasets}
+
+
+def array_fingerprint(values):
+    """Returns a hex digest of the dtype, shape and content of an array."""
+    values = np.ascontiguousarray(values)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f'{values.dtype.str}{values.shape}'.encode())
+    digest.update(values.data)
+    return digest.hexdigest()
+
+
+def write_shared_arrays(archive, arrays, logger):
+    """
+    Stores each array of `arrays`, a dict of name to array, once per upload in
+    a file in the upload root named by its fingerprint. Arrays that are already
+    stored are not written again. Returns a dict of name to reference.
+    """
+    references = {}
+    for name, values in arrays.items():
+        fingerprint = array_fingerprint(values)
+        filename = f'{SHARED_ARRAYS_PREFIX}{name}-{fingerprint}.h5'
+        path = f'/{name}'
+        if stored_array_matches(archive, filename, path, values):
+            logger.debug('Shared array exists already', file=filename)
+            references[name] = hdf5_reference(archive, filename, path)
+        else:
+            written = write_hdf5_datasets(
+                archive, filename, {path: values}, logger, update=False
+            )
+            references[name] = written[path]
+
+    return references
+
+
+def stored_array_matches(archive, filename, path, values):
+    """
+    Whether the raw file `filename` exists and holds a readable dataset `path`
+    with the shape and dtype of `values`.
+    """
+    if not archive.m_context.raw_path_exists(filename):
+        return False
+    try:
+        with archive.m_context.raw_file(filename, 'rb') as raw_file:
+            with h5py.File(raw_file, 'r') as h5:
+                dataset = h5.get(path)
+                return (
+                    isinstance(dataset, h5py.Dataset)
+                    and dataset.shape == np.shape(values)
+                    and dataset.dtype == np.asarray(values).dtype
+                )
+    except OSError:
+        return False
+
+
+def read_hdf5_reference(archive, reference):
+    """
+    Reads the dataset behind an `HDF5Reference` value from the raw files. Shared
+    arrays are cached in memory and returned read-only.
+    """
+    filename, path = reference.rsplit('#', 1)
+    if '/raw/' in filename:
+        filename = filename.split('/raw/', 1)[1]
+    shared = filename.startswith(SHARED_ARRAYS_PREFIX)
+    # the file name is the fingerprint of the content, valid across uploads
+    if shared and filename in _shared_arrays:
+        _shared_arrays.move_to_end(filename)
+        return _shared_arrays[filename]
+
+    with archive.m_context.raw_file(filename, 'rb') as raw_file:
+        with h5py.File(raw_file, 'r') as h5:
+            values = h5[path][()]
+
+    if shared:
+        values.setflags(write=False)
+        _shared_arrays[filename] = values
+        if len(_shared_arrays) > SHARED_CACHE_SIZE:
+            _shared_arrays.popitem(last=False)
+    return values
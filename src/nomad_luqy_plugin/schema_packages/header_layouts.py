@@ -0,0 +1,167 @@
+"""
+Registry of the header layouts written by the LuQY Pro firmware versions.
+
+A header is a timestamp line followed by ``key<TAB>value`` lines. Its
+signature is the tuple of keys in file order, with an empty key for the
+timestamp line. The first header with a given signature compiles a parse plan
+that maps each line position to the target field and converter, later headers
+with that signature only apply the cached plan. Signatures that are not in
+`HEADER_LAYOUTS` are parsed with the fields that are known. They are reported
+at info level once per signature and process, later files at debug level.
+"""
+
+import functools
+from collections.abc import Callable
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+TIMESTAMP_KEY = ''
+TIMESTAMP_FORMATS = ('%m/%d/%Y %I:%M:%S %p', '%m/%d/%Y %H:%M:%S')
+
+# unknown header signatures reported at info level in this process
+_reported_signatures = set()
+
+
+def parse_timestamp(value):
+    """Converts the timestamp line into an ISO 8601 string."""
+    for timestamp_format in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(value, timestamp_format).isoformat()
+        except ValueError:
+            continue
+    raise ValueError(f'Unknown timestamp format: {value}')
+
+
+class HeaderField(NamedTuple):
+    """Where a header value goes and how it is converted."""
+
+    target: str  # 'settings' or 'results'
+    name: str
+    convert: Callable
+
+
+HEADER_FIELDS = {
+    TIMESTAMP_KEY: HeaderField('settings', 'timestamp', parse_timestamp),
+    'LuQY (%)': HeaderField('results', 'luminescence_quantum_yield', float),
+    'QFLS (eV)': HeaderField('results', 'quasi_fermi_level_splitting', float),
+    'QFLS Confidence': HeaderField(
+        'results', 'quasi_fermi_level_splitting_confidence', float
+    ),
+    'iVoc (V)': HeaderField('results', 'implied_voc', float),
+    'iVoc Confidence': HeaderField('results', 'implied_voc_confidence', float),
+    'Laser intensity (suns)': HeaderField('settings', 'laser_intensity_suns', float),
+    'Bias Voltage (V)': HeaderField('settings', 'bias_voltage', float),
+    'SMU current density (mA/cm2)': HeaderField(
+        'settings', 'smu_current_density', float
+    ),
+    'Integration Time (ms)': HeaderField('settings', 'integration_time', float),
+    'Delay time (s)': HeaderField('settings', 'delay_time', float),
+    'Bandgap (eV)': HeaderField('results', 'bandgap', float),
+    'Jsc (mA/cm2)': HeaderField('results', 'derived_jsc', float),
+    'EQE @ laser wavelength': HeaderField('settings', 'eqe_laser_wavelength', float),
+    'Laser spot size (cm²)': HeaderField('settings', 'laser_spot_size', float),
+    'Subcell area (cm²)': HeaderField('settings', 'subcell_area', float),
+    'Subcell': HeaderField('settings', 'subcell_description', str),
+}
+
+_COMMON_KEYS = (
+    'Laser intensity (suns)',
+    'Bias Voltage (V)',
+    'SMU current density (mA/cm2)',
+    'Integration Time (ms)',
+    'Delay time (s)',
+    'Bandgap (eV)',
+    'Jsc (mA/cm2)',
+    'EQE @ laser wavelength',
+    'Laser spot size (cm²)',
+    'Subcell area (cm²)',
+    'Subcell',
+)
+# header signatures of the known firmware versions, named by the value they
+# report with the LuQY
+HEADER_LAYOUTS = {
+    (TIMESTAMP_KEY, 'LuQY (%)', 'QFLS (eV)', 'QFLS Confidence', *_COMMON_KEYS): 'QFLS',
+    (TIMESTAMP_KEY, 'LuQY (%)', 'iVoc (V)', 'iVoc Confidence', *_COMMON_KEYS): 'iVoc',
+}
+
+
+class ParsePlan(NamedTuple):
+    """The compiled parse plan of one header signature."""
+
+    layout: Optional[str]  # None for unknown layouts
+    fields: tuple  # (line position, HeaderField) pairs
+    unknown_keys: tuple
+
+
+def normalize_key(key):
+    """
+    Returns the key with the squared sign of exports whose encoding was not
+    recognized restored.
+    """
+    return key.replace('Â²', '²').replace('�', '²')
+
+
+def header_signature(lines):
+    """
+    Splits the non-empty header lines above the dashed separator into
+    ``[key, value]`` pairs, ``[value]`` for lines without a tab, and returns
+    them with the signature of the header.
+    """
+    pairs = [line.split('\t', 1) for line in lines if line.strip()]
+    signature = tuple(
+        normalize_key(pair[0].strip()) if len(pair) == 2 else TIMESTAMP_KEY  # noqa: PLR2004
+        for pair in pairs
+    )
+    return pairs, signature
+
+
+@functools.lru_cache(maxsize=64)
+def parse_plan(signature):
+    """Compiles and caches the parse plan of a header signature."""
+    fields = []
+    unknown_keys = []
+    for position, key in enumerate(signature):
+        if key == TIMESTAMP_KEY and position:
+            # free text lines below the timestamp carry no value
+            continue
+        field = HEADER_FIELDS.get(key)
+        if field is None:
+            unknown_keys.append(key)
+        else:
+            fields.append((position, field))
+    return ParsePlan(HEADER_LAYOUTS.get(signature), tuple(fields), tuple(unknown_keys))
+
+
+def apply_plan(plan, pairs, logger):
+    """
+    Converts the header values of `pairs` with `plan` and returns the settings
+    and results dicts.
+    """
+    values = {'settings': {}, 'results': {}}
+    for position, field in plan.fields:
+        value = pairs[position][-1].strip()
+        try:
+            values[field.target][field.name] = field.convert(value)
+        except ValueError:
+            logger.debug('Could not convert header value', field=field.name, val=value)
+    if plan.layout is not None:
+        values['settings']['header_layout'] = plan.layout
+    return values['settings'], values['results']
+
+
+def report_unknown_layout(signature, plan, logger):
+    """
+    Reports a header layout that is not registered with its unknown keys, at
+    info level for the first file of its signature and at debug level after.
+    """
+    if plan.layout is not None:
+        return
+    message = (
+        f'Unknown AbsPL header layout, parsing the known fields only, unknown '
+        f'keys: {", ".join(plan.unknown_keys) or "none"}'
+    )
+    if signature in _reported_signatures:
+        logger.debug(message)
+        return
+    _reported_signatures.add(signature)
+    logger.info(message)
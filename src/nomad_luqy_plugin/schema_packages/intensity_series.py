@@ -0,0 +1,66 @@
+"""
+Analysis of AbsPL measurements of one sample at several laser intensities.
+
+The quasi-Fermi level splitting follows
+
+    QFLS(I) = QFLS(1 sun) + n kT ln(I / 1 sun),
+
+so a straight line through QFLS over ln(I) gives the ideality factor `n` from
+its slope and the implied Voc at one sun from its intercept. Each intensity
+point also gives a point of the pseudo-JV curve: the implied voltage QFLS/q at
+the current density ``Jsc * (1 - I / 1 sun)`` that would have to be extracted
+under one sun for the device to sit at that splitting.
+"""
+
+import numpy as np
+
+from .generalized_planck import K_B_EV, linear_fit_from_sums
+
+ONE_SUN_POWER = 100.0  # mW/cm**2
+
+
+def fit_sums(intensity_suns, qfls):
+    """
+    Returns the number of points and the sums of x, y, x**2 and x*y with
+    x = ln(intensity) and y = QFLS over all points with a positive intensity and
+    a finite QFLS.
+    """
+    x = np.log(np.asarray(intensity_suns, dtype=np.float64))
+    y = np.asarray(qfls, dtype=np.float64)
+    valid = np.isfinite(x) & np.isfinite(y)
+    x, y = x[valid], y[valid]
+    return np.array([x.size, x.sum(), y.sum(), (x * x).sum(), (x * y).sum()])
+
+
+def ideality_fit(sums, temperature):
+    """
+    Returns the ideality factor and the QFLS at one sun in eV from the sums of
+    `fit_sums` at the `temperature` in K. Both are NaN with fewer than two
+    distinct intensities.
+    """
+    slope, intercept = linear_fit_from_sums(*np.asarray(sums, dtype=np.float64))
+    return slope / (K_B_EV * temperature), intercept
+
+
+def pseudo_jv(intensity_suns, qfls, jsc):
+    """
+    Returns the voltages in V and current densities in units of `jsc` of the
+    pseudo-JV curve, sorted by voltage, for the intensity points with a finite
+    QFLS in eV. `jsc` is the short-circuit current density at one sun.
+    """
+    intensity = np.asarray(intensity_suns, dtype=np.float64)
+    voltage = np.asarray(qfls, dtype=np.float64)
+    valid = np.isfinite(intensity) & np.isfinite(voltage)
+    order = np.argsort(voltage[valid])
+    return voltage[valid][order], (jsc * (1.0 - intensity[valid]))[order]
+
+
+def pseudo_performance(voltage, current_density, voc, jsc):
+    """
+    Returns the pseudo fill factor and the pseudo efficiency (with current
+    densities in mA/cm**2) at the maximum power point of the pseudo-JV curve.
+    """
+    if not voltage.size or not voc or not jsc:
+        return np.nan, np.nan
+    max_power = np.max(voltage * current_density)
+    return max_power / (voc * jsc), max_power / ONE_SUN_POWER
@@ -0,0 +1,53 @@
+"""
+Gridding of per-spot values of AbsPL maps for heatmaps.
+
+Spots are averaged into the cells of a regular grid spanning their stage
+coordinates. Spots on a regular raster of up to `MAP_MAX_CELLS` columns and
+rows fall into one cell each, denser or irregular maps are block-averaged.
+"""
+
+import numpy as np
+
+MAP_MAX_CELLS = 100
+
+
+def _axis_bins(coordinates, max_cells):
+    """Returns the bin edges and centers along one stage axis."""
+    n_cells = min(np.unique(coordinates).size, max_cells)
+    low, high = coordinates.min(), coordinates.max()
+    if n_cells < 2 or high == low:  # noqa: PLR2004
+        return np.array([low - 0.5, low + 0.5]), np.array([low])
+    edges = np.linspace(low, high, n_cells + 1)
+    # cell centers at the raster positions for regular rasters
+    centers = np.linspace(low, high, n_cells)
+    return edges, centers
+
+
+def grid_maps(x, y, values, max_cells=MAP_MAX_CELLS):
+    """
+    Averages the ``(n_maps, n_spots)`` `values` of the spots at the stage
+    coordinates `x` and `y` into regular grids.
+
+    Returns the cell centers along x and y and an ``(n_maps, ny, nx)`` array,
+    NaN for cells without spots or without finite values.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    x_edges, x_centers = _axis_bins(x, max_cells)
+    y_edges, y_centers = _axis_bins(y, max_cells)
+
+    grids = np.empty((values.shape[0], y_centers.size, x_centers.size))
+    for i, spot_values in enumerate(values):
+        finite = np.isfinite(spot_values)
+        sums, _, _ = np.histogram2d(
+            y[finite],
+            x[finite],
+            bins=(y_edges, x_edges),
+            weights=spot_values[finite],
+        )
+        counts, _, _ = np.histogram2d(y[finite], x[finite], bins=(y_edges, x_edges))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            grids[i] = sums / counts
+
+    return x_centers, y_centers, grids
@@ -0,0 +1,183 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from .abspl_normalizer import PARSER_VERSION, read_header_lines
+
+HASH_CHUNK_BYTES = 1024 * 1024
+CACHE_SUFFIX = '.npz'
+# prefix of the hashes of fingerprints that only cover the header of the file
+HEADER_HASH_PREFIX = 'header-'
+
+
+def content_hash(f, limit=None):
+    """
+    Hashes the parser version and the remaining bytes of the binary file `f`,
+    at most `limit` of them.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f'abspl-{PARSER_VERSION}'.encode())
+    remaining = float('inf') if limit is None else limit
+    while remaining > 0:
+        chunk = f.read(int(min(HASH_CHUNK_BYTES, remaining)))
+        if not chunk:
+            break
+        digest.update(chunk)
+        remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(f, name, previous=None, header_only=False):
+    """
+    Returns the fingerprint ``<parser version>:<size>:<mtime ns>:<hash>:<name>``
+    of the open binary file `f` named `name` and whether the file is unchanged
+    since the fingerprint `previous`.
+
+    The content is only hashed if the size or modification time differ from
+    `previous`, so an unchanged file costs a stat call. Files without a
+    modification time, e.g. zip members, are always hashed. With `header_only`,
+    only the header of the file is hashed; its data rows are not parsed.
+    """
+    try:
+        stat = os.fstat(f.fileno())
+        size, mtime = stat.st_size, str(stat.st_mtime_ns)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        size, mtime = f.seek(0, os.SEEK_END), ''
+        f.seek(0)
+
+    old = (previous or '').split(':', 4)
+    same_file = old[:2] == [PARSER_VERSION, str(size)] and old[4:] == [name]
+    if same_file and mtime and old[2] == mtime:
+        return previous, True
+
+    if header_only:
+        read_header_lines(f)
+        header_bytes = f.tell()
+        f.seek(0)
+        digest = HEADER_HASH_PREFIX + content_hash(f, header_bytes)
+    else:
+        digest = content_hash(f)
+    fingerprint = f'{PARSER_VERSION}:{size}:{mtime}:{digest}:{name}'
+    return fingerprint, same_file and old[3] == digest
+
+
+def fingerprint_key(fingerprint):
+    """
+    Returns the parse cache key of the file of `fingerprint`, i.e. its content
+    hash, or None if the fingerprint does not hash the whole file.
+    """
+    parts = (fingerprint or '').split(':', 4)
+    if len(parts) < 5 or parts[0] != PARSER_VERSION:  # noqa: PLR2004
+        return None
+    if parts[3].startswith(HEADER_HASH_PREFIX):
+        return None
+    return parts[3]
+
+
+class ParseCache:
+    """
+    Content-addressed on-disk cache for parsed AbsPL files.
+
+    Entries are keyed by a hash of the raw file bytes and the parser version and
+    stored as uncompressed ``.npz`` files holding the ``(n_series, N, 4)`` data
+    array and the header values of every spectrum as JSON. Entries are written
+    to a temporary file and renamed into place, so several processes can share
+    one directory. A hit refreshes the entry's modification time; once the
+    directory grows beyond `max_bytes`, the least recently used entries are
+    removed.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def key(self, f):
+        """
+        Hashes the remaining bytes of the open binary file `f`, the same hash as
+        the one of its `file_fingerprint`.
+        """
+        return content_hash(f)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def load(self, key, logger):
+        """
+        Returns the cached ``(series_headers, data)`` for `key` or None.
+        Unreadable entries, e.g. from an interrupted writer, count as misses.
+        """
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as entry:
+                header = json.loads(entry['header'].tobytes().decode())
+                data = entry['data']
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            logger.debug('Parse cache miss', key=key, **self.stats)
+            return None
+
+        self.hits += 1
+        logger.debug('Parse cache hit', key=key, **self.stats)
+        series_headers = [(settings, results) for settings, results in header]
+        return series_headers, data
+
+    def store(self, key, series_headers, data, logger):
+        header = json.dumps(series_headers)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.directory, prefix='.tmp-', suffix=CACHE_SUFFIX
+            )
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(
+                    f,
+                    data=np.ascontiguousarray(data, dtype=np.float64),
+                    header=np.frombuffer(header.encode(), dtype=np.uint8),
+                )
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning('Could not write parse cache entry', key=key, error=str(e))
+            return
+        self.evict(logger)
+
+    def evict(self, logger):
+        """Removes least recently used entries until the cache fits `max_bytes`."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for dir_entry in it:
+                if dir_entry.name.startswith('.') or not dir_entry.name.endswith(
+                    CACHE_SUFFIX
+                ):
+                    continue
+                try:
+                    stat = dir_entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, dir_entry.path))
+                total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # already evicted by another process
+                pass
+            else:
+                self.evictions += 1
+            total -= size
+        logger.debug('Parse cache size', bytes=total, **self.stats)
@@ -0,0 +1,121 @@
+"""
+Opt-in timing and memory spans for the AbsPL parsing and normalization stages.
+
+A sampled fraction of normalizations is profiled. Within such a normalization,
+every `span` logs its wall time, its peak allocation above the allocation at
+its start (if memory tracing is on) and the counters the stage adds, such as
+bytes read or rows parsed, through the structlog logger of the normalization.
+Outside of a sampled normalization, `span` costs a dict allocation.
+"""
+
+import contextlib
+import contextvars
+import functools
+import random
+import time
+import tracemalloc
+
+# None while no normalization decided on sampling, False if it was sampled out
+_active_profiler = contextvars.ContextVar('abspl_profiler', default=None)
+
+
+class Profiler:
+    """Logs the spans of one profiled normalization."""
+
+    def __init__(self, logger, trace_memory=True):
+        self.logger = logger
+        self.trace_memory = trace_memory
+        # running peaks of the open spans, innermost last
+        self._peaks = []
+
+    def _update_peaks(self):
+        _, peak = tracemalloc.get_traced_memory()
+        for i, open_peak in enumerate(self._peaks):
+            self._peaks[i] = max(open_peak, peak)
+        tracemalloc.reset_peak()
+
+    @contextlib.contextmanager
+    def span(self, stage, **fields):
+        stats = dict(fields)
+        start_memory = 0
+        if self.trace_memory:
+            self._update_peaks()
+            start_memory, _ = tracemalloc.get_traced_memory()
+            self._peaks.append(start_memory)
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            seconds = time.perf_counter() - start
+            if self.trace_memory:
+                self._update_peaks()
+                stats['peak_bytes'] = self._peaks.pop() - start_memory
+            self.logger.info(
+                'AbsPL stage profile', stage=stage, seconds=seconds, **stats
+            )
+
+
+@contextlib.contextmanager
+def profiling(logger, sample_rate, trace_memory=True):
+    """
+    Decides whether the enclosed normalization is profiled and, if so, wraps it
+    in a ``total`` span. Nested calls keep the decision of the outermost one.
+    """
+    if _active_profiler.get() is not None:
+        yield
+        return
+    if sample_rate <= 0 or random.random() >= sample_rate:  # noqa: S311
+        token = _active_profiler.set(False)
+        try:
+            yield
+        finally:
+            _active_profiler.reset(token)
+        return
+
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profiler = Profiler(logger, trace_memory=trace_memory)
+    token = _active_profiler.set(profiler)
+    try:
+        with profiler.span('total'):
+            yield
+    finally:
+        _active_profiler.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
+
+
+@contextlib.contextmanager
+def span(stage, **fields):
+    """
+    Profiles the enclosed stage if the current normalization is sampled. Yields
+    a dict to which the stage can add counters for the log record.
+    """
+    profiler = _active_profiler.get()
+    if not profiler:
+        yield {}
+        return
+    with profiler.span(stage, **fields) as stats:
+        yield stats
+
+
+def profiled(configuration):
+    """
+    Decorates a `normalize` method to be profiled at the sample rate of the
+    schema package entry point `configuration`.
+    """
+
+    def decorator(normalize):
+        @functools.wraps(normalize)
+        def wrapper(self, archive, logger):
+            with profiling(
+                logger,
+                configuration.profile_sample_rate,
+                trace_memory=configuration.profile_memory,
+            ):
+                return normalize(self, archive, logger)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,123 @@
+"""
+Quality checks of absolute PL spectra, computed for ``(n_spectra, N)`` arrays on
+a shared wavelength axis in one vectorized pass.
+
+Depending on the firmware, the raw counts are exported with the dark spectrum
+already subtracted (they scatter around zero outside the emission) or as the
+total detector counts (they sit at the dark level). The signal counts are the
+raw counts in the first case and raw minus dark counts in the second. Exports
+of the first kind fail the negative count check, since their dark spectrum
+lies above the raw counts on the whole detector.
+"""
+
+import warnings
+
+import numpy as np
+
+# just below the full scale of a 16-bit detector
+SATURATION_COUNTS = 65000.0
+MAX_SATURATION_FRACTION = 0.0
+MAX_NEGATIVE_FRACTION = 0.05
+MIN_SIGNAL_TO_NOISE = 10.0
+# raw counts with a median below this fraction of the dark counts are dark
+# subtracted
+DARK_SUBTRACTED_RATIO = 0.1
+# dark counts above the raw counts by more than this fraction of the dark
+# counts are a bad point, smaller excesses are noise of the total counts
+DARK_EXCESS_RATIO = 0.05
+# scales the median absolute deviation to the standard deviation of a normal
+MAD_TO_STD = 1.4826
+
+QUALITY_ISSUES = ('saturated', 'negative counts', 'low SNR', 'no emission')
+
+
+def _fraction(mask, where):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (mask & where).sum(axis=1) / where.sum(axis=1)
+
+
+def signal_counts(raw, dark):
+    """
+    Returns the dark corrected counts of the ``(n_spectra, N)`` raw and dark
+    counts. Raw counts that were already dark subtracted are returned as is.
+    """
+    subtracted = np.abs(np.median(raw, axis=1)) < DARK_SUBTRACTED_RATIO * np.median(
+        dark, axis=1
+    )
+    return np.where(subtracted[:, None], raw, raw - dark)
+
+
+def step_noise(values):
+    """
+    Estimates the standard deviation of the noise of every row of `values` from
+    its point-to-point differences, insensitive to the shape of a peak.
+    """
+    steps = np.diff(values, axis=1)
+    deviation = np.abs(steps - np.median(steps, axis=1, keepdims=True))
+    return MAD_TO_STD * np.median(deviation, axis=1) / np.sqrt(2)
+
+
+def spectrum_quality(
+    wavelength, flux, raw_counts, dark_counts, saturation_counts=SATURATION_COUNTS
+):
+    """
+    Checks the spectra `flux`, `raw_counts` and `dark_counts` (``(n_spectra,
+    N)``) on the wavelength axis `wavelength` (``(N,)``, in nm).
+
+    Returns a dict of ``(n_spectra,)`` arrays: the fraction of points at which
+    the detector counts reach `saturation_counts`, the fraction of points with
+    negative raw counts or dark counts above the raw counts, the ratio of the
+    peak signal to the noise of the signal, the fraction of points with zero
+    flux, the first and last wavelength with non-zero flux, the pass/fail flag
+    and a boolean ``(n_spectra, len(QUALITY_ISSUES))`` array of the failed
+    checks.
+    """
+    wavelength = np.asarray(wavelength, dtype=np.float64)
+    flux = np.nan_to_num(np.atleast_2d(np.asarray(flux, dtype=np.float64)))
+    raw = np.nan_to_num(np.atleast_2d(np.asarray(raw_counts, dtype=np.float64)))
+    dark = np.nan_to_num(np.atleast_2d(np.asarray(dark_counts, dtype=np.float64)))
+    everywhere = np.ones(raw.shape, dtype=bool)
+
+    signal = signal_counts(raw, dark)
+    detector = signal + dark
+
+    emission = flux != 0
+    has_emission = emission.any(axis=1)
+
+    saturation = _fraction(detector >= saturation_counts, everywhere)
+    # over the whole detector range, a dark frame larger than the raw counts
+    # is as bad outside the emission as in it
+    negative = _fraction(
+        (raw < 0) | (dark - raw > DARK_EXCESS_RATIO * np.abs(dark)), everywhere
+    )
+
+    noise = step_noise(signal)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        snr = np.where(noise > 0, signal.max(axis=1) / noise, np.nan)
+
+    band_wavelength = np.where(emission, wavelength, np.nan)
+    with warnings.catch_warnings():
+        # all-NaN rows of spectra without emission
+        warnings.simplefilter('ignore', RuntimeWarning)
+        band_start = np.nanmin(band_wavelength, axis=1)
+        band_end = np.nanmax(band_wavelength, axis=1)
+
+    issues = np.stack(
+        [
+            saturation > MAX_SATURATION_FRACTION,
+            negative > MAX_NEGATIVE_FRACTION,
+            snr < MIN_SIGNAL_TO_NOISE,
+            ~has_emission,
+        ],
+        axis=1,
+    )
+    return {
+        'saturation_fraction': saturation,
+        'negative_count_fraction': negative,
+        'signal_to_noise_ratio': snr,
+        'empty_flux_fraction': _fraction(~emission, everywhere),
+        'emission_band_start': band_start,
+        'emission_band_end': band_end,
+        'quality_passed': ~issues.any(axis=1),
+        'issues': issues,
+    }
@@ -1,12 +1,13 @@
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
+import os
+import warnings
 
+import numpy as np
 from nomad.config import config
 from nomad.datamodel.data import (
     ArchiveSection,
     EntryData,
 )
+from nomad.datamodel.hdf5 import HDF5Reference
 from nomad.datamodel.metainfo.annotations import (
     ELNAnnotation,
     ELNComponentEnum,
@@ -21,21 +22,91 @@ from nomad.datamodel.metainfo.plot import (
     PlotSection,
 )
 from nomad.metainfo import (
+    Datetime,
+    MEnum,
     Quantity,
     SchemaPackage,
     Section,
     SubSection,
 )
+from nomad.utils import get_logger
 from nomad_measurements.general import NOMADMeasurementsCategory
 
-from .abspl_normalizer import parse_abspl_data
+from .abspl_normalizer import (
+    align_spectra,
+    classify_series,
+    parse_abspl_data,
+    parse_abspl_header,
+)
+from .descriptors import spectral_descriptors
+from .downsampling import minmax_decimate
+from .figures import line_traces
+from .fingerprint import spectral_fingerprints
+from .generalized_planck import (
+    K_B_EV,
+    fit_generalized_planck,
+    flux_per_energy,
+    wavelength_to_energy,
+)
+from .hdf5_storage import (
+    read_hdf5_reference,
+    write_hdf5_datasets,
+    write_shared_arrays,
+)
+from .intensity_series import (
+    fit_sums,
+    ideality_fit,
+    pseudo_jv,
+    pseudo_performance,
+)
+from .mapping import grid_maps
+from .parse_cache import ParseCache, file_fingerprint, fingerprint_key
+from .profiling import profiled, span
+from .quality import QUALITY_ISSUES, spectrum_quality
+from .uncertainty import UNCERTAINTY_QUANTITIES, propagate_uncertainties
 
 configuration = config.get_plugin_entry_point(
     'nomad_luqy_plugin.schema_packages:schema_package_entry_point'
 )
 
+parse_cache = (
+    ParseCache(configuration.parse_cache_dir, configuration.parse_cache_max_bytes)
+    if configuration.parse_cache_dir
+    else None
+)
+
 m_package = SchemaPackage()
 
+# Bump whenever a change to the spectral analysis changes its results, so that
+# entries whose data file did not change are analyzed again.
+ANALYSIS_VERSION = '1'
+
+# arrays usually identical for all files of a spectrometer session
+SHARED_ARRAYS = ('wavelength', 'dark_spectrum_counts', 'dark_spectrum_counts_series')
+# hover text of the traces of the spectrum figure
+SPECTRUM_HOVERTEMPLATE = 'Wavelength: %{x}<br>Luminescence: %{y}<extra></extra>'
+# spectral arrays of a single spectrum, stored as `<name>_series` for series
+SPECTRAL_ARRAYS = (
+    'luminescence_flux_density',
+    'raw_spectrum_counts',
+    'dark_spectrum_counts',
+)
+# values of a mapping spot derived from its data file
+MAPPING_SPOT_VALUES = (
+    'luminescence_quantum_yield',
+    'quasi_fermi_level_splitting',
+    'fitted_quasi_fermi_level_splitting',
+    'peak_wavelength',
+)
+# header values stored per spectrum for multi-spectrum files
+SERIES_HEADER_KEYS = (
+    'laser_intensity_suns',
+    'bias_voltage',
+    'smu_current_density',
+    'luminescence_quantum_yield',
+    'quasi_fermi_level_splitting',
+)
+
 
 class AbsPLSettings(ArchiveSection):
     """
@@ -45,6 +116,21 @@ class AbsPLSettings(ArchiveSection):
 
     m_def = Section(label='AbsPLSettings')
 
+    timestamp = Quantity(
+        type=Datetime,
+        description='Time of the acquisition from the first line of the data file.',
+        a_eln=ELNAnnotation(
+            component=ELNComponentEnum.DateTimeEditQuantity, label='Timestamp'
+        ),
+    )
+    header_layout = Quantity(
+        type=str,
+        description=(
+            'Header layout of the data file, e.g. "QFLS" or "iVoc" for the '
+            'firmware versions that report the QFLS or the implied Voc. Empty '
+            'for layouts unknown to the parser.'
+        ),
+    )
     laser_intensity_suns = Quantity(
         type=np.float64,
         description='Laser intensity in suns, e.g. 0.91.',
@@ -118,6 +204,36 @@ class AbsPLSettings(ArchiveSection):
     )
 
 
+class AbsPLSpectraHDF5(ArchiveSection):
+    """
+    References to the spectral arrays of an `AbsPLResult` that are stored in an
+    HDF5 file next to the archive instead of inline.
+    """
+
+    m_def = Section(label='AbsPLSpectraHDF5')
+
+    wavelength = Quantity(type=HDF5Reference, description='Wavelength in nm.')
+    luminescence_flux_density = Quantity(
+        type=HDF5Reference, description='Luminescence flux density.'
+    )
+    raw_spectrum_counts = Quantity(
+        type=HDF5Reference, description='Raw spectrum counts.'
+    )
+    dark_spectrum_counts = Quantity(
+        type=HDF5Reference, description='Dark spectrum counts.'
+    )
+    luminescence_flux_density_series = Quantity(
+        type=HDF5Reference,
+        description='Luminescence flux density of every spectrum of a series.',
+    )
+    raw_spectrum_counts_series = Quantity(
+        type=HDF5Reference, description='Raw spectrum counts of a series.'
+    )
+    dark_spectrum_counts_series = Quantity(
+        type=HDF5Reference, description='Dark spectrum counts of a series.'
+    )
+
+
 class AbsPLResult(MeasurementResult):
     """
     Section containing the measured spectra from the absolute PL measurement.
@@ -132,6 +248,13 @@ class AbsPLResult(MeasurementResult):
             component=ELNComponentEnum.NumberEditQuantity, label='LuQY (%)'
         ),
     )
+    luminescence_quantum_yield_std = Quantity(
+        type=np.float64,
+        description=(
+            'Standard deviation of the LuQY in percent from the count noise and '
+            'the EQE uncertainty.'
+        ),
+    )
     quasi_fermi_level_splitting = Quantity(
         type=np.float64,
         unit='eV',
@@ -140,6 +263,44 @@ class AbsPLResult(MeasurementResult):
             component=ELNComponentEnum.NumberEditQuantity, label='QFLS'
         ),
     )
+    quasi_fermi_level_splitting_std = Quantity(
+        type=np.float64,
+        unit='eV',
+        description=(
+            'Standard deviation of the QFLS from the count noise and the spot size '
+            'uncertainty.'
+        ),
+    )
+    quasi_fermi_level_splitting_confidence = Quantity(
+        type=np.float64,
+        description='Confidence value the instrument reports with the QFLS.',
+        a_eln=ELNAnnotation(
+            component=ELNComponentEnum.NumberEditQuantity, label='QFLS Confidence'
+        ),
+    )
+    implied_voc = Quantity(
+        type=np.float64,
+        unit='V',
+        description='Implied open-circuit voltage (iVoc) reported by the instrument.',
+        a_eln=ELNAnnotation(
+            component=ELNComponentEnum.NumberEditQuantity, label='iVoc'
+        ),
+    )
+    implied_voc_std = Quantity(
+        type=np.float64,
+        unit='V',
+        description=(
+            'Standard deviation of the iVoc from the count noise and the spot size '
+            'uncertainty.'
+        ),
+    )
+    implied_voc_confidence = Quantity(
+        type=np.float64,
+        description='Confidence value the instrument reports with the iVoc.',
+        a_eln=ELNAnnotation(
+            component=ELNComponentEnum.NumberEditQuantity, label='iVoc Confidence'
+        ),
+    )
     bandgap = Quantity(
         type=np.float64,
         unit='eV',
@@ -154,6 +315,13 @@ class AbsPLResult(MeasurementResult):
         description='Jsc, e.g. 10.32.',
         a_eln=ELNAnnotation(component=ELNComponentEnum.NumberEditQuantity, label='Jsc'),
     )
+    derived_jsc_std = Quantity(
+        type=np.float64,
+        unit='mA/cm**2',
+        description=(
+            'Standard deviation of the Jsc from the spot size and EQE uncertainties.'
+        ),
+    )
 
     wavelength = Quantity(
         type=np.float64,
@@ -178,6 +346,436 @@ class AbsPLResult(MeasurementResult):
         description='Dark spectrum counts.',
     )
 
+    fitted_quasi_fermi_level_splitting = Quantity(
+        type=np.float64,
+        unit='eV',
+        description=(
+            'Quasi-Fermi level splitting from a generalized-Planck fit of the '
+            'high-energy tail of the luminescence flux density.'
+        ),
+    )
+    fitted_carrier_temperature = Quantity(
+        type=np.float64,
+        unit='K',
+        description=(
+            'Carrier temperature from a generalized-Planck fit of the high-energy '
+            'tail of the luminescence flux density.'
+        ),
+    )
+
+    peak_wavelength = Quantity(
+        type=np.float64,
+        unit='nm',
+        description='Wavelength of the PL maximum.',
+    )
+    peak_energy = Quantity(
+        type=np.float64,
+        unit='eV',
+        description='Photon energy of the PL maximum.',
+    )
+    fwhm = Quantity(
+        type=np.float64,
+        unit='nm',
+        description='Full width at half maximum of the PL peak.',
+    )
+    centroid_wavelength = Quantity(
+        type=np.float64,
+        unit='nm',
+        description='Flux-weighted mean wavelength of the PL spectrum.',
+    )
+    integrated_photon_flux = Quantity(
+        type=np.float64,
+        unit='1 / (s * cm**2)',
+        description='Luminescence flux density integrated over the wavelength.',
+    )
+    urbach_energy = Quantity(
+        type=np.float64,
+        unit='eV',
+        description=(
+            'Urbach energy, the inverse slope of ln(flux) over photon energy in '
+            'the low-energy tail of the PL peak.'
+        ),
+    )
+
+    spectral_fingerprint = Quantity(
+        type=np.float32,
+        shape=['*'],
+        description=(
+            'Photon flux per energy of the (first) spectrum on a fixed grid of '
+            '10 meV steps from 1.15 to 2.3 eV, scaled to unit length. Used to '
+            'find measurements with similar spectra.'
+        ),
+    )
+
+    saturation_fraction = Quantity(
+        type=np.float64,
+        description=(
+            'Fraction of the points at which the detector counts reach the '
+            'saturation level, the largest of all spectra of a series.'
+        ),
+    )
+    negative_count_fraction = Quantity(
+        type=np.float64,
+        description=(
+            'Fraction of the points with negative raw counts or dark counts above '
+            'the raw counts, the largest of all spectra of a series.'
+        ),
+    )
+    signal_to_noise_ratio = Quantity(
+        type=np.float64,
+        description=(
+            'Peak of the dark corrected counts over their noise, the smallest of '
+            'all spectra of a series.'
+        ),
+    )
+    empty_flux_fraction = Quantity(
+        type=np.float64,
+        description='Fraction of the points with zero luminescence flux density.',
+    )
+    emission_band_start = Quantity(
+        type=np.float64,
+        unit='nm',
+        description='Shortest wavelength with non-zero luminescence flux density.',
+    )
+    emission_band_end = Quantity(
+        type=np.float64,
+        unit='nm',
+        description='Longest wavelength with non-zero luminescence flux density.',
+    )
+    quality_passed = Quantity(
+        type=bool,
+        description='Whether all spectra of the result pass the quality checks.',
+    )
+    quality_issues = Quantity(
+        type=MEnum(*QUALITY_ISSUES),
+        shape=['*'],
+        description='Quality checks failed by at least one spectrum.',
+    )
+
+    n_series = Quantity(
+        type=int,
+        description=(
+            'Number of spectra in the data file. Files with more than one spectrum '
+            'store them in the `*_series` quantities on the shared wavelength axis.'
+        ),
+    )
+    series_type = Quantity(
+        type=MEnum('single', 'intensity sweep', 'bias sweep', 'repeated acquisition'),
+        description='Kind of measurement series, derived from the varying settings.',
+    )
+    luminescence_flux_density_series = Quantity(
+        type=np.float64,
+        unit='s / (cm**2 * nm)',
+        shape=['n_series', '*'],
+        description='Luminescence flux density of every spectrum of a series.',
+    )
+    raw_spectrum_counts_series = Quantity(
+        type=np.float64,
+        shape=['n_series', '*'],
+        description='Raw spectrum counts of every spectrum of a series.',
+    )
+    dark_spectrum_counts_series = Quantity(
+        type=np.float64,
+        shape=['n_series', '*'],
+        description='Dark spectrum counts of every spectrum of a series.',
+    )
+    laser_intensity_suns_series = Quantity(
+        type=np.float64,
+        shape=['n_series'],
+        description='Laser intensity in suns of every spectrum of a series.',
+    )
+    bias_voltage_series = Quantity(
+        type=np.float64,
+        unit='V',
+        shape=['n_series'],
+        description='Bias voltage of every spectrum of a series.',
+    )
+    smu_current_density_series = Quantity(
+        type=np.float64,
+        unit='mA/cm**2',
+        shape=['n_series'],
+        description='SMU current density of every spectrum of a series.',
+    )
+    luminescence_quantum_yield_series = Quantity(
+        type=np.float64,
+        shape=['n_series'],
+        description='Luminescence quantum yield in percent of every spectrum.',
+    )
+    quasi_fermi_level_splitting_series = Quantity(
+        type=np.float64,
+        unit='eV',
+        shape=['n_series'],
+        description='Quasi-Fermi level splitting of every spectrum of a series.',
+    )
+
+    fitted_quasi_fermi_level_splitting_series = Quantity(
+        type=np.float64,
+        unit='eV',
+        shape=['n_series'],
+        description='Fitted quasi-Fermi level splitting of every spectrum.',
+    )
+    fitted_carrier_temperature_series = Quantity(
+        type=np.float64,
+        unit='K',
+        shape=['n_series'],
+        description='Fitted carrier temperature of every spectrum of a series.',
+    )
+
+    spectra_hdf5 = SubSection(
+        section_def=AbsPLSpectraHDF5,
+        description='References to the spectral arrays if stored in an HDF5 file.',
+    )
+
+    spectra_pending = Quantity(
+        type=bool,
+        description=(
+            'Only the header of the data file was parsed. The spectral arrays are '
+            'read from the data file when they are first requested. The spectral '
+            'analysis and figure are only built by a full parse.'
+        ),
+    )
+
+    def spectral_array(self, name):
+        """
+        Returns the magnitude of the spectral quantity `name` as a float array or
+        None. Arrays stored in an HDF5 file or not yet parsed from the data file
+        are only read when requested.
+        """
+        values = getattr(self, name)
+        if values is None and self.spectra_pending:
+            self.spectra_pending = None
+            measurement = self.m_parent
+            if hasattr(measurement, 'load_spectra'):
+                logger = get_logger(__name__)
+                try:
+                    measurement.load_spectra(self.m_root(), logger, header=False)
+                except Exception as e:
+                    logger.warning(f'Could not load the spectra: {e}')
+            values = getattr(self, name)
+        if values is None and self.spectra_hdf5 is not None:
+            reference = getattr(self.spectra_hdf5, name)
+            if reference is not None:
+                values = read_hdf5_reference(self.m_root(), reference)
+        if values is None:
+            return None
+        return np.asarray(getattr(values, 'magnitude', values), dtype=np.float64)
+
+    def series_array(self, name):
+        """
+        Returns the spectral quantity `name`, e.g. 'luminescence_flux_density',
+        as an ``(n_series, N)`` array for single spectra and series alike.
+        """
+        values = self.spectral_array(f'{name}_series')
+        if values is None:
+            values = self.spectral_array(name)
+        if values is None:
+            return np.empty((0, 0))
+        # a single spectrum, also one without points, is one row
+        return np.atleast_2d(values)
+
+    def fit_generalized_planck(self, logger):
+        """
+        Fits the high-energy tail of all spectra at once with the generalized
+        Planck law and stores the quasi-Fermi level splitting and carrier
+        temperature next to the instrument values.
+        """
+        wavelength = self.spectral_array('wavelength')
+        flux = self.series_array('luminescence_flux_density')
+        if wavelength is None or not wavelength.size:
+            return
+        if flux.shape[-1] != wavelength.size:
+            return
+
+        qfls, temperature = fit_generalized_planck(
+            wavelength_to_energy(wavelength), flux_per_energy(wavelength, flux)
+        )
+        if np.isfinite(qfls[0]):
+            self.fitted_quasi_fermi_level_splitting = qfls[0]
+            self.fitted_carrier_temperature = temperature[0]
+        else:
+            # no stale values of an earlier fit
+            self.fitted_quasi_fermi_level_splitting = None
+            self.fitted_carrier_temperature = None
+            logger.debug('Generalized-Planck fit of the high-energy tail failed')
+        if flux.shape[0] > 1:
+            self.fitted_quasi_fermi_level_splitting_series = qfls
+            self.fitted_carrier_temperature_series = temperature
+        else:
+            self.fitted_quasi_fermi_level_splitting_series = None
+            self.fitted_carrier_temperature_series = None
+
+    def compute_descriptors(self, logger):
+        """
+        Stores scalar descriptors of the (first) spectrum, so that spectra can
+        be screened with search queries.
+        """
+        wavelength = self.spectral_array('wavelength')
+        flux = self.series_array('luminescence_flux_density')
+        if wavelength is None or not wavelength.size:
+            return
+        if flux.shape[-1] != wavelength.size:
+            return
+
+        descriptors = spectral_descriptors(wavelength, flux[:1])
+        for name, values in descriptors.items():
+            if np.isfinite(values[0]):
+                setattr(self, name, values[0])
+            else:
+                # no stale value of an earlier parse
+                setattr(self, name, None)
+                logger.debug('Could not determine spectral descriptor', name=name)
+
+    def compute_fingerprint(self, logger):
+        """Stores the spectral fingerprint of the (first) spectrum."""
+        wavelength = self.spectral_array('wavelength')
+        flux = self.series_array('luminescence_flux_density')
+        if wavelength is None or wavelength.size < 2:  # noqa: PLR2004
+            return
+        if flux.shape[-1] != wavelength.size:
+            return
+
+        fingerprint = spectral_fingerprints(wavelength, flux[:1])[0]
+        if np.isfinite(fingerprint).all():
+            self.spectral_fingerprint = fingerprint
+        else:
+            logger.debug('Spectrum has no flux on the fingerprint grid')
+
+    def check_quality(self, logger):
+        """
+        Checks the spectra for saturation, negative counts, a low signal to noise
+        ratio and missing emission and stores the worst values of a series, so
+        that bad measurements can be excluded with search queries.
+        """
+        wavelength = self.spectral_array('wavelength')
+        if wavelength is None or not wavelength.size:
+            return
+        arrays = [
+            self.series_array(name)
+            for name in (
+                'luminescence_flux_density',
+                'raw_spectrum_counts',
+                'dark_spectrum_counts',
+            )
+        ]
+        if any(values.shape[-1] != wavelength.size for values in arrays):
+            logger.debug('Spectra are incomplete, skipping the quality checks')
+            return
+
+        quality = spectrum_quality(
+            wavelength, *arrays, saturation_counts=configuration.saturation_counts
+        )
+        self.saturation_fraction = quality['saturation_fraction'].max()
+        self.empty_flux_fraction = quality['empty_flux_fraction'].max()
+        with warnings.catch_warnings():
+            # all-NaN if no spectrum has emission or noise
+            warnings.simplefilter('ignore', RuntimeWarning)
+            for name, reduce in (
+                ('negative_count_fraction', np.nanmax),
+                ('signal_to_noise_ratio', np.nanmin),
+                ('emission_band_start', np.nanmin),
+                ('emission_band_end', np.nanmax),
+            ):
+                value = reduce(quality[name])
+                setattr(self, name, value if np.isfinite(value) else None)
+        self.quality_passed = bool(quality['quality_passed'].all())
+        self.quality_issues = [
+            issue
+            for issue, failed in zip(QUALITY_ISSUES, quality['issues'].any(axis=0))
+            if failed
+        ]
+        if not self.quality_passed:
+            # flagged for search, the entry itself is fine
+            logger.info(
+                f'AbsPL spectrum failed the quality checks: '
+                f'{", ".join(self.quality_issues)}'
+            )
+
+    def compute_uncertainties(self, logger):
+        """
+        Propagates the count noise of the (first) spectrum and the configured
+        spot size and EQE uncertainties to the standard deviations of the LuQY,
+        QFLS, iVoc and Jsc reported by the instrument.
+        """
+        if configuration.uncertainty_samples <= 0:
+            return
+        wavelength = self.spectral_array('wavelength')
+        if wavelength is None or wavelength.size < 2:  # noqa: PLR2004
+            return
+        arrays = [
+            self.series_array(name)[:1]
+            for name in (
+                'luminescence_flux_density',
+                'raw_spectrum_counts',
+                'dark_spectrum_counts',
+            )
+        ]
+        if any(values.shape != (1, wavelength.size) for values in arrays):
+            logger.debug('Spectra are incomplete, skipping the uncertainties')
+            return
+        values = {}
+        for name in UNCERTAINTY_QUANTITIES:
+            value = getattr(self, name)
+            if value is not None:
+                values[name] = [getattr(value, 'magnitude', value)]
+        if not values:
+            return
+
+        stds = propagate_uncertainties(
+            wavelength,
+            *arrays,
+            values,
+            n_samples=configuration.uncertainty_samples,
+            spot_size_rel_uncertainty=configuration.spot_size_rel_uncertainty,
+            eqe_rel_uncertainty=configuration.eqe_rel_uncertainty,
+        )
+        for name, std in stds.items():
+            setattr(self, f'{name}_std', std[0] if np.isfinite(std[0]) else None)
+
+    def store_shared_arrays(self, archive, logger):
+        """
+        Moves the wavelength axis and dark spectra into files shared by all
+        entries of the upload with the same arrays and replaces them by
+        references in `spectra_hdf5`.
+        """
+        arrays = {}
+        for name in SHARED_ARRAYS:
+            values = getattr(self, name)
+            if values is not None:
+                arrays[name] = np.asarray(
+                    getattr(values, 'magnitude', values), dtype=np.float64
+                )
+        if not arrays:
+            return
+
+        references = write_shared_arrays(archive, arrays, logger)
+        if self.spectra_hdf5 is None:
+            self.spectra_hdf5 = AbsPLSpectraHDF5()
+        for name, reference in references.items():
+            setattr(self.spectra_hdf5, name, reference)
+            self.m_set(self.m_def.all_quantities[name], None)
+
+    def store_arrays_hdf5(self, archive, filename, logger):
+        """
+        Moves the spectral arrays into the raw file `filename` (chunked and
+        compressed) and replaces them by references in `spectra_hdf5`.
+        """
+        prefix = f'/results/{self.m_parent_index}'
+        datasets = {}
+        for name in AbsPLSpectraHDF5.m_def.all_quantities:
+            values = getattr(self, name)
+            if values is not None:
+                datasets[f'{prefix}/{name}'] = getattr(values, 'magnitude', values)
+        if not datasets:
+            return
+
+        references = write_hdf5_datasets(archive, filename, datasets, logger)
+        if self.spectra_hdf5 is None:
+            self.spectra_hdf5 = AbsPLSpectraHDF5()
+        for path, reference in references.items():
+            name = path.rsplit('/', 1)[1]
+            setattr(self.spectra_hdf5, name, reference)
+            self.m_set(self.m_def.all_quantities[name], None)
+
 
 class AbsPLMeasurement(Measurement, PlotSection):
     """
@@ -211,50 +809,59 @@ class AbsPLMeasurement(Measurement, PlotSection):
         ),
     )
 
+    analysis_version = Quantity(
+        type=str,
+        description=(
+            'Version of the spectral analysis that derived the descriptors, '
+            'quality checks and uncertainties of the results.'
+        ),
+    )
+
+    @profiled(configuration)
     def normalize(self, archive, logger):  # noqa: PLR0912, PLR0915
         super().normalize(archive, logger)
 
-        if self.results:
+        if self.results and self.results[0].spectra_pending:
+            # reading the spectra is what header-only parsing saves, the entry
+            # gets its analysis and figure once `full_parse` is set
+            logger.debug('Spectra are not parsed yet, skipping analysis and plots')
+        elif self.results:
+            self.analyze_results(logger)
 
             self.figures = []
 
-            x = np.asarray(self.results[0].wavelength)
-            y_raw = np.asarray(self.results[0].luminescence_flux_density)
+            result = self.results[0]
+            x = result.spectral_array('wavelength')
+            x = x if x is not None else np.empty(0)
+            y_2d = result.series_array('luminescence_flux_density')
+            if y_2d.shape[-1] != x.size:
+                logger.warning(
+                    'Wavelength and luminescence flux density sizes differ',
+                    wavelength=x.size,
+                    flux=y_2d.shape,
+                )
+                y_2d = np.empty((0, x.size))
 
-            # --- detect & reshape into (n_series, N) ---
-            if y_raw.ndim == 1:
-                if x.size == 0 or y_raw.size % x.size != 0:
-                    # Fallback: plot as single series if sizes don't align
-                    y_2d = y_raw.reshape(1, -1)
-                else:
-                    n_series = y_raw.size // x.size
-                    y_2d = y_raw.reshape(n_series, x.size)
-            elif y_raw.ndim == 2:
-                # Try to align so that axis 1 matches x
-                if y_raw.shape[1] == x.size:
-                    y_2d = y_raw
-                elif y_raw.shape[0] == x.size:
-                    y_2d = y_raw.T
-                else:
-                    # Fallback: flatten to a single series
-                    y_2d = y_raw.reshape(1, -1)
-            else:
-                # Unexpected shape, fallback to single series
-                y_2d = y_raw.reshape(1, -1)
+            # --- reduce points per trace, keeping peaks and edges ---
+            with span('figure decimation', points=y_2d.size) as stats:
+                x_2d, y_2d = minmax_decimate(x, y_2d, configuration.figure_max_points)
+                stats['plotted_points'] = y_2d.size
 
-            # --- build figure with one trace per curve ---
-            fig = go.Figure()
-            for i, y_vec in enumerate(y_2d):
-                fig.add_trace(
-                    go.Scatter(
-                        x=x,
-                        y=y_vec,
-                        mode='lines',
-                        name=f'Curve {i+1}',
-                        hovertemplate='Wavelength: %{x}<br>Luminescence: %{y}<extra></extra>',
-                    )
+            # --- build compact traces, one per curve ---
+            with span('figure build', traces=y_2d.shape[0]):
+                traces = line_traces(
+                    x_2d,
+                    y_2d,
+                    [f'Curve {i + 1}' for i in range(y_2d.shape[0])],
+                    hovertemplate=SPECTRUM_HOVERTEMPLATE,
+                    typed_arrays=configuration.figure_typed_arrays,
                 )
 
+            # plotly is imported here, it is not needed to load the plugin
+            import plotly.graph_objects as go  # noqa: PLC0415
+
+            fig = go.Figure()
+
             # --- shared layout & y-scale toggle (same as your original) ---
             fig.update_layout(
                 xaxis={
@@ -302,13 +909,16 @@ class AbsPLMeasurement(Measurement, PlotSection):
                     }
                 ],
                 template='plotly_white',
-                legend={'title': 'Series'}
+                legend={'title': 'Series'},
             )
 
+            with span('figure serialization'):
+                figure_json = fig.to_plotly_json()
+                figure_json['data'] = traces
             self.figures = [
                 PlotlyFigure(
                     label='AbsPL Spectrum (dynamic y-axis)',
-                    figure=fig.to_plotly_json(),
+                    figure=figure_json,
                 )
             ]
         else:
@@ -316,6 +926,23 @@ class AbsPLMeasurement(Measurement, PlotSection):
 
         logger.debug('Finished AbsPLMeasurement.normalize')
 
+    def analyze_results(self, logger):
+        """
+        Derives the descriptors, generalized-Planck fit, fingerprint, quality
+        checks and uncertainties of all results from their spectra.
+        """
+        with span('spectral analysis', results=len(self.results)):
+            for result in self.results:
+                result.compute_descriptors(logger)
+                result.fit_generalized_planck(logger)
+                result.compute_fingerprint(logger)
+        with span('quality checks', results=len(self.results)):
+            for result in self.results:
+                result.check_quality(logger)
+        with span('uncertainty propagation', results=len(self.results)):
+            for result in self.results:
+                result.compute_uncertainties(logger)
+        self.analysis_version = ANALYSIS_VERSION
 
 
 class AbsPLMeasurementELN(AbsPLMeasurement, EntryData):
@@ -327,46 +954,748 @@ class AbsPLMeasurementELN(AbsPLMeasurement, EntryData):
         ),
     )
 
-    def normalize(self, archive, logger):  # noqa: PLR0912, PLR0915
+    bundle_member = Quantity(
+        type=str,
+        description=(
+            'Path of the export inside the zip bundle this entry was parsed from. '
+            'Entries from bundles hold the parsed data and have no data file.'
+        ),
+    )
+    full_parse = Quantity(
+        type=bool,
+        description=(
+            'Parse the spectral arrays of the data file and build the spectral '
+            'analysis and figure even if the plugin is configured to parse only the '
+            'header.'
+        ),
+        a_eln=ELNAnnotation(component=ELNComponentEnum.BoolEditQuantity),
+    )
+    force_reparse = Quantity(
+        type=bool,
+        description=(
+            'Parse the data file and rebuild the analysis and figures on the next '
+            'save, even if the file did not change. Reset after the parse.'
+        ),
+        a_eln=ELNAnnotation(component=ELNComponentEnum.BoolEditQuantity),
+    )
+    data_file_fingerprint = Quantity(
+        type=str,
+        description=(
+            'Parser version, size, modification time, content hash and name of the '
+            'data file when it was last parsed. As long as they match, saving the '
+            'entry does not parse the file again, and settings and results edited '
+            'by hand are kept.'
+        ),
+    )
+
+    @profiled(configuration)
+    def normalize(self, archive, logger):  # noqa: PLR0912
         logger.debug('Starting AbsPLMeasurement.normalize', data_file=self.data_file)
         if self.settings is None:
             self.settings = AbsPLSettings()
 
+        if self.data_file and self.data_file_unchanged(archive, logger):
+            logger.debug('Data file is unchanged, skipping parsing and figures')
+            # the figures are kept from the last parse, the analysis is only
+            # redone if it changed with the plugin version
+            super(AbsPLMeasurement, self).normalize(archive, logger)
+            analyzed = self.analysis_version == ANALYSIS_VERSION
+            if self.results and not self.results[0].spectra_pending and not analyzed:
+                self.analyze_results(logger)
+            return
+
         if self.data_file:
             try:
-                # Call the new parser function
-                (
-                    settings_vals,
-                    result_vals,
-                    wavelengths,
-                    lum_flux,
-                    raw_counts,
-                    dark_counts,
-                ) = parse_abspl_data(self.data_file, archive, logger)
-
-                # Set settings
-                for key, val in settings_vals.items():
-                    setattr(self.settings, key, val)
-
-                # Set results header values
-                if not self.results:
-                    self.results = [AbsPLResult()]
-                for key, val in result_vals.items():
-                    setattr(self.results[0], key, val)
-
-                # Set spectral array data
-                self.results[0].wavelength = np.array(wavelengths, dtype=float)
-                self.results[0].luminescence_flux_density = np.array(
-                    lum_flux, dtype=float
-                )
-                self.results[0].raw_spectrum_counts = np.array(raw_counts, dtype=float)
-                self.results[0].dark_spectrum_counts = np.array(
-                    dark_counts, dtype=float
-                )
-
+                if configuration.header_only and not self.full_parse:
+                    with span('parse data file header'):
+                        settings_vals, result_vals = parse_abspl_header(
+                            self.data_file, archive, logger
+                        )
+                    result = self.set_header_values(settings_vals, result_vals)
+                    result.spectra_pending = True
+                else:
+                    # the content hash of the fingerprint is the cache key
+                    key = fingerprint_key(self.data_file_fingerprint)
+                    self.load_spectra(archive, logger, key=key)
             except Exception as e:
                 logger.warning(f'Could not parse the data file "{self.data_file}": {e}')
+                self.data_file_fingerprint = None
+            self.force_reparse = False
+        super().normalize(archive, logger)
+
+        # the figure is built, the arrays are only needed on request from now on
+        store_arrays = (
+            self.data_file and self.results and not self.results[0].spectra_pending
+        )
+        if configuration.shared_arrays and store_arrays:
+            try:
+                with span('shared array storage'):
+                    for result in self.results:
+                        result.store_shared_arrays(archive, logger)
+            except Exception as e:
+                logger.warning(f'Could not write the shared arrays: {e}')
+        if configuration.hdf5_arrays and store_arrays:
+            filename = f'{os.path.splitext(self.data_file)[0]}.h5'
+            try:
+                with span('hdf5 storage'):
+                    for result in self.results:
+                        result.store_arrays_hdf5(archive, filename, logger)
+            except Exception as e:
+                logger.warning(f'Could not write the HDF5 file "{filename}": {e}')
+
+    def data_file_unchanged(self, archive, logger):
+        """
+        Returns whether the data file was parsed before and did not change since,
+        unless a re-parse is forced. Otherwise updates `data_file_fingerprint` to
+        the current file, to be cleared if the parse fails.
+        """
+        header_only = configuration.header_only and not self.full_parse
+        try:
+            with span('data file fingerprint'):
+                with archive.m_context.raw_file(self.data_file, mode='rb') as f:
+                    fingerprint, unchanged = file_fingerprint(
+                        f, self.data_file, self.data_file_fingerprint, header_only
+                    )
+        except Exception as e:
+            logger.debug('Could not fingerprint the data file', error=str(e))
+            self.data_file_fingerprint = None
+            return False
+
+        # a touched but unchanged file keeps its new modification time
+        self.data_file_fingerprint = fingerprint
+        parsed = bool(self.results) and (
+            header_only or not self.results[0].spectra_pending
+        )
+        return unchanged and parsed and not self.force_reparse
+
+    def set_header_values(self, settings_vals, result_vals):
+        """
+        Sets the header values of the data file on the settings and the first
+        result, which is created if needed, and returns that result.
+        """
+        for key, val in settings_vals.items():
+            setattr(self.settings, key, val)
+        if self.datetime is None and self.settings.timestamp is not None:
+            self.datetime = self.settings.timestamp
+
+        if not self.results:
+            self.results = [AbsPLResult()]
+        result = self.results[0]
+        for key, val in result_vals.items():
+            setattr(result, key, val)
+        return result
+
+    def load_spectra(self, archive, logger, key=None, header=True):
+        """
+        Parses the whole data file and sets the header values and the spectral
+        arrays of the first result. `key` is the parse cache key of the file,
+        if known. Without `header`, the settings and header results are kept,
+        e.g. when the spectra of a header-only entry are read on first access.
+        """
+        with span('parse data file'):
+            parsed = parse_abspl_data(
+                self.data_file, archive, logger, cache=parse_cache, key=key
+            )
+        self.set_spectra(parsed, header=header)
+
+    def set_spectra(self, parsed, header=True):
+        """
+        Sets the header values and spectra returned by `parse_abspl_data`, only
+        the spectra and their per-spectrum header values without `header`.
+        """
+        (
+            settings_vals,
+            result_vals,
+            wavelengths,
+            lum_flux,
+            raw_counts,
+            dark_counts,
+            series_headers,
+        ) = parsed
+        if self.settings is None:
+            self.settings = AbsPLSettings()
+        if header or not self.results:
+            result = self.set_header_values(settings_vals, result_vals)
+        else:
+            result = self.results[0]
+        result.spectra_pending = None
+
+        # Set spectral array data, series share the wavelength axis
+        result.wavelength = wavelengths
+        result.n_series = lum_flux.shape[0]
+        result.series_type = classify_series(series_headers)
+        # a re-parse may switch between single spectra and series, the arrays
+        # of the other layout must not be read as stale data, inline or from
+        # an earlier HDF5 file
+        result.spectra_hdf5 = None
+        single = result.n_series == 1
+        for name in SPECTRAL_ARRAYS:
+            setattr(result, f'{name}_series' if single else name, None)
+        if single:
+            for key in SERIES_HEADER_KEYS:
+                setattr(result, f'{key}_series', None)
+            result.luminescence_flux_density = lum_flux[0]
+            result.raw_spectrum_counts = raw_counts[0]
+            result.dark_spectrum_counts = dark_counts[0]
+        else:
+            result.luminescence_flux_density_series = lum_flux
+            result.raw_spectrum_counts_series = raw_counts
+            result.dark_spectrum_counts_series = dark_counts
+            for key in SERIES_HEADER_KEYS:
+                values = [
+                    {**settings, **results}.get(key, np.nan)
+                    for settings, results in series_headers
+                ]
+                setattr(result, f'{key}_series', np.array(values))
+
+
+class AbsPLSession(EntryData):
+    """
+    A zip bundle with the LuQY Pro exports of one session. Every export of the
+    bundle becomes a child `AbsPLMeasurementELN` entry.
+    """
+
+    m_def = Section(
+        label='AbsPL Session',
+        categories=[NOMADMeasurementsCategory],
+    )
+
+    bundle_file = Quantity(
+        type=str,
+        description='Path of the zip bundle.',
+    )
+    members = Quantity(
+        type=str,
+        shape=['*'],
+        description='Paths of the exports inside the bundle.',
+    )
+    n_spectra = Quantity(
+        type=int,
+        description='Number of spectra in all exports of the bundle.',
+    )
+    settings = SubSection(
+        section_def=AbsPLSettings,
+        description='Settings that are the same for all exports of the bundle.',
+    )
+
+
+class AbsPLIntensityPoint(ArchiveSection):
+    """
+    One laser intensity of an intensity series, with the values copied from the
+    referenced measurement when the point is added to the series fit.
+    """
+
+    m_def = Section(label='Intensity Point')
+
+    measurement = Quantity(
+        type=AbsPLMeasurementELN,
+        description='The AbsPL measurement at this laser intensity.',
+        a_eln=ELNAnnotation(component=ELNComponentEnum.ReferenceEditQuantity),
+    )
+    laser_intensity_suns = Quantity(
+        type=np.float64,
+        description='Laser intensity in suns.',
+    )
+    quasi_fermi_level_splitting = Quantity(
+        type=np.float64,
+        unit='eV',
+        description=(
+            'Quasi-Fermi level splitting, the instrument QFLS, iVoc or the fitted '
+            'QFLS, whichever is available first.'
+        ),
+    )
+    luminescence_quantum_yield = Quantity(
+        type=np.float64,
+        description='Luminescence quantum yield in percent.',
+    )
+    derived_jsc = Quantity(
+        type=np.float64,
+        unit='mA/cm**2',
+        description='Jsc reported by the instrument for this measurement.',
+    )
+    included = Quantity(
+        type=bool,
+        description=(
+            'The values were read from the measurement. Remove and re-add the '
+            'point to read them again.'
+        ),
+    )
+
+    def read_measurement(self, logger):
+        """Copies the header values of the referenced measurement."""
+        measurement = self.measurement
+        if measurement is None or not measurement.results:
+            logger.warning('Intensity point without measurement results')
+            return
+        result = measurement.results[0]
+        if measurement.settings is not None:
+            self.laser_intensity_suns = measurement.settings.laser_intensity_suns
+        for name in (
+            'quasi_fermi_level_splitting',
+            'implied_voc',
+            'fitted_quasi_fermi_level_splitting',
+        ):
+            value = getattr(result, name)
+            if value is not None:
+                self.quasi_fermi_level_splitting = value.magnitude
+                break
+        self.luminescence_quantum_yield = result.luminescence_quantum_yield
+        self.derived_jsc = result.derived_jsc
+        self.included = True
+
+    def values(self):
+        """Returns the laser intensity and the QFLS in eV, NaN where missing."""
+        qfls = self.quasi_fermi_level_splitting
+        return (
+            np.nan if self.laser_intensity_suns is None else self.laser_intensity_suns,
+            np.nan if qfls is None else qfls.to('eV').magnitude,
+        )
+
+
+class AbsPLIntensitySeries(PlotSection, EntryData):
+    """
+    AbsPL measurements of one sample at several laser intensities, with the
+    ideality factor and the pseudo-JV curve derived from their QFLS.
+
+    Points are read from their measurements once, so adding a measurement does
+    not reload the others. The fit is recomputed from the values stored on the
+    points.
+    """
+
+    m_def = Section(
+        label='AbsPL Intensity Series',
+        categories=[NOMADMeasurementsCategory],
+    )
+
+    temperature = Quantity(
+        type=np.float64,
+        unit='K',
+        default=300.0,
+        description='Sample temperature used to compute the ideality factor.',
+        a_eln=ELNAnnotation(
+            component=ELNComponentEnum.NumberEditQuantity, defaultDisplayUnit='K'
+        ),
+    )
+    short_circuit_current_density = Quantity(
+        type=np.float64,
+        unit='mA/cm**2',
+        description=(
+            'Short-circuit current density at one sun for the pseudo-JV curve. If '
+            'not given, the instrument Jsc of the point closest to one sun is '
+            'scaled to one sun.'
+        ),
+        a_eln=ELNAnnotation(
+            component=ELNComponentEnum.NumberEditQuantity,
+            defaultDisplayUnit='mA/cm**2',
+        ),
+    )
+    n_points = Quantity(
+        type=int,
+        description='Number of intensity points in the fit.',
+    )
+    ideality_factor = Quantity(
+        type=np.float64,
+        description='Ideality factor from the slope of QFLS over ln(intensity).',
+    )
+    quasi_fermi_level_splitting_one_sun = Quantity(
+        type=np.float64,
+        unit='eV',
+        description='QFLS at one sun from the intercept of the fit.',
+    )
+    pseudo_voltage = Quantity(
+        type=np.float64,
+        unit='V',
+        shape=['*'],
+        description='Implied voltages of the pseudo-JV curve.',
+    )
+    pseudo_current_density = Quantity(
+        type=np.float64,
+        unit='mA/cm**2',
+        shape=['*'],
+        description='Current densities of the pseudo-JV curve.',
+    )
+    pseudo_fill_factor = Quantity(
+        type=np.float64,
+        description='Fill factor of the pseudo-JV curve.',
+    )
+    pseudo_efficiency = Quantity(
+        type=np.float64,
+        description='Power conversion efficiency of the pseudo-JV curve.',
+    )
+
+    points = SubSection(section_def=AbsPLIntensityPoint, repeats=True)
+
+    def normalize(self, archive, logger):
+        super().normalize(archive, logger)
+
+        for point in self.points:
+            if not point.included:
+                point.read_measurement(logger)
+
+        values = np.array(
+            [point.values() for point in self.points if point.included]
+        ).reshape(-1, 2)
+        intensity, qfls = values[:, 0], values[:, 1]
+        sums = fit_sums(intensity, qfls)
+        self.n_points = int(sums[0])
+
+        ideality, qfls_one_sun = ideality_fit(sums, self.temperature.to('K').magnitude)
+        self.ideality_factor = ideality if np.isfinite(ideality) else None
+        self.quasi_fermi_level_splitting_one_sun = (
+            qfls_one_sun if np.isfinite(qfls_one_sun) else None
+        )
+
+        # no stale values or figures of an earlier fit
+        self.pseudo_voltage = None
+        self.pseudo_current_density = None
+        self.pseudo_fill_factor = None
+        self.pseudo_efficiency = None
+        self.figures = []
+        if (
+            self.ideality_factor is None
+            or self.quasi_fermi_level_splitting_one_sun is None
+        ):
+            return
+        fitted = np.isfinite(qfls) & (intensity > 0)
+        self.figures = [
+            self.figure(intensity[fitted], qfls[fitted], ideality, qfls_one_sun)
+        ]
+
+        jsc = self.one_sun_jsc(values)
+        if jsc is None:
+            return
+        voltage, current_density = pseudo_jv(intensity, qfls, jsc)
+        self.pseudo_voltage = voltage
+        self.pseudo_current_density = current_density
+        fill_factor, efficiency = pseudo_performance(
+            voltage, current_density, qfls_one_sun, jsc
+        )
+        self.pseudo_fill_factor = fill_factor if np.isfinite(fill_factor) else None
+        self.pseudo_efficiency = efficiency if np.isfinite(efficiency) else None
+
+    def one_sun_jsc(self, values):
+        """Returns the one-sun Jsc in mA/cm**2 or None."""
+        if self.short_circuit_current_density is not None:
+            return self.short_circuit_current_density.to('mA/cm**2').magnitude
+        jsc = [
+            point.derived_jsc.to('mA/cm**2').magnitude
+            if point.derived_jsc is not None
+            else np.nan
+            for point in self.points
+            if point.included
+        ]
+        intensity = values[:, 0]
+        valid = np.isfinite(jsc) & (intensity > 0)
+        if not valid.any():
+            return None
+        closest = np.argmin(np.where(valid, np.abs(np.log(intensity)), np.inf))
+        return jsc[closest] / intensity[closest]
+
+    def figure(self, intensity, qfls, ideality, qfls_one_sun):
+        """Plots QFLS over the laser intensity with the fitted line."""
+        import plotly.graph_objects as go  # noqa: PLC0415
+
+        fig = go.Figure()
+        fig.add_trace(
+            go.Scatter(x=intensity, y=qfls, mode='markers', name='Measurements')
+        )
+        fit_intensity = np.geomspace(intensity.min(), intensity.max(), 50)
+        fit_qfls = qfls_one_sun + ideality * K_B_EV * self.temperature.to(
+            'K'
+        ).magnitude * np.log(fit_intensity)
+        fig.add_trace(
+            go.Scatter(
+                x=fit_intensity,
+                y=fit_qfls,
+                mode='lines',
+                name=f'Fit, n = {ideality:.2f}',
+            )
+        )
+        fig.update_layout(
+            xaxis={'title': {'text': 'Laser intensity (suns)'}, 'type': 'log'},
+            yaxis={'title': {'text': 'QFLS (eV)'}},
+            template='plotly_white',
+        )
+        return PlotlyFigure(label='QFLS vs. intensity', figure=fig.to_plotly_json())
+
+
+class AbsPLMappingSpot(ArchiveSection):
+    """One spot of an AbsPL map: a data file and its stage position."""
+
+    m_def = Section(label='Mapping Spot')
+
+    data_file = Quantity(
+        type=str,
+        description='Path to the raw data file measured at this spot.',
+        a_eln=ELNAnnotation(
+            component=ELNComponentEnum.FileEditQuantity, label='AbsPL data file'
+        ),
+    )
+    x_position = Quantity(
+        type=np.float64,
+        unit='mm',
+        description='Stage x position of the spot.',
+        a_eln=ELNAnnotation(
+            component=ELNComponentEnum.NumberEditQuantity, defaultDisplayUnit='mm'
+        ),
+    )
+    y_position = Quantity(
+        type=np.float64,
+        unit='mm',
+        description='Stage y position of the spot.',
+        a_eln=ELNAnnotation(
+            component=ELNComponentEnum.NumberEditQuantity, defaultDisplayUnit='mm'
+        ),
+    )
+    luminescence_quantum_yield = Quantity(
+        type=np.float64,
+        description='Luminescence quantum yield in percent.',
+    )
+    quasi_fermi_level_splitting = Quantity(
+        type=np.float64,
+        unit='eV',
+        description='Quasi-Fermi level splitting (QFLS or iVoc) of the instrument.',
+    )
+    fitted_quasi_fermi_level_splitting = Quantity(
+        type=np.float64,
+        unit='eV',
+        description='QFLS from the generalized Planck fit of the spectrum.',
+    )
+    peak_wavelength = Quantity(
+        type=np.float64,
+        unit='nm',
+        description='Wavelength of the emission maximum.',
+    )
+
+
+class AbsPLMapping(PlotSection, EntryData):
+    """
+    AbsPL spectra of several spots of one sample, stacked on the wavelength axis
+    of the first spot and reduced to per-spot values, their spread over the
+    sample and gridded maps.
+    """
+
+    m_def = Section(
+        label='AbsPL Mapping',
+        categories=[NOMADMeasurementsCategory],
+    )
+
+    n_spots = Quantity(
+        type=int,
+        description='Number of spots with a parsed spectrum.',
+    )
+    wavelength = Quantity(
+        type=np.float64,
+        unit='nm',
+        shape=['*'],
+        description='Wavelength axis shared by all spots.',
+    )
+    luminescence_flux_density = Quantity(
+        type=np.float64,
+        unit='s / (cm**2 * nm)',
+        shape=['n_spots', '*'],
+        description='Luminescence flux density of every spot.',
+    )
+    mean_luminescence_quantum_yield = Quantity(
+        type=np.float64,
+        description='Mean luminescence quantum yield of the spots in percent.',
+    )
+    std_luminescence_quantum_yield = Quantity(
+        type=np.float64,
+        description='Standard deviation of the luminescence quantum yield.',
+    )
+    mean_quasi_fermi_level_splitting = Quantity(
+        type=np.float64,
+        unit='eV',
+        description='Mean quasi-Fermi level splitting of the spots.',
+    )
+    std_quasi_fermi_level_splitting = Quantity(
+        type=np.float64,
+        unit='eV',
+        description='Standard deviation of the quasi-Fermi level splitting.',
+    )
+    std_peak_wavelength = Quantity(
+        type=np.float64,
+        unit='nm',
+        description='Standard deviation of the peak wavelength.',
+    )
+    map_x = Quantity(
+        type=np.float64,
+        unit='mm',
+        shape=['*'],
+        description='Stage x positions of the map cell centers.',
+    )
+    map_y = Quantity(
+        type=np.float64,
+        unit='mm',
+        shape=['*'],
+        description='Stage y positions of the map cell centers.',
+    )
+    luminescence_quantum_yield_map = Quantity(
+        type=np.float64,
+        shape=['*', '*'],
+        description='Luminescence quantum yield averaged per map cell, (y, x).',
+    )
+    quasi_fermi_level_splitting_map = Quantity(
+        type=np.float64,
+        unit='eV',
+        shape=['*', '*'],
+        description='Quasi-Fermi level splitting averaged per map cell, (y, x).',
+    )
+    peak_wavelength_map = Quantity(
+        type=np.float64,
+        unit='nm',
+        shape=['*', '*'],
+        description='Peak wavelength averaged per map cell, (y, x).',
+    )
+
+    spots = SubSection(section_def=AbsPLMappingSpot, repeats=True)
+
+    def normalize(self, archive, logger):
         super().normalize(archive, logger)
 
+        # no stale values of spots that fail to parse or maps without spots
+        for spot in self.spots:
+            for name in MAPPING_SPOT_VALUES:
+                setattr(spot, name, None)
+        for quantity in AbsPLMapping.m_def.quantities:
+            self.m_set(quantity, None)
+        self.figures = []
+
+        spots, spectra, header_values = [], [], []
+        for spot in self.spots:
+            if not spot.data_file:
+                continue
+            try:
+                _, result_vals, wavelengths, lum_flux, _, _, _ = parse_abspl_data(
+                    spot.data_file, archive, logger, cache=parse_cache
+                )
+            except Exception as e:
+                logger.warning(f'Could not parse the data file "{spot.data_file}": {e}')
+                continue
+            if not wavelengths.size:
+                logger.warning('Spot without spectrum', data_file=spot.data_file)
+                continue
+            spots.append(spot)
+            spectra.append(np.column_stack([wavelengths, lum_flux[0]]))
+            header_values.append(
+                (
+                    result_vals.get('luminescence_quantum_yield', np.nan),
+                    result_vals.get(
+                        'quasi_fermi_level_splitting',
+                        result_vals.get('implied_voc', np.nan),
+                    ),
+                )
+            )
+        self.n_spots = len(spots)
+        if not spots:
+            return
+
+        # pad to the column layout of the data files for the alignment
+        spectra = [np.pad(spectrum, ((0, 0), (0, 2))) for spectrum in spectra]
+        data = align_spectra(spectra, logger)
+        wavelength, flux = data[0, :, 0], data[:, :, 1]
+        self.wavelength = wavelength
+        self.luminescence_flux_density = flux
+
+        luqy, qfls = np.array(header_values).T
+        peak = spectral_descriptors(wavelength, flux)['peak_wavelength']
+        fitted_qfls, _ = fit_generalized_planck(
+            wavelength_to_energy(wavelength), flux_per_energy(wavelength, flux)
+        )
+        values = {
+            'luminescence_quantum_yield': luqy,
+            'quasi_fermi_level_splitting': qfls,
+            'fitted_quasi_fermi_level_splitting': fitted_qfls,
+            'peak_wavelength': peak,
+        }
+        for i, spot in enumerate(spots):
+            for name, spot_values in values.items():
+                if np.isfinite(spot_values[i]):
+                    setattr(spot, name, spot_values[i])
+
+        for name, spot_values in (
+            ('luminescence_quantum_yield', luqy),
+            ('quasi_fermi_level_splitting', qfls),
+        ):
+            finite = spot_values[np.isfinite(spot_values)]
+            setattr(self, f'mean_{name}', finite.mean() if finite.size else None)
+            setattr(self, f'std_{name}', finite.std() if finite.size else None)
+        finite = peak[np.isfinite(peak)]
+        self.std_peak_wavelength = finite.std() if finite.size else None
+
+        self.grid_maps(spots, np.array([luqy, qfls, peak]), logger)
+
+    def grid_maps(self, spots, values, logger):
+        """
+        Averages the ``(3, n_spots)`` LuQY, QFLS and peak wavelength `values`
+        into map grids and plots them.
+        """
+        positions = np.array(
+            [
+                [
+                    np.nan if position is None else position.to('mm').magnitude
+                    for position in (spot.x_position, spot.y_position)
+                ]
+                for spot in spots
+            ]
+        )
+        placed = np.isfinite(positions).all(axis=1)
+        if not placed.any():
+            logger.debug('No spot has a stage position, skipping the maps')
+            return
+
+        x, y, grids = grid_maps(
+            positions[placed, 0], positions[placed, 1], values[:, placed]
+        )
+        self.map_x = x
+        self.map_y = y
+        (
+            self.luminescence_quantum_yield_map,
+            self.quasi_fermi_level_splitting_map,
+            self.peak_wavelength_map,
+        ) = grids
+
+        import plotly.graph_objects as go  # noqa: PLC0415
+
+        labels = ('LuQY (%)', 'QFLS (eV)', 'Peak wavelength (nm)')
+        fig = go.Figure()
+        for i, (label, grid) in enumerate(zip(labels, grids)):
+            fig.add_trace(
+                go.Heatmap(
+                    x=x,
+                    y=y,
+                    z=grid,
+                    name=label,
+                    colorbar={'title': {'text': label}},
+                    visible=i == 0,
+                )
+            )
+        fig.update_layout(
+            xaxis={'title': {'text': 'x (mm)'}},
+            yaxis={'title': {'text': 'y (mm)'}, 'scaleanchor': 'x'},
+            updatemenus=[
+                {
+                    'buttons': [
+                        {
+                            'label': label,
+                            'method': 'update',
+                            'args': [{'visible': [j == i for j in range(len(labels))]}],
+                        }
+                        for i, label in enumerate(labels)
+                    ],
+                    'type': 'buttons',
+                    'direction': 'left',
+                    'showactive': True,
+                    'x': 1.0,
+                    'xanchor': 'right',
+                    'y': 1.15,
+                    'yanchor': 'top',
+                }
+            ],
+            template='plotly_white',
+        )
+        self.figures = [PlotlyFigure(label='AbsPL map', figure=fig.to_plotly_json())]
+
 
 m_package.__init_metainfo__()
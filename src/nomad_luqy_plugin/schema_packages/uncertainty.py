@@ -0,0 +1,142 @@
+"""
+Monte-Carlo propagation of measurement uncertainties to the AbsPL results.
+
+Three inputs are varied: the integrated luminescence flux, the laser spot size
+and the EQE at the laser wavelength. The instrument values then scale as
+
+- LuQY with ``I / EQE``, the spot size cancels,
+- QFLS and iVoc with ``kT ln(I / A)``, the EQE cancels,
+- Jsc with ``EQE / A``,
+
+where ``I`` is the integrated flux and ``A`` the spot size. The flux noise
+follows from the noise of the dark corrected counts, scaled to flux by the
+calibration of every point. It is a sum of independent point errors and thus
+drawn directly as the error of the integral. All samples of all spectra are
+drawn as one batch from a seeded generator, so that repeated normalizations
+store the same values.
+"""
+
+import warnings
+
+import numpy as np
+
+from .generalized_planck import K_B_EV
+from .quality import signal_counts, step_noise
+
+# number of Monte-Carlo samples per spectrum
+UNCERTAINTY_SAMPLES = 4000
+# relative standard uncertainties of the laser spot size and the EQE
+SPOT_SIZE_REL_UNCERTAINTY = 0.05
+EQE_REL_UNCERTAINTY = 0.02
+# device temperature of the QFLS, in K
+TEMPERATURE = 300.0
+# points with dark corrected counts above this many noise levels give the
+# flux calibration, which is interpolated in between
+SIGNIFICANT_COUNTS = 3.0
+# results whose standard deviations are propagated
+UNCERTAINTY_QUANTITIES = (
+    'luminescence_quantum_yield',
+    'quasi_fermi_level_splitting',
+    'implied_voc',
+    'derived_jsc',
+)
+
+
+def trapezoid_weights(x):
+    """Returns the weights `w` for which ``w @ y`` is the trapezoid integral."""
+    weights = np.zeros_like(x)
+    steps = np.abs(np.diff(x)) / 2
+    weights[:-1] += steps
+    weights[1:] += steps
+    return weights
+
+
+def flux_rel_uncertainty(wavelength, flux, raw_counts, dark_counts):
+    """
+    Returns the relative standard uncertainty of the integrated luminescence
+    flux of every spectrum (``(n_spectra, N)`` arrays) from the count noise.
+    NaN for spectra without emission or without significant counts.
+    """
+    order = np.argsort(wavelength)
+    wavelength = np.asarray(wavelength, dtype=np.float64)[order]
+    flux = np.nan_to_num(np.atleast_2d(flux)[:, order])
+    signal = signal_counts(
+        np.nan_to_num(np.atleast_2d(raw_counts)[:, order]),
+        np.nan_to_num(np.atleast_2d(dark_counts)[:, order]),
+    )
+    noise = step_noise(signal)
+    weights = trapezoid_weights(wavelength)
+
+    # flux per count, only known where the counts are well above the noise and
+    # linearly interpolated in between, constant beyond the outermost points
+    significant = (flux > 0) & (signal > SIGNIFICANT_COUNTS * noise[:, None])
+    index = np.arange(wavelength.size)
+    previous = np.maximum.accumulate(np.where(significant, index, -1), axis=1)
+    following = np.minimum.accumulate(
+        np.where(significant, index, wavelength.size)[:, ::-1], axis=1
+    )[:, ::-1]
+    low = np.where(previous < 0, following, previous).clip(0, wavelength.size - 1)
+    high = np.where(following == wavelength.size, previous, following).clip(
+        0, wavelength.size - 1
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(significant, flux / signal, 0.0)
+        low_ratio = np.take_along_axis(ratio, low, axis=1)
+        high_ratio = np.take_along_axis(ratio, high, axis=1)
+        span = wavelength[high] - wavelength[low]
+        fraction = np.where(span > 0, (wavelength - wavelength[low]) / span, 0.0)
+    calibration = low_ratio + fraction * (high_ratio - low_ratio)
+
+    variance = np.sum((weights * calibration * (flux != 0)) ** 2, axis=1) * noise**2
+    variance[~significant.any(axis=1)] = np.nan
+    integral = flux @ weights
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(integral > 0, np.sqrt(variance) / integral, np.nan)
+
+
+def propagate_uncertainties(  # noqa: PLR0913
+    wavelength,
+    flux,
+    raw_counts,
+    dark_counts,
+    values,
+    *,
+    n_samples=UNCERTAINTY_SAMPLES,
+    spot_size_rel_uncertainty=SPOT_SIZE_REL_UNCERTAINTY,
+    eqe_rel_uncertainty=EQE_REL_UNCERTAINTY,
+    seed=0,
+):
+    """
+    Propagates the count noise of the spectra (``(n_spectra, N)``) and the
+    relative uncertainties of the spot size and EQE to the `values`, a dict of
+    ``(n_spectra,)`` arrays of the `UNCERTAINTY_QUANTITIES` in their archive
+    units (%, eV, V, mA/cm²).
+
+    Returns a dict of the standard deviations of the given values, NaN where a
+    value is missing or, except for the Jsc, the flux uncertainty.
+    """
+    flux_rel = flux_rel_uncertainty(wavelength, flux, raw_counts, dark_counts)
+    rng = np.random.default_rng(seed)
+    # the count noise differs per spectrum, spot size and EQE are shared
+    flux_ratio = 1 + flux_rel[:, None] * rng.standard_normal((flux_rel.size, n_samples))
+    spot_ratio = 1 + spot_size_rel_uncertainty * rng.standard_normal(n_samples)
+    eqe_ratio = 1 + eqe_rel_uncertainty * rng.standard_normal(n_samples)
+
+    with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+        # flux samples at or below zero leave the logarithm undefined, spectra
+        # without a flux uncertainty have no finite samples
+        warnings.simplefilter('ignore', RuntimeWarning)
+        voltage_shift = K_B_EV * TEMPERATURE * np.log(flux_ratio / spot_ratio)
+        factors = {
+            'luminescence_quantum_yield': flux_ratio / eqe_ratio,
+            'derived_jsc': np.broadcast_to(eqe_ratio / spot_ratio, flux_ratio.shape),
+        }
+        stds = {}
+        for name, value in values.items():
+            column = np.asarray(value, dtype=np.float64)[:, None]
+            if name in factors:
+                samples = column * factors[name]
+            else:
+                samples = column + voltage_shift
+            stds[name] = np.nanstd(samples, axis=1)
+    return stds
@@ -0,0 +1,132 @@
+"""
+Nearest-neighbour search over the spectral fingerprints of AbsPL results.
+
+The fingerprints of a local archive store, e.g. the output of ``luqy-ingest``,
+are loaded into one contiguous float32 matrix, so that a query is a single
+matrix-vector product::
+
+    luqy-similar <archive directory or index.npz> <entry id> -k 10
+
+``--save index.npz`` stores the loaded index, which then loads without reading
+the archives again.
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from nomad_luqy_plugin.export import iter_local_archives
+from nomad_luqy_plugin.schema_packages.fingerprint import FINGERPRINT_ENERGY
+
+METRICS = ('cosine', 'l2')
+
+
+def archive_fingerprint(archive_dict):
+    """Returns the fingerprint of the first AbsPL result of an archive dict."""
+    results = (archive_dict.get('data') or {}).get('results') or []
+    if results and results[0].get('spectral_fingerprint') is not None:
+        return results[0]['spectral_fingerprint']
+    return None
+
+
+class SpectralIndex:
+    """Fingerprints of many entries with top-k cosine and L2 queries."""
+
+    def __init__(self, entry_ids, fingerprints):
+        self.entry_ids = np.asarray(entry_ids, dtype=str)
+        self.fingerprints = np.ascontiguousarray(fingerprints, dtype=np.float32)
+        if len(self.entry_ids):
+            self.fingerprints = self.fingerprints.reshape(len(self.entry_ids), -1)
+        else:
+            self.fingerprints = np.empty((0, FINGERPRINT_ENERGY.size), np.float32)
+        self.squared_norms = np.einsum('ij,ij->i', self.fingerprints, self.fingerprints)
+        self.positions = {entry_id: i for i, entry_id in enumerate(self.entry_ids)}
+
+    def __len__(self):
+        return len(self.entry_ids)
+
+    @classmethod
+    def from_archives(cls, store, entry_ids=None):
+        """Loads the fingerprints of the archives below `store`."""
+        ids = []
+        fingerprints = []
+        for entry_id, archive_dict in iter_local_archives(store, entry_ids):
+            fingerprint = archive_fingerprint(archive_dict)
+            if fingerprint is not None:
+                ids.append(entry_id)
+                fingerprints.append(fingerprint)
+        return cls(ids, np.array(fingerprints, dtype=np.float32))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as index:
+            return cls(index['entry_ids'], index['fingerprints'])
+
+    def save(self, path):
+        np.savez(path, entry_ids=self.entry_ids, fingerprints=self.fingerprints)
+
+    def query(self, fingerprint, k=10, metric='cosine', exclude=None):
+        """
+        Returns the ids and scores of the `k` entries closest to `fingerprint`,
+        closest first, without the entry `exclude`. The score is the cosine
+        similarity or the L2 distance of the fingerprints.
+        """
+        if metric not in METRICS:
+            raise ValueError(f'Unknown metric {metric}, use one of {METRICS}')
+        query = np.asarray(fingerprint, dtype=np.float32)
+        products = self.fingerprints @ query
+        if metric == 'cosine':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scores = products / np.sqrt(self.squared_norms * (query @ query))
+            keys = -np.nan_to_num(scores, nan=-np.inf)
+        else:
+            scores = np.sqrt(
+                np.maximum(self.squared_norms + query @ query - 2 * products, 0)
+            )
+            keys = scores.copy()
+        excluded = exclude is not None and exclude in self.positions
+        if excluded:
+            keys[self.positions[exclude]] = np.inf
+
+        k = min(k, len(self) - excluded)
+        if k <= 0:
+            return []
+        nearest = np.argpartition(keys, k - 1)[:k]
+        nearest = nearest[np.argsort(keys[nearest])]
+        return [(str(self.entry_ids[i]), float(scores[i])) for i in nearest]
+
+    def query_entry(self, entry_id, k=10, metric='cosine'):
+        """Returns the `k` entries closest to the indexed entry `entry_id`."""
+        fingerprint = self.fingerprints[self.positions[entry_id]]
+        return self.query(fingerprint, k, metric, exclude=entry_id)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='luqy-similar', description=__doc__.strip().splitlines()[0]
+    )
+    parser.add_argument('index', help='directory with *.archive.json files or index')
+    parser.add_argument('entry_id', help='entry whose spectrum is searched for')
+    parser.add_argument('-k', type=int, default=10, help='number of entries')
+    parser.add_argument('--metric', choices=METRICS, default='cosine')
+    parser.add_argument('--save', help='write the loaded index to this .npz file')
+    args = parser.parse_args(argv)
+
+    if args.index.endswith('.npz'):
+        index = SpectralIndex.load(args.index)
+    else:
+        index = SpectralIndex.from_archives(args.index)
+    if args.save:
+        index.save(args.save)
+    if args.entry_id not in index.positions:
+        print(f'No fingerprint for entry {args.entry_id}', file=sys.stderr)
+        return 1
+
+    for entry_id, score in index.query_entry(args.entry_id, args.k, args.metric):
+        print(f'{score:.6f}\t{entry_id}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
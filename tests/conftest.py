@@ -0,0 +1,18 @@
+import io
+import os.path
+
+import pytest
+
+from nomad_luqy_plugin.cli import ingest
+
+
+@pytest.fixture
+def archive_store(tmp_path):
+    """Archives of the test exports as written by ``luqy-ingest``."""
+    source = tmp_path / 'exports'
+    source.mkdir()
+    for name in ('GaAs5_Large_Spot_center.txt', 'GaAs5_intensity_sweep.txt'):
+        with open(os.path.join('tests', 'data', name), 'rb') as f:
+            (source / name).write_bytes(f.read())
+    ingest(str(source), str(tmp_path / 'store'), processes=1, log=io.StringIO())
+    return tmp_path / 'store'
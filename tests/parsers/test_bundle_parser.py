@@ -0,0 +1,49 @@
+import logging
+import os.path
+import zipfile
+
+from nomad.datamodel import EntryArchive, EntryMetadata
+
+from nomad_luqy_plugin.parsers import bundle_parser_entry_point
+from nomad_luqy_plugin.schema_packages.schema_package import (
+    AbsPLMeasurementELN,
+    AbsPLSession,
+)
+
+EXPORTS = ('GaAs5_Large_Spot_center.txt', 'session/GaAs5_intensity_sweep.txt')
+
+
+def write_bundle(path):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as bundle:
+        for member in EXPORTS:
+            bundle.write(
+                os.path.join('tests', 'data', os.path.basename(member)), member
+            )
+        bundle.writestr('notes.txt', 'not an export')
+
+
+def test_parse_bundle(tmp_path):
+    mainfile = str(tmp_path / 'session.zip')
+    write_bundle(mainfile)
+    parser = bundle_parser_entry_point.load()
+    with open(mainfile, 'rb') as f:
+        buffer = f.read(2048)
+
+    keys = parser.is_mainfile(mainfile, 'application/zip', buffer, None)
+    assert keys == set(EXPORTS)
+
+    archive = EntryArchive(metadata=EntryMetadata())
+    child_archives = {key: EntryArchive(metadata=EntryMetadata()) for key in keys}
+    parser.parse(mainfile, archive, logging.getLogger(), child_archives)
+
+    assert isinstance(archive.data, AbsPLSession)
+    assert archive.data.n_spectra == 3  # noqa: PLR2004
+    assert archive.data.settings.integration_time is not None
+    assert list(archive.data.members) == sorted(EXPORTS)
+
+    child = child_archives['session/GaAs5_intensity_sweep.txt']
+    assert isinstance(child.data, AbsPLMeasurementELN)
+    assert child.data.bundle_member == 'session/GaAs5_intensity_sweep.txt'
+    assert child.data.results[0].n_series == 2  # noqa: PLR2004
+    child.data.normalize(child, logging.getLogger())
+    assert child.data.figures
@@ -1,13 +1,35 @@
 import logging
+import os.path
+import shutil
 
-from nomad.datamodel import EntryArchive
+import pytest
+from nomad.client import normalize_all, parse
+from nomad.datamodel import EntryArchive, EntryMetadata
 
-from nomad_luqy_plugin.parsers.parser import NewParser
+from nomad_luqy_plugin.parsers.parser import LuQYParser
+from nomad_luqy_plugin.schema_packages.schema_package import AbsPLMeasurementELN
 
 
 def test_parse_file():
-    parser = NewParser()
-    archive = EntryArchive()
-    parser.parse('tests/data/example.out', archive, logging.getLogger())
+    parser = LuQYParser()
+    archive = EntryArchive(metadata=EntryMetadata())
+    parser.parse('tests/data/GaAs5_Large_Spot_center.txt', archive, logging.getLogger())
 
-    assert archive.workflow2.name == 'test'
+    assert isinstance(archive.data, AbsPLMeasurementELN)
+    assert archive.data.data_file == 'GaAs5_Large_Spot_center.txt'
+
+
+def test_match_and_normalize(tmp_path):
+    # matching re-encodes non-UTF-8 mainfiles in place, keep the cp1252 fixture
+    test_file = tmp_path / '0_1_0-ecf314iynbrwtd33zkk5auyebh.txt'
+    shutil.copy(os.path.join('tests', 'data', test_file.name), test_file)
+    entry_archive = parse(str(test_file))[0]
+    normalize_all(entry_archive)
+
+    result = entry_archive.data.results[0]
+    assert entry_archive.data.settings.laser_intensity_suns == 0.91  # noqa: PLR2004
+    assert result.implied_voc.magnitude == pytest.approx(1.532)
+    # the high-energy tail of the export spans only 18 meV, too short to fit
+    assert result.fitted_carrier_temperature is None
+    assert result.wavelength.shape == result.luminescence_flux_density.shape
+    assert entry_archive.data.figures
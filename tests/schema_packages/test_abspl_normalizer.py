@@ -0,0 +1,93 @@
+import io
+import logging
+
+import numpy as np
+import pytest
+
+from nomad_luqy_plugin.schema_packages import abspl_normalizer
+from nomad_luqy_plugin.schema_packages.abspl_normalizer import (
+    classify_series,
+    parse_abspl_stream,
+    parse_header,
+    parse_numeric_data,
+    parse_numeric_stream,
+    read_header_lines,
+)
+
+
+def test_parse_numeric_data_skips_malformed_rows():
+    lines = [
+        '----------------------------',
+        'Wavelength (nm)\tLuminescence flux density\tRaw\tDark',
+        '5.5E+2\t1.0E+0\t2.0E+0\t3.0E+0',
+        '',
+        '5.6E+2\t1.0E+0\t2.0E+0',
+        '5.7E+2\tn/a\t2.0E+0\t3.0E+0',
+        '5.75E+2\t1-2\t2.0E+0\t3.0E+0',
+        '5.8E+2 4.0E+0 5.0E+0 6.0E+0 extra',
+    ]
+    data = parse_numeric_data(lines, 2, logging.getLogger())
+
+    assert data.shape == (2, 4)
+    assert data.dtype == np.float64
+    np.testing.assert_array_equal(data[:, 0], [550.0, 580.0])
+
+
+def test_parse_real_file():
+    path = 'tests/data/GaAs5_Large_Spot_center.txt'
+    with open(path, 'rb') as f:
+        lines = f.read().decode('cp1252').splitlines()
+    settings, results, data_start_idx = parse_header(lines, logging.getLogger())
+    data = parse_numeric_data(lines, data_start_idx, logging.getLogger())
+
+    assert settings['laser_spot_size'] == 1.0
+    assert results['quasi_fermi_level_splitting'] == pytest.approx(1.094)
+    assert data.shape == (len(lines) - data_start_idx, 4)
+
+
+def test_streaming_reader_matches_line_parser():
+    path = 'tests/data/0_1_0-ecf314iynbrwtd33zkk5auyebh.txt'
+    with open(path, 'rb') as f:
+        raw = f.read()
+    lines = raw.decode('cp1252').splitlines()
+    _, _, data_start_idx = parse_header(lines, logging.getLogger())
+    expected = parse_numeric_data(lines, data_start_idx, logging.getLogger())
+
+    # malformed rows inside the block and at its end are skipped
+    lines = raw.splitlines(keepends=True)
+    lines.insert(data_start_idx + 5, b'Pause\t--\r\n')
+    stream = io.BytesIO(b''.join(lines) + b'garbage row\n')
+    header_lines = read_header_lines(stream)
+    data = parse_numeric_stream(stream, logging.getLogger())
+
+    assert len(header_lines) == data_start_idx
+    np.testing.assert_array_equal(data, expected)
+
+
+def test_parse_concatenated_spectra():
+    with open('tests/data/GaAs5_intensity_sweep.txt', 'rb') as f:
+        series_headers, data = parse_abspl_stream(f, logging.getLogger())
+
+    assert data.shape == (2, 40, 4)
+    np.testing.assert_array_equal(data[0], data[1])
+    assert [settings['laser_intensity_suns'] for settings, _ in series_headers] == [
+        0.98,
+        0.5,
+    ]
+    assert series_headers[1][1]['luminescence_quantum_yield'] == pytest.approx(0.612)
+    assert classify_series(series_headers) == 'intensity sweep'
+
+
+@pytest.mark.parametrize('chunk_bytes', [1, 64, 1 << 22])
+def test_concatenated_spectra_across_buffers(monkeypatch, chunk_bytes):
+    monkeypatch.setattr(abspl_normalizer, 'NUMERIC_CHUNK_BYTES', chunk_bytes)
+    with open('tests/data/GaAs5_intensity_sweep.txt', 'rb') as f:
+        raw = f.read()
+
+    series_headers, data = parse_abspl_stream(
+        io.BytesIO(raw + b'End of data\r\n'), logging.getLogger()
+    )
+
+    assert data.shape == (2, 40, 4)
+    assert series_headers[1][0]['laser_intensity_suns'] == 0.5  # noqa: PLR2004
+    assert series_headers[1][1]['luminescence_quantum_yield'] == pytest.approx(0.612)
@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from nomad_luqy_plugin.schema_packages.descriptors import spectral_descriptors
+
+
+def test_gaussian_descriptors():
+    wavelength = np.linspace(700.0, 900.0, 2001)
+    sigma = 10.0
+    flux = np.exp(-((wavelength - 800.0) ** 2) / (2 * sigma**2))
+    flux = np.stack([flux, 2 * flux, np.zeros_like(flux)])
+
+    descriptors = spectral_descriptors(wavelength, flux)
+
+    assert descriptors['peak_wavelength'][:2] == pytest.approx([800.0, 800.0])
+    assert descriptors['peak_energy'][0] == pytest.approx(1239.841984 / 800.0)
+    fwhm = 2 * np.sqrt(2 * np.log(2)) * sigma
+    assert descriptors['fwhm'][:2] == pytest.approx([fwhm, fwhm], rel=1e-4)
+    assert descriptors['centroid_wavelength'][0] == pytest.approx(800.0)
+    assert descriptors['integrated_photon_flux'][1] == pytest.approx(
+        2 * sigma * np.sqrt(2 * np.pi)
+    )
+    assert np.isnan(descriptors['fwhm'][2])
@@ -0,0 +1,24 @@
+import numpy as np
+
+from nomad_luqy_plugin.schema_packages.downsampling import minmax_decimate
+
+
+def test_minmax_decimate_keeps_peaks_and_edges():
+    x = np.linspace(550.0, 1000.0, 1510)
+    y = np.exp(-(((x - 870.0) / 15.0) ** 2))[None, :].repeat(2, axis=0)
+    y[1, 700] = 5.0
+    max_points = 200
+
+    x_ds, y_ds = minmax_decimate(x, y, max_points)
+
+    assert x_ds.shape == y_ds.shape
+    assert x_ds.shape[1] <= max_points
+    np.testing.assert_array_equal(y_ds.max(axis=1), y.max(axis=1))
+    np.testing.assert_array_equal(x_ds[:, [0, -1]], [[550.0, 1000.0]] * 2)
+    assert np.all(np.diff(x_ds, axis=1) >= 0)
+
+
+def test_minmax_decimate_without_points():
+    x_ds, y_ds = minmax_decimate(np.empty(0), np.empty((1, 0)), 200)
+
+    assert x_ds.shape == y_ds.shape == (1, 0)
@@ -0,0 +1,47 @@
+import base64
+
+import numpy as np
+import pytest
+
+from nomad_luqy_plugin.schema_packages.figures import line_traces, typed_array
+
+
+def decode(array):
+    return np.frombuffer(base64.b64decode(array['bdata']), dtype=f'<{array["dtype"]}')
+
+
+def test_typed_array_round_trip():
+    values = np.array([5.501383e2, 6.671445e13, np.nan, -2.805374])
+
+    array = typed_array(values)
+
+    assert array['dtype'] == 'f4'
+    np.testing.assert_allclose(decode(array), values, rtol=1e-7)
+
+
+def test_uniform_shared_axis():
+    x = np.linspace(550.0, 1050.0, 101)
+    y = np.random.default_rng(0).random((3, x.size))
+
+    traces = line_traces(np.broadcast_to(x, y.shape), y, ['a', 'b', 'c'])
+
+    assert [trace['name'] for trace in traces] == ['a', 'b', 'c']
+    for trace, row in zip(traces, y):
+        assert 'x' not in trace
+        assert (trace['x0'], trace['dx']) == pytest.approx((550.0, 5.0))
+        np.testing.assert_allclose(decode(trace['y']), row, rtol=1e-7)
+
+
+def test_irregular_axis_and_webgl():
+    x = np.geomspace(550.0, 1050.0, 3000)
+    y = np.ones((4, x.size))
+
+    traces = line_traces(
+        np.broadcast_to(x, y.shape), y, list('abcd'), webgl_min_points=10000
+    )
+    lists = line_traces(x[None], y[:1], ['a'], typed_arrays=False)
+
+    assert {trace['type'] for trace in traces} == {'scattergl'}
+    np.testing.assert_allclose(decode(traces[0]['x']), x, rtol=1e-7)
+    assert lists[0]['type'] == 'scatter'
+    assert lists[0]['x'] == x.tolist()
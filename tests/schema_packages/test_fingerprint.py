@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from nomad_luqy_plugin.schema_packages.fingerprint import (
+    FINGERPRINT_ENERGY,
+    spectral_fingerprints,
+)
+
+
+def gaussian(wavelength, peak):
+    return 1e12 * np.exp(-0.5 * ((wavelength - peak) / 15.0) ** 2)
+
+
+def test_fingerprints_are_unit_float32():
+    wavelength = np.linspace(550.0, 1050.0, 1500)
+    flux = np.stack([gaussian(wavelength, 870.0), np.zeros_like(wavelength)])
+
+    fingerprints = spectral_fingerprints(wavelength, flux)
+
+    assert fingerprints.shape == (2, FINGERPRINT_ENERGY.size)
+    assert fingerprints.dtype == np.float32
+    assert np.linalg.norm(fingerprints[0]) == pytest.approx(1.0, rel=1e-6)
+    assert np.isnan(fingerprints[1]).all()
+
+
+def test_fingerprint_independent_of_axis_and_scale():
+    fine = np.linspace(1050.0, 550.0, 2000)  # descending axis
+    coarse = np.linspace(550.0, 1050.0, 700)
+
+    a = spectral_fingerprints(fine, gaussian(fine, 750.0))[0]
+    b = spectral_fingerprints(coarse, 5 * gaussian(coarse, 750.0))[0]
+    c = spectral_fingerprints(coarse, gaussian(coarse, 800.0))[0]
+
+    assert a @ b == pytest.approx(1.0, abs=1e-3)
+    assert a @ c < 0.5  # noqa: PLR2004
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from nomad_luqy_plugin.schema_packages.generalized_planck import (
+    K_B_EV,
+    PLANCK_PREFACTOR,
+    fit_generalized_planck,
+)
+
+
+def test_fit_recovers_qfls_and_temperature():
+    energy = np.linspace(1.3, 1.8, 500)
+    qfls = np.array([1.05, 1.10, 1.15])[:, None]
+    temperature = np.array([290.0, 300.0, 320.0])[:, None]
+    # Planck emission of an absorber with a sharp band edge at 1.42 eV
+    absorptivity = 1.0 / (1.0 + np.exp(-(energy - 1.42) / 0.01))
+    flux = (
+        absorptivity
+        * PLANCK_PREFACTOR
+        * energy**2
+        / np.expm1((energy - qfls) / (K_B_EV * temperature))
+    )
+
+    fitted_qfls, fitted_temperature = fit_generalized_planck(energy, flux)
+
+    assert fitted_qfls == pytest.approx(qfls.ravel(), abs=5e-3)
+    assert fitted_temperature == pytest.approx(temperature.ravel(), rel=1e-2)
+
+
+def test_fit_without_tail_is_nan():
+    qfls, temperature = fit_generalized_planck(np.linspace(1, 2, 10), np.zeros(10))
+
+    assert np.isnan(qfls).all()
+    assert np.isnan(temperature).all()
+
+
+def test_implausible_tails_are_nan():
+    energy = np.linspace(1.3, 1.8, 500)
+    # Boltzmann tails from the peak at 1.4 eV at 150 K and 300 K
+    flux = PLANCK_PREFACTOR * energy**2 * np.exp(-(energy - 1.0) / (K_B_EV * 300.0))
+    flux = np.where(energy >= 1.4, flux, 0.0)  # noqa: PLR2004
+    cold = np.where(
+        energy >= 1.4,  # noqa: PLR2004
+        PLANCK_PREFACTOR * energy**2 * np.exp(-(energy - 1.0) / (K_B_EV * 150.0)),
+        0.0,
+    )
+
+    qfls, temperature = fit_generalized_planck(energy, np.stack([flux, cold]))
+    assert temperature[0] == pytest.approx(300.0)
+    assert np.isnan(temperature[1])
+    assert np.isnan(qfls[1])
+
+    # the same tail on a narrow energy range
+    qfls, temperature = fit_generalized_planck(energy, flux, min_span=0.5)
+    assert np.isnan(qfls[0])
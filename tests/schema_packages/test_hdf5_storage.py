@@ -0,0 +1,48 @@
+import logging
+
+import numpy as np
+from nomad.datamodel import EntryArchive, EntryMetadata
+from nomad.datamodel.context import ClientContext
+
+from nomad_luqy_plugin.schema_packages.hdf5_storage import (
+    SHARED_ARRAYS_PREFIX,
+    array_fingerprint,
+    read_hdf5_reference,
+    write_hdf5_datasets,
+    write_shared_arrays,
+)
+
+
+def local_archive(path):
+    return EntryArchive(
+        m_context=ClientContext(local_dir=str(path)), metadata=EntryMetadata()
+    )
+
+
+def test_datasets_are_replaced_atomically(tmp_path):
+    archive = local_archive(tmp_path)
+    logger = logging.getLogger()
+
+    write_hdf5_datasets(archive, 'entry.h5', {'/a': np.arange(3.0)}, logger)
+    references = write_hdf5_datasets(
+        archive, 'entry.h5', {'/b': np.ones(2), '/a': np.zeros(3)}, logger
+    )
+
+    assert [path.name for path in tmp_path.iterdir()] == ['entry.h5']
+    assert read_hdf5_reference(archive, references['/a']).tolist() == [0, 0, 0]
+    assert read_hdf5_reference(archive, references['/b']).tolist() == [1, 1]
+
+
+def test_truncated_shared_array_is_rewritten(tmp_path):
+    archive = local_archive(tmp_path)
+    wavelength = np.linspace(550.0, 1050.0, 11)
+    filename = f'{SHARED_ARRAYS_PREFIX}wavelength-{array_fingerprint(wavelength)}.h5'
+    # left behind by a writer that crashed
+    (tmp_path / filename).write_bytes(b'\x89HDF\r\n')
+
+    references = write_shared_arrays(
+        archive, {'wavelength': wavelength}, logging.getLogger()
+    )
+
+    values = read_hdf5_reference(archive, references['wavelength'])
+    np.testing.assert_array_equal(values, wavelength)
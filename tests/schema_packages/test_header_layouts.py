@@ -0,0 +1,85 @@
+import io
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+
+from nomad_luqy_plugin.schema_packages.abspl_normalizer import (
+    parse_abspl_stream,
+    parse_header,
+)
+from nomad_luqy_plugin.schema_packages.header_layouts import (
+    header_signature,
+    parse_plan,
+)
+
+
+def read_lines(name):
+    with open(f'tests/data/{name}', 'rb') as f:
+        return f.read().decode('cp1252').splitlines()
+
+
+@pytest.mark.parametrize(
+    'name, layout, result_key',
+    [
+        ('GaAs5_Large_Spot_center.txt', 'QFLS', 'quasi_fermi_level_splitting'),
+        ('0_1_0-ecf314iynbrwtd33zkk5auyebh.txt', 'iVoc', 'implied_voc'),
+    ],
+)
+def test_known_layouts(name, layout, result_key):
+    logger = MagicMock()
+    settings, results, _ = parse_header(read_lines(name), logger)
+
+    assert settings['header_layout'] == layout
+    assert f'{result_key}_confidence' in results
+    assert result_key in results
+    # the 15 lines of the header and the layout
+    assert len(settings) + len(results) == 16  # noqa: PLR2004
+    logger.warning.assert_not_called()
+
+
+def test_timestamp():
+    settings, _, _ = parse_header(
+        read_lines('GaAs5_Large_Spot_center.txt'), logging.getLogger()
+    )
+
+    assert settings['timestamp'] == '2025-01-20T21:46:09'
+
+
+def test_utf8_squared_sign():
+    with open('tests/data/iVoc_utf8.txt', 'rb') as f:
+        raw = f.read()
+    assert 'cm²'.encode() in raw
+
+    series_headers, _ = parse_abspl_stream(io.BytesIO(raw), logging.getLogger())
+    settings, _ = series_headers[0]
+
+    assert settings['laser_spot_size'] == pytest.approx(0.1)
+    assert settings['subcell_area'] == pytest.approx(1.0)
+
+
+def test_unknown_layout_reported():
+    lines = read_lines('GaAs5_Large_Spot_center.txt')
+    lines.insert(4, 'Stage temperature (C)\t25.0')
+    logger = MagicMock()
+
+    # the signature is reported once at info level, later files at debug
+    for _ in range(3):
+        settings, results, _ = parse_header(lines, logger)
+
+    logger.warning.assert_not_called()
+    logger.info.assert_called_once()
+    reported = [
+        call for call in logger.debug.call_args_list if 'Unknown' in call.args[0]
+    ]
+    assert len(reported) == 2  # noqa: PLR2004
+    assert 'Stage temperature (C)' in logger.info.call_args.args[0]
+    assert 'header_layout' not in settings
+    assert results['quasi_fermi_level_splitting'] == pytest.approx(1.094)
+
+
+def test_plan_is_cached():
+    lines = read_lines('GaAs5_Large_Spot_center.txt')
+    _, signature = header_signature(lines[:15])
+
+    assert parse_plan(signature) is parse_plan(signature)
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from nomad.datamodel import EntryArchive, EntryMetadata
+from nomad.utils import get_logger
+
+from nomad_luqy_plugin.schema_packages.generalized_planck import K_B_EV
+from nomad_luqy_plugin.schema_packages.intensity_series import fit_sums, ideality_fit
+from nomad_luqy_plugin.schema_packages.schema_package import (
+    AbsPLIntensityPoint,
+    AbsPLIntensitySeries,
+    AbsPLMeasurementELN,
+    AbsPLResult,
+    AbsPLSettings,
+)
+
+IDEALITY = 1.3
+QFLS_ONE_SUN = 1.1
+KT = K_B_EV * 300.0
+
+
+def measurement(intensity):
+    return AbsPLMeasurementELN(
+        settings=AbsPLSettings(laser_intensity_suns=intensity),
+        results=[
+            AbsPLResult(
+                quasi_fermi_level_splitting=QFLS_ONE_SUN
+                + IDEALITY * KT * np.log(intensity),
+                derived_jsc=25.0 * intensity,
+            )
+        ],
+    )
+
+
+def test_ideality_fit():
+    intensity = np.array([0.1, 1.0, 10.0, np.nan])
+    qfls = QFLS_ONE_SUN + IDEALITY * KT * np.log(intensity)
+    sums = fit_sums(intensity, qfls)
+    assert sums[0] == 3  # noqa: PLR2004
+    assert ideality_fit(sums, 300.0) == pytest.approx((IDEALITY, QFLS_ONE_SUN))
+    assert np.isnan(ideality_fit(fit_sums([1.0], [1.0]), 300.0)[0])
+
+
+def test_intensity_series():
+    logger = get_logger(__name__)
+    measurements = [measurement(intensity) for intensity in (0.1, 0.3, 1.0)]
+    series = AbsPLIntensitySeries(
+        points=[AbsPLIntensityPoint(measurement=m) for m in measurements]
+    )
+    archive = EntryArchive(data=series, metadata=EntryMetadata())
+    series.normalize(archive, logger)
+
+    assert series.n_points == 3  # noqa: PLR2004
+    assert series.ideality_factor == pytest.approx(IDEALITY)
+    assert series.quasi_fermi_level_splitting_one_sun.magnitude == pytest.approx(
+        QFLS_ONE_SUN
+    )
+    assert series.pseudo_current_density.magnitude == pytest.approx([22.5, 17.5, 0])
+    assert 0 < series.pseudo_fill_factor < 1
+    assert series.figures
+
+    # included points are not read again
+    measurements[0].results[0].quasi_fermi_level_splitting = 0.0
+    series.points.append(AbsPLIntensityPoint(measurement=measurement(3.0)))
+    series.normalize(archive, logger)
+    assert series.n_points == 4  # noqa: PLR2004
+    assert series.ideality_factor == pytest.approx(IDEALITY)
+
+    # edited values of included points are picked up
+    series.points[0].quasi_fermi_level_splitting = QFLS_ONE_SUN
+    series.normalize(archive, logger)
+    assert series.n_points == 4  # noqa: PLR2004
+    assert series.ideality_factor != pytest.approx(IDEALITY)
+
+    # removing a point refits the remaining points
+    del series.points[0]
+    series.normalize(archive, logger)
+    assert series.n_points == 3  # noqa: PLR2004
+    assert series.ideality_factor == pytest.approx(IDEALITY)
+
+
+def test_series_without_jsc():
+    logger = get_logger(__name__)
+    measurements = [measurement(intensity) for intensity in (0.1, 1.0)]
+    series = AbsPLIntensitySeries(
+        points=[AbsPLIntensityPoint(measurement=m) for m in measurements]
+    )
+    archive = EntryArchive(data=series, metadata=EntryMetadata())
+    series.normalize(archive, logger)
+    assert series.pseudo_fill_factor is not None
+
+    # without a Jsc the pseudo-JV curve is gone, the fit is still plotted
+    for point in series.points:
+        point.derived_jsc = None
+    series.normalize(archive, logger)
+    assert series.ideality_factor == pytest.approx(IDEALITY)
+    assert series.pseudo_voltage is None
+    assert series.pseudo_fill_factor is None
+    assert len(series.figures) == 1
+
+    # a single intensity gives no fit and no figure
+    del series.points[1]
+    series.normalize(archive, logger)
+    assert series.ideality_factor is None
+    assert not series.figures
@@ -0,0 +1,68 @@
+import os.path
+
+import numpy as np
+import pytest
+from nomad.client import normalize_all, parse
+from nomad.utils import get_logger
+
+from nomad_luqy_plugin.schema_packages.mapping import grid_maps
+from nomad_luqy_plugin.schema_packages.schema_package import AbsPLMapping, AbsPLResult
+
+
+def test_grid_maps():
+    x, y = np.meshgrid(np.arange(4.0), np.arange(3.0))
+    values = np.stack([x.ravel() + 10 * y.ravel(), np.ones(x.size)])
+    values[1, 0] = np.nan
+
+    x_centers, y_centers, grids = grid_maps(x.ravel(), y.ravel(), values)
+    assert x_centers == pytest.approx([0, 1, 2, 3])
+    assert y_centers == pytest.approx([0, 1, 2])
+    assert grids[0] == pytest.approx(x + 10 * y)
+    assert np.isnan(grids[1, 0, 0])
+
+    # denser maps are averaged into at most max_cells cells per axis
+    _, _, grids = grid_maps(x.ravel(), y.ravel(), values[:1], max_cells=2)
+    assert grids.shape == (1, 2, 2)
+    assert grids[0, 1, 1] == pytest.approx(np.mean([12, 13, 22, 23]))
+
+
+def test_mapping():
+    test_file = os.path.join('tests', 'data', 'mapping.archive.yaml')
+    entry_archive = parse(test_file)[0]
+    normalize_all(entry_archive)
+
+    mapping = entry_archive.data
+    assert mapping.n_spots == 3  # noqa: PLR2004
+    assert mapping.luminescence_flux_density.shape == (3, mapping.wavelength.size)
+    assert mapping.spots[0].peak_wavelength.magnitude == pytest.approx(870.8274)
+    assert mapping.spots[3].luminescence_quantum_yield is None
+    assert mapping.luminescence_quantum_yield_map.shape == (2, 2)
+    assert np.isnan(mapping.luminescence_quantum_yield_map[1, 1])
+    assert mapping.std_peak_wavelength is not None
+    assert mapping.figures
+
+
+def test_mapping_clears_stale_values():
+    test_file = os.path.join('tests', 'data', 'mapping.archive.yaml')
+    entry_archive = parse(test_file)[0]
+    normalize_all(entry_archive)
+    mapping = entry_archive.data
+
+    # the spectra are copied from the results, in their unit
+    flux = 'luminescence_flux_density'
+    assert (
+        AbsPLMapping.m_def.all_quantities[flux].unit
+        == AbsPLResult.m_def.all_quantities[flux].unit
+    )
+
+    mapping.spots[2].data_file = 'missing.txt'
+    for spot in mapping.spots:
+        spot.x_position = None
+    mapping.normalize(entry_archive, get_logger(__name__))
+
+    assert mapping.n_spots == 2  # noqa: PLR2004
+    assert mapping.spots[0].peak_wavelength is not None
+    assert mapping.spots[2].peak_wavelength is None
+    assert mapping.luminescence_quantum_yield_map is None
+    assert mapping.map_x is None
+    assert not mapping.figures
@@ -0,0 +1,85 @@
+import io
+import logging
+import os
+
+import numpy as np
+
+from nomad_luqy_plugin.schema_packages.abspl_normalizer import parse_abspl_stream
+from nomad_luqy_plugin.schema_packages.parse_cache import (
+    ParseCache,
+    file_fingerprint,
+    fingerprint_key,
+)
+
+DATA_FILE = 'tests/data/GaAs5_Large_Spot_center.txt'
+
+
+def test_cache_roundtrip_and_stats(tmp_path):
+    logger = logging.getLogger()
+    cache = ParseCache(str(tmp_path), max_bytes=10**9)
+    with open(DATA_FILE, 'rb') as f:
+        key = cache.key(f)
+        f.seek(0)
+        series_headers, data = parse_abspl_stream(f, logger)
+
+    assert cache.load(key, logger) is None
+    cache.store(key, series_headers, data, logger)
+    cached_headers, cached_data = cache.load(key, logger)
+
+    assert cached_headers == series_headers
+    np.testing.assert_array_equal(cached_data, data)
+    assert cache.stats == {'hits': 1, 'misses': 1, 'evictions': 0}
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    logger = logging.getLogger()
+    cache = ParseCache(str(tmp_path), max_bytes=10**9)
+    data = np.zeros((1, 64, 4))
+    keys = [cache.key(io.BytesIO(bytes([i]))) for i in range(3)]
+    for age, key in enumerate(keys):
+        cache.store(key, [({}, {})], data, logger)
+        os.utime(tmp_path / f'{key}.npz', (age, age))
+    entry_size = (tmp_path / f'{keys[0]}.npz').stat().st_size
+
+    cache.max_bytes = 2 * entry_size
+    cache.evict(logger)
+
+    assert cache.stats['evictions'] == 1
+    assert cache.load(keys[0], logger) is None
+    assert cache.load(keys[2], logger) is not None
+
+
+def test_file_fingerprint_without_mtime():
+    # e.g. a zip member, the content is hashed on every check
+    fingerprint, unchanged = file_fingerprint(io.BytesIO(b'abc'), 'a.txt')
+    assert not unchanged
+    assert fingerprint.split(':')[1:3] == ['3', '']
+
+    assert file_fingerprint(io.BytesIO(b'abc'), 'a.txt', fingerprint)[1]
+    assert not file_fingerprint(io.BytesIO(b'abd'), 'a.txt', fingerprint)[1]
+    assert not file_fingerprint(io.BytesIO(b'abc'), 'b.txt', fingerprint)[1]
+
+
+def test_header_only_fingerprint():
+    with open(DATA_FILE, 'rb') as f:
+        raw = f.read()
+    edited = raw[:-20] + raw[-20:].replace(b'1', b'2')
+    stream = io.BytesIO(raw)
+
+    fingerprint, _ = file_fingerprint(stream, 'a.txt', header_only=True)
+
+    # only the header is read, changed data rows of the same size pass
+    assert stream.tell() < len(raw) // 10
+    assert file_fingerprint(io.BytesIO(edited), 'a.txt', fingerprint, True)[1]
+    assert not file_fingerprint(io.BytesIO(edited), 'a.txt', fingerprint)[1]
+    assert fingerprint_key(fingerprint) is None
+
+
+def test_fingerprint_key():
+    with open(DATA_FILE, 'rb') as f:
+        fingerprint, _ = file_fingerprint(f, 'a.txt')
+        f.seek(0)
+        key = ParseCache('', 0).key(f)
+
+    assert fingerprint_key(fingerprint) == key
+    assert fingerprint_key(None) is None
@@ -0,0 +1,71 @@
+import os.path
+
+from nomad.client import parse
+
+from nomad_luqy_plugin.schema_packages import schema_package
+from nomad_luqy_plugin.schema_packages.profiling import profiling, span
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.records = []
+
+    def debug(self, *args, **kwargs):
+        pass
+
+    warning = error = debug
+
+    def info(self, event, **kwargs):
+        self.records.append((event, kwargs))
+
+
+def test_spans():
+    logger = RecordingLogger()
+    with profiling(logger, sample_rate=1.0):
+        with span('outer') as stats:
+            with span('inner'):
+                data = bytearray(1_000_000)
+            stats['rows'] = len(data)
+        with profiling(logger, sample_rate=0.0):
+            with span('nested'):
+                pass
+
+    stages = {kwargs['stage']: kwargs for _, kwargs in logger.records}
+    assert list(stages) == ['inner', 'outer', 'nested', 'total']
+    assert stages['outer']['rows'] == 1_000_000  # noqa: PLR2004
+    assert stages['inner']['peak_bytes'] > 900_000  # noqa: PLR2004
+    assert stages['total']['peak_bytes'] >= stages['inner']['peak_bytes']
+
+
+def test_sampled_out():
+    logger = RecordingLogger()
+    with profiling(logger, sample_rate=0.0):
+        with span('stage') as stats:
+            stats['rows'] = 1
+    assert not logger.records
+
+
+def test_normalize_profile(monkeypatch):
+    monkeypatch.setattr(schema_package.configuration, 'profile_sample_rate', 1.0)
+    entry_archive = parse(os.path.join('tests', 'data', 'test.archive.yaml'))[0]
+    logger = RecordingLogger()
+    entry_archive.data.normalize(entry_archive, logger)
+
+    stages = {
+        kwargs['stage']: kwargs for _, kwargs in logger.records if 'stage' in kwargs
+    }
+    for stage in (
+        'read header',
+        'parse numeric data',
+        'parse data file',
+        'spectral analysis',
+        'figure build',
+        'figure serialization',
+        'total',
+    ):
+        assert stages[stage]['seconds'] >= 0
+    assert (
+        stages['parse numeric data']['rows']
+        == entry_archive.data.results[0].wavelength.size
+    )
+    assert stages['read header']['bytes'] > 0
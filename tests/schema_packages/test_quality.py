@@ -0,0 +1,93 @@
+import logging
+
+import numpy as np
+import pytest
+
+from nomad_luqy_plugin.schema_packages.abspl_normalizer import (
+    parse_abspl_stream,
+    unpack_series,
+)
+from nomad_luqy_plugin.schema_packages.quality import (
+    QUALITY_ISSUES,
+    spectrum_quality,
+)
+
+WAVELENGTH = np.linspace(550.0, 1050.0, 501)
+DARK_LEVEL = 1500.0
+
+
+def spectra(peak=5000.0, noise=5.0, seed=0):
+    """Returns flux, raw and dark counts of a Gaussian peak at 800 nm."""
+    rng = np.random.default_rng(seed)
+    shape = np.exp(-0.5 * ((WAVELENGTH - 800.0) / 20.0) ** 2)
+    dark = DARK_LEVEL + rng.normal(0, noise, WAVELENGTH.size)
+    raw = dark + peak * shape + rng.normal(0, noise, WAVELENGTH.size)
+    flux = np.where(shape > 1e-3, 1e12 * shape, 0.0)  # noqa: PLR2004
+    return flux, raw, dark
+
+
+def issues(quality):
+    return [
+        name for name, failed in zip(QUALITY_ISSUES, quality['issues'][0]) if failed
+    ]
+
+
+def test_clean_spectrum_passes():
+    quality = spectrum_quality(WAVELENGTH, *spectra())
+
+    assert quality['quality_passed'][0]
+    assert quality['saturation_fraction'][0] == 0
+    assert quality['negative_count_fraction'][0] == 0
+    assert quality['signal_to_noise_ratio'][0] > 100  # noqa: PLR2004
+    assert 700 < quality['emission_band_start'][0] < 800  # noqa: PLR2004
+    assert 800 < quality['emission_band_end'][0] < 900  # noqa: PLR2004
+
+
+def test_failed_checks():
+    flux, raw, dark = spectra()
+    saturated = np.minimum(raw + 70000 * (raw > DARK_LEVEL + 4000), 65535)
+    too_dark = raw + 200
+    noisy = spectra(peak=20.0, noise=20.0)
+
+    quality = spectrum_quality(
+        WAVELENGTH,
+        np.stack([flux, flux, noisy[0], np.zeros_like(flux)]),
+        np.stack([saturated, raw, noisy[1], raw]),
+        np.stack([dark, too_dark, noisy[2], dark]),
+    )
+
+    np.testing.assert_array_equal(
+        quality['issues'],
+        [
+            [True, False, False, False],
+            [False, True, False, False],
+            [False, False, True, False],
+            [False, False, False, True],
+        ],
+    )
+    assert not quality['quality_passed'].any()
+    assert 0 < quality['saturation_fraction'][0] < 0.1  # noqa: PLR2004
+    assert quality['negative_count_fraction'][1] > 0.9  # noqa: PLR2004
+    assert quality['empty_flux_fraction'][3] == 1
+    assert quality['negative_count_fraction'][3] == 0
+    assert np.isnan(quality['emission_band_start'][3])
+
+
+@pytest.mark.parametrize(
+    'name, expected',
+    [
+        # raw counts at the dark level with the emission on top
+        ('0_1_0-ecf314iynbrwtd33zkk5auyebh.txt', []),
+        # raw counts mostly negative and below the dark counts at every point
+        ('GaAs5_Large_Spot_center.txt', ['negative counts']),
+    ],
+)
+def test_real_files(name, expected):
+    with open(f'tests/data/{name}', 'rb') as f:
+        parsed = unpack_series(*parse_abspl_stream(f, logging.getLogger()))
+    _, _, wavelength, flux, raw, dark, _ = parsed
+
+    quality = spectrum_quality(wavelength, flux, raw, dark)
+
+    assert issues(quality) == expected
+    assert quality['empty_flux_fraction'][0] < 1
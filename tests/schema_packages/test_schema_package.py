@@ -1,6 +1,11 @@
 import os.path
+import shutil
 
+import pytest
 from nomad.client import normalize_all, parse
+from nomad.utils import get_logger
+
+from nomad_luqy_plugin.schema_packages import schema_package
 
 
 def test_schema_package():
@@ -10,3 +15,248 @@ def test_schema_package():
 
     # Check that the magnitude of the quantity is 1.0, since subcell_area is a quantity with units  # noqa: E501
     assert entry_archive.data.settings.subcell_area.magnitude == 1.0
+    result = entry_archive.data.results[0]
+    assert result.peak_wavelength.magnitude == pytest.approx(870.8274)
+    assert result.fwhm.magnitude > 0
+    assert 0 < result.luminescence_quantum_yield_std < result.luminescence_quantum_yield
+    assert result.quasi_fermi_level_splitting_std.magnitude > 0
+    assert result.derived_jsc_std.magnitude > 0
+
+
+def test_failed_fit_clears_fitted_values():
+    test_file = os.path.join('tests', 'data', 'test.archive.yaml')
+    entry_archive = parse(test_file)[0]
+    normalize_all(entry_archive)
+    result = entry_archive.data.results[0]
+    result.fitted_quasi_fermi_level_splitting = 1.13
+    result.fitted_carrier_temperature = 231.0
+
+    # the tail of the GaAs spectrum gives an implausible temperature
+    result.fit_generalized_planck(get_logger(__name__))
+
+    assert result.fitted_quasi_fermi_level_splitting is None
+    assert result.fitted_carrier_temperature is None
+
+
+def test_failed_descriptors_are_cleared():
+    test_file = os.path.join('tests', 'data', 'test.archive.yaml')
+    entry_archive = parse(test_file)[0]
+    normalize_all(entry_archive)
+    result = entry_archive.data.results[0]
+    assert result.fwhm is not None
+
+    # a spectrum without emission has no peak
+    result.luminescence_flux_density = 0 * result.luminescence_flux_density
+    result.compute_descriptors(get_logger(__name__))
+
+    assert result.peak_wavelength is None
+    assert result.fwhm is None
+    assert result.integrated_photon_flux.magnitude == 0
+
+
+def test_intensity_sweep():
+    test_file = os.path.join('tests', 'data', 'intensity_sweep.archive.yaml')
+    entry_archive = parse(test_file)[0]
+    normalize_all(entry_archive)
+
+    result = entry_archive.data.results[0]
+    assert result.n_series == 2  # noqa: PLR2004
+    assert result.series_type == 'intensity sweep'
+    assert result.luminescence_flux_density is None
+    assert result.luminescence_flux_density_series.shape == (2, result.wavelength.size)
+    assert len(entry_archive.data.figures[0].figure['data']) == 2  # noqa: PLR2004
+
+
+def test_reparse_switches_layout(tmp_path):
+    shutil.copy(os.path.join('tests', 'data', 'test.archive.yaml'), tmp_path)
+    data_file = tmp_path / 'GaAs5_Large_Spot_center.txt'
+    shutil.copy(os.path.join('tests', 'data', 'GaAs5_intensity_sweep.txt'), data_file)
+    entry_archive = parse(str(tmp_path / 'test.archive.yaml'))[0]
+    normalize_all(entry_archive)
+    entry = entry_archive.data
+    assert entry.results[0].n_series == 2  # noqa: PLR2004
+
+    shutil.copy(os.path.join('tests', 'data', data_file.name), data_file)
+    entry.force_reparse = True
+    entry.normalize(entry_archive, get_logger(__name__))
+
+    result = entry.results[0]
+    assert result.n_series == 1
+    assert result.luminescence_flux_density_series is None
+    assert result.laser_intensity_suns_series is None
+    assert result.series_array('raw_spectrum_counts').shape == (
+        1,
+        result.wavelength.size,
+    )
+
+
+def test_export_without_data_rows(tmp_path):
+    shutil.copy(os.path.join('tests', 'data', 'test.archive.yaml'), tmp_path)
+    with open(os.path.join('tests', 'data', 'GaAs5_Large_Spot_center.txt'), 'rb') as f:
+        header = f.readlines()[:17]
+    (tmp_path / 'GaAs5_Large_Spot_center.txt').write_bytes(b''.join(header))
+    entry_archive = parse(str(tmp_path / 'test.archive.yaml'))[0]
+    normalize_all(entry_archive)
+
+    result = entry_archive.data.results[0]
+    assert result.luminescence_quantum_yield is not None
+    assert result.series_array('luminescence_flux_density').shape == (1, 0)
+    assert entry_archive.data.figures[0].figure['data'] == []
+
+
+def test_hdf5_arrays(tmp_path, monkeypatch):
+    for name in ('GaAs5_Large_Spot_center.txt', 'test.archive.yaml'):
+        shutil.copy(os.path.join('tests', 'data', name), tmp_path)
+    monkeypatch.setattr(schema_package.configuration, 'hdf5_arrays', True)
+
+    entry_archive = parse(str(tmp_path / 'test.archive.yaml'))[0]
+    normalize_all(entry_archive)
+
+    result = entry_archive.data.results[0]
+    assert result.wavelength is None
+    assert result.spectra_hdf5.wavelength == (
+        'GaAs5_Large_Spot_center.h5#/results/0/wavelength'
+    )
+    assert (tmp_path / 'GaAs5_Large_Spot_center.h5').exists()
+    assert result.series_array('luminescence_flux_density').shape == (
+        1,
+        result.spectral_array('wavelength').size,
+    )
+    assert entry_archive.data.figures
+
+
+def test_header_only(monkeypatch):
+    monkeypatch.setattr(schema_package.configuration, 'header_only', True)
+    test_file = os.path.join('tests', 'data', 'test.archive.yaml')
+    entry_archive = parse(test_file)[0]
+    normalize_all(entry_archive)
+
+    assert entry_archive.data.settings.subcell_area.magnitude == 1.0
+    result = entry_archive.data.results[0]
+    assert result.spectra_pending
+    assert result.luminescence_quantum_yield is not None
+    assert result.wavelength is None
+    assert not entry_archive.data.figures
+
+    # the spectra are parsed on first access, edited header values are kept
+    entry_archive.data.settings.subcell_area = 2.0
+    result.luminescence_quantum_yield = 1.5
+    wavelength = result.spectral_array('wavelength')
+    assert wavelength.size > 0
+    assert result.spectra_pending is None
+    assert entry_archive.data.settings.subcell_area.magnitude == 2.0  # noqa: PLR2004
+    assert result.luminescence_quantum_yield == 1.5  # noqa: PLR2004
+    assert result.series_array('luminescence_flux_density').shape == (
+        1,
+        wavelength.size,
+    )
+    assert not entry_archive.data.figures
+
+    # a full parse builds the analysis and the figure
+    entry_archive = parse(test_file)[0]
+    normalize_all(entry_archive)
+    entry_archive.data.full_parse = True
+    normalize_all(entry_archive)
+    assert entry_archive.data.results[0].spectra_pending is None
+    assert entry_archive.data.results[0].peak_wavelength is not None
+    assert entry_archive.data.figures
+
+
+def test_shared_arrays(tmp_path, monkeypatch):
+    monkeypatch.setattr(schema_package.configuration, 'shared_arrays', True)
+    results = []
+    for name in ('spot_a', 'spot_b'):
+        shutil.copy(
+            os.path.join('tests', 'data', 'GaAs5_Large_Spot_center.txt'),
+            tmp_path / f'{name}.txt',
+        )
+        (tmp_path / f'{name}.archive.yaml').write_text(
+            'data:\n'
+            '  m_def: nomad_luqy_plugin.schema_packages.schema_package'
+            '.AbsPLMeasurementELN\n'
+            f'  data_file: {name}.txt\n'
+        )
+        entry_archive = parse(str(tmp_path / f'{name}.archive.yaml'))[0]
+        normalize_all(entry_archive)
+        results.append(entry_archive.data.results[0])
+
+    # one file each for the wavelength axis and the dark spectrum
+    assert len(list(tmp_path.glob('luqy_shared_*.h5'))) == 2  # noqa: PLR2004
+    result_a, result_b = results
+    assert result_a.wavelength is None
+    assert result_a.dark_spectrum_counts is None
+    assert result_a.luminescence_flux_density is not None
+    assert result_a.spectra_hdf5.wavelength == result_b.spectra_hdf5.wavelength
+    wavelength = result_a.spectral_array('wavelength')
+    assert wavelength.size == result_a.luminescence_flux_density.size
+    # resolved once and shared in memory
+    assert result_b.spectral_array('wavelength') is wavelength
+
+
+def test_fingerprint_hash_is_cache_key(tmp_path, monkeypatch):
+    for name in ('GaAs5_Large_Spot_center.txt', 'test.archive.yaml'):
+        shutil.copy(os.path.join('tests', 'data', name), tmp_path)
+    cache = schema_package.ParseCache(str(tmp_path / 'cache'), 10**9)
+    monkeypatch.setattr(schema_package, 'parse_cache', cache)
+    # the file is hashed once, for its fingerprint
+    monkeypatch.setattr(cache, 'key', lambda f: pytest.fail('file hashed again'))
+
+    entry_archive = parse(str(tmp_path / 'test.archive.yaml'))[0]
+    normalize_all(entry_archive)
+
+    assert cache.stats['misses'] == 1
+    assert entry_archive.data.figures
+
+
+def test_skip_unchanged_data_file(tmp_path, monkeypatch):
+    for name in ('GaAs5_Large_Spot_center.txt', 'test.archive.yaml'):
+        shutil.copy(os.path.join('tests', 'data', name), tmp_path)
+    loads = []
+    load_spectra = schema_package.AbsPLMeasurementELN.load_spectra
+    monkeypatch.setattr(
+        schema_package.AbsPLMeasurementELN,
+        'load_spectra',
+        lambda self, *args, **kwargs: (
+            loads.append(1) or load_spectra(self, *args, **kwargs)
+        ),
+    )
+    entry_archive = parse(str(tmp_path / 'test.archive.yaml'))[0]
+    normalize_all(entry_archive)
+    entry = entry_archive.data
+    fingerprint = entry.data_file_fingerprint
+    assert fingerprint.endswith(':GaAs5_Large_Spot_center.txt')
+    assert len(loads) == 1
+
+    # a manual correction survives saving the entry, the analysis is only
+    # redone for a different analysis version
+    entry.results[0].luminescence_quantum_yield = 1.5
+    entry.results[0].peak_wavelength = 1.0
+    entry.normalize(entry_archive, get_logger(__name__))
+    assert len(loads) == 1
+    assert entry.results[0].luminescence_quantum_yield == 1.5  # noqa: PLR2004
+    assert entry.results[0].peak_wavelength.magnitude == 1.0
+    assert entry.figures
+
+    entry.analysis_version = '0'
+    entry.normalize(entry_archive, get_logger(__name__))
+    assert len(loads) == 1
+    assert entry.results[0].peak_wavelength.magnitude == pytest.approx(870.8274)
+    assert entry.analysis_version == schema_package.ANALYSIS_VERSION
+
+    # touching the file updates the fingerprint, the content is unchanged
+    data_file = tmp_path / 'GaAs5_Large_Spot_center.txt'
+    os.utime(data_file, ns=(0, 10**18))
+    entry.normalize(entry_archive, get_logger(__name__))
+    assert len(loads) == 1
+    assert entry.data_file_fingerprint != fingerprint
+
+    entry.force_reparse = True
+    entry.normalize(entry_archive, get_logger(__name__))
+    assert len(loads) == 2  # noqa: PLR2004
+    assert entry.results[0].luminescence_quantum_yield == pytest.approx(0.9693)
+    assert not entry.force_reparse
+
+    with open(data_file, 'ab') as f:
+        f.write(b'\r\n')
+    entry.normalize(entry_archive, get_logger(__name__))
+    assert len(loads) == 3  # noqa: PLR2004
@@ -0,0 +1,93 @@
+import time
+
+import numpy as np
+import pytest
+
+from nomad_luqy_plugin.schema_packages.generalized_planck import K_B_EV
+from nomad_luqy_plugin.schema_packages.uncertainty import (
+    TEMPERATURE,
+    flux_rel_uncertainty,
+    propagate_uncertainties,
+)
+
+WAVELENGTH = np.linspace(550.0, 1050.0, 501)
+DARK_LEVEL = 1500.0
+VALUES = {
+    'luminescence_quantum_yield': [1.0],
+    'quasi_fermi_level_splitting': [1.1],
+    'derived_jsc': [26.0],
+}
+
+
+def spectra(peak=5000.0, noise=5.0, seed=0):
+    """Returns flux, raw and dark counts of a Gaussian peak at 800 nm."""
+    rng = np.random.default_rng(seed)
+    shape = np.exp(-0.5 * ((WAVELENGTH - 800.0) / 20.0) ** 2)
+    dark = DARK_LEVEL + rng.normal(0, noise, WAVELENGTH.size)
+    raw = dark + peak * shape + rng.normal(0, noise, WAVELENGTH.size)
+    flux = np.where(shape > 1e-3, 1e9 * (raw - dark), 0.0)  # noqa: PLR2004
+    return flux, raw, dark
+
+
+def test_flux_uncertainty_scales_with_noise():
+    quiet = flux_rel_uncertainty(WAVELENGTH, *spectra(noise=5.0))[0]
+    noisy = flux_rel_uncertainty(WAVELENGTH, *spectra(noise=50.0))[0]
+
+    assert 0 < quiet < 0.01  # noqa: PLR2004
+    assert noisy == pytest.approx(10 * quiet, rel=0.3)
+    no_emission = spectra()
+    assert np.isnan(
+        flux_rel_uncertainty(WAVELENGTH, 0 * no_emission[0], *no_emission[1:])[0]
+    )
+
+
+def test_flux_uncertainty_descending_axis():
+    flux, raw, dark = (np.stack([array, 2 * array]) for array in spectra())
+    ascending = flux_rel_uncertainty(WAVELENGTH, flux, raw, dark)
+    descending = flux_rel_uncertainty(
+        WAVELENGTH[::-1], flux[:, ::-1], raw[:, ::-1], dark[:, ::-1]
+    )
+
+    np.testing.assert_allclose(descending, ascending)
+    assert np.isfinite(ascending).all()
+
+
+def test_propagated_stds():
+    stds = propagate_uncertainties(
+        WAVELENGTH,
+        *spectra(),
+        VALUES,
+        spot_size_rel_uncertainty=0.05,
+        eqe_rel_uncertainty=0.02,
+    )
+
+    # dominated by the EQE for the LuQY, by the spot size for QFLS and Jsc
+    assert stds['luminescence_quantum_yield'][0] == pytest.approx(0.02, rel=0.1)
+    assert stds['quasi_fermi_level_splitting'][0] == pytest.approx(
+        K_B_EV * TEMPERATURE * 0.05, rel=0.1
+    )
+    assert stds['derived_jsc'][0] == pytest.approx(26.0 * 0.054, rel=0.1)
+
+    without_inputs = propagate_uncertainties(
+        WAVELENGTH,
+        *spectra(),
+        VALUES,
+        spot_size_rel_uncertainty=0,
+        eqe_rel_uncertainty=0,
+    )
+    assert without_inputs['derived_jsc'][0] == 0
+    assert 0 < without_inputs['luminescence_quantum_yield'][0] < 0.01  # noqa: PLR2004
+
+
+def test_reproducible_and_fast():
+    flux, raw, dark = (np.tile(array, (20, 1)) for array in spectra())
+    values = {name: value * 20 for name, value in VALUES.items()}
+
+    start = time.perf_counter()
+    stds = propagate_uncertainties(WAVELENGTH, flux, raw, dark, values)
+    assert time.perf_counter() - start < 0.5  # noqa: PLR2004
+
+    again = propagate_uncertainties(WAVELENGTH, flux, raw, dark, values)
+    for name, std in stds.items():
+        assert std.shape == (20,)
+        np.testing.assert_array_equal(std, again[name])
@@ -0,0 +1,53 @@
+import csv
+import io
+import os.path
+import zipfile
+
+from nomad_luqy_plugin.cli import SUMMARY_FILE, ingest
+
+
+def test_ingest_directory(tmp_path):
+    source = tmp_path / 'exports'
+    source.mkdir()
+    for name in ('GaAs5_Large_Spot_center.txt', 'GaAs5_intensity_sweep.txt'):
+        with open(os.path.join('tests', 'data', name), 'rb') as f:
+            (source / name).write_bytes(f.read())
+    (source / 'notes.txt').write_text('not an export')
+    # the second spectrum misses a point and is interpolated, with a warning
+    with open(os.path.join('tests', 'data', 'GaAs5_intensity_sweep.txt'), 'rb') as f:
+        lines = f.readlines()
+    (source / 'ragged_sweep.txt').write_bytes(b''.join(lines[:74] + lines[75:]))
+
+    n_files, n_failed, n_bytes = ingest(
+        str(source), str(tmp_path / 'out'), processes=1, log=io.StringIO()
+    )
+
+    assert (n_files, n_failed) == (4, 1)
+    assert (tmp_path / 'out' / 'GaAs5_Large_Spot_center.archive.json').exists()
+    assert (tmp_path / 'out' / 'ragged_sweep.archive.json').exists()
+    with open(tmp_path / 'out' / SUMMARY_FILE, newline='') as f:
+        rows = {row['file']: row for row in csv.DictReader(f)}
+    assert rows['GaAs5_intensity_sweep.txt']['n_series'] == '2'
+    assert rows['notes.txt']['error'] == 'not a LuQY Pro export'
+    assert not rows['ragged_sweep.txt']['error']
+    assert 'interpolated' in rows['ragged_sweep.txt']['warnings']
+    assert not rows['GaAs5_Large_Spot_center.txt']['warnings']
+
+
+def test_ingest_zip(tmp_path):
+    name = 'GaAs5_Large_Spot_center.txt'
+    with open(os.path.join('tests', 'data', name), 'rb') as f:
+        raw = f.read()
+    source = tmp_path / 'exports.zip'
+    with zipfile.ZipFile(source, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr(name, raw)
+
+    n_files, n_failed, n_bytes = ingest(
+        str(source), str(tmp_path / 'out'), processes=1, log=io.StringIO()
+    )
+
+    assert (n_files, n_failed, n_bytes) == (1, 0, len(raw))
+    with open(tmp_path / 'out' / SUMMARY_FILE, newline='') as f:
+        (row,) = csv.DictReader(f)
+    assert row['bytes'] == str(len(raw))
+    assert not row['error']
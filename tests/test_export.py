@@ -0,0 +1,81 @@
+import sys
+
+import numpy as np
+import pytest
+
+from nomad_luqy_plugin import export as export_module
+from nomad_luqy_plugin.export import export
+
+
+def test_export_grid(tmp_path, archive_store):
+    store = archive_store
+    grid = np.linspace(800.0, 950.0, 151)
+
+    n_entries, n_rows = export(
+        str(store), str(tmp_path / 'out'), grid=grid, chunk_rows=2
+    )
+
+    # one spectrum and a sweep of two
+    assert (n_entries, n_rows) == (2, 3)
+    chunks = sorted((tmp_path / 'out').glob('part-*.npz'))
+    assert len(chunks) == 2  # noqa: PLR2004
+    with np.load(chunks[0]) as chunk:
+        assert chunk['wavelength'] == pytest.approx(grid)
+        assert chunk['luminescence_flux_density'].shape == (2, grid.size)
+        assert chunk['luminescence_quantum_yield'].shape == (2,)
+        assert 'offsets' not in chunk
+
+
+def test_export_entry_ids(tmp_path, archive_store, monkeypatch):
+    store = archive_store
+    decoded = []
+    loads = export_module.json.loads
+    monkeypatch.setattr(
+        export_module.json, 'loads', lambda text: decoded.append(text) or loads(text)
+    )
+
+    n_entries, n_rows = export(
+        str(store), str(tmp_path / 'out'), entry_ids=['GaAs5_intensity_sweep']
+    )
+
+    assert (n_entries, n_rows) == (1, 2)
+    # the other archive is skipped by its path without decoding it
+    assert len(decoded) == 1
+    with np.load(tmp_path / 'out' / 'part-00000.npz') as chunk:
+        assert list(chunk['series_index']) == [0, 1]
+        assert list(chunk['entry_id']) == ['GaAs5_intensity_sweep'] * 2
+        flux = chunk['luminescence_flux_density']
+        assert flux.shape == (2, chunk['wavelength'].size)
+        # header values of each spectrum of the sweep
+        assert chunk['laser_intensity_suns'] == pytest.approx([0.98, 0.5])
+        assert chunk['luminescence_quantum_yield'] == pytest.approx([0.9693, 0.612])
+        assert chunk['derived_jsc'] == pytest.approx([26.46, 26.46])
+
+
+def test_export_parquet(tmp_path, archive_store):
+    parquet = pytest.importorskip('pyarrow.parquet')
+
+    n_entries, n_rows = export(
+        str(archive_store), str(tmp_path / 'out'), file_format='parquet', chunk_rows=2
+    )
+
+    assert (n_entries, n_rows) == (2, 3)
+    parquet_file = parquet.ParquetFile(tmp_path / 'out' / 'spectra.parquet')
+    assert parquet_file.metadata.num_row_groups == 2  # noqa: PLR2004
+    table = parquet_file.read().to_pydict()
+    assert sorted(zip(table['entry_id'], table['series_index'])) == [
+        ('GaAs5_Large_Spot_center', 0),
+        ('GaAs5_intensity_sweep', 0),
+        ('GaAs5_intensity_sweep', 1),
+    ]
+    for wavelength, flux in zip(
+        table['wavelength'], table['luminescence_flux_density']
+    ):
+        assert len(wavelength) == len(flux) > 0
+
+
+def test_export_parquet_without_pyarrow(tmp_path, archive_store, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+
+    with pytest.raises(RuntimeError, match='pyarrow'):
+        export(str(archive_store), str(tmp_path / 'out'), file_format='parquet')
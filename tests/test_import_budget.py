@@ -0,0 +1,58 @@
+import json
+import subprocess
+import sys
+
+# Loading the entry points of the plugin on top of the NOMAD modules it builds
+# on took about 0.15 s and allocated 0.8 MB here, with plotly imported at module
+# level it took about 0.45 s and 19 MB. The budgets leave room for slower
+# machines.
+LOAD_SECONDS_BUDGET = 2.0
+LOAD_MEMORY_BUDGET = 10 * 1024**2
+LAZY_MODULES = ('plotly', 'pyarrow')
+
+# tracemalloc counts the Python allocations of the imports on every platform,
+# but slows them down, so time and memory are measured in separate runs
+LOAD_SCRIPT = """
+import json, sys, time, tracemalloc
+
+import nomad.datamodel.metainfo.basesections
+import nomad.datamodel.metainfo.plot
+import nomad.parsing.parser
+import nomad_measurements
+
+trace_memory = sys.argv[1] == 'memory'
+before = {name.split('.')[0] for name in sys.modules}
+if trace_memory:
+    tracemalloc.start()
+start = time.perf_counter()
+from nomad_luqy_plugin.parsers import bundle_parser_entry_point, parser_entry_point
+from nomad_luqy_plugin.schema_packages import schema_package_entry_point
+
+schema_package_entry_point.load()
+parser_entry_point.load()
+bundle_parser_entry_point.load()
+print(json.dumps({
+    'seconds': time.perf_counter() - start,
+    'bytes': tracemalloc.get_traced_memory()[1] if trace_memory else 0,
+    'new_modules': sorted({name.split('.')[0] for name in sys.modules} - before),
+}))
+"""
+
+
+def load_entry_points(measure):
+    # a fresh interpreter, the test session has imported everything already
+    output = subprocess.run(
+        [sys.executable, '-c', LOAD_SCRIPT, measure],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_entry_point_load_budget():
+    load = load_entry_points('time')
+
+    assert not set(LAZY_MODULES) & set(load['new_modules'])
+    assert load['seconds'] < LOAD_SECONDS_BUDGET
+    assert load_entry_points('memory')['bytes'] < LOAD_MEMORY_BUDGET
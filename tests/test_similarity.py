@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from nomad_luqy_plugin.schema_packages.fingerprint import spectral_fingerprints
+from nomad_luqy_plugin.similarity import SpectralIndex, main
+
+WAVELENGTH = np.linspace(550.0, 1050.0, 1000)
+PEAKS = np.linspace(700.0, 900.0, 41)
+
+
+def peak_index():
+    flux = np.exp(-0.5 * ((WAVELENGTH - PEAKS[:, None]) / 15.0) ** 2)
+    fingerprints = spectral_fingerprints(WAVELENGTH, flux)
+    return SpectralIndex([f'peak-{peak:.0f}' for peak in PEAKS], fingerprints)
+
+
+@pytest.mark.parametrize('metric', ['cosine', 'l2'])
+def test_query_entry(metric):
+    index = peak_index()
+
+    neighbours = index.query_entry('peak-800', k=4, metric=metric)
+
+    assert [entry_id for entry_id, _ in neighbours[:2]] in (
+        ['peak-795', 'peak-805'],
+        ['peak-805', 'peak-795'],
+    )
+    assert {entry_id for entry_id, _ in neighbours[2:]} == {'peak-790', 'peak-810'}
+    scores = [score for _, score in neighbours]
+    assert scores == sorted(scores, reverse=metric == 'cosine')
+
+
+def test_save_and_load(tmp_path):
+    index = peak_index()
+    index.save(tmp_path / 'index.npz')
+
+    loaded = SpectralIndex.load(tmp_path / 'index.npz')
+
+    assert len(loaded) == len(PEAKS)
+    assert loaded.query_entry('peak-700', k=1) == index.query_entry('peak-700', k=1)
+
+
+def test_from_archives(archive_store):
+    index = SpectralIndex.from_archives(str(archive_store))
+
+    # the flux of the sweep is zero on the fingerprint grid
+    assert list(index.entry_ids) == ['GaAs5_Large_Spot_center']
+    assert index.fingerprints.dtype == np.float32
+    ((entry_id, score),) = index.query(index.fingerprints[0], k=1)
+    assert entry_id == index.entry_ids[0]
+    assert score == pytest.approx(1.0)
+
+
+def test_empty_store(tmp_path, capsys):
+    index = SpectralIndex.from_archives(str(tmp_path))
+
+    assert len(index) == 0
+    assert index.fingerprints.shape == (0, 116)
+    assert index.query(np.ones(116), k=3) == []
+    assert main([str(tmp_path), 'missing']) == 1
+    assert 'No fingerprint' in capsys.readouterr().err